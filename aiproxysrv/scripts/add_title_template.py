@@ -11,6 +11,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 from sqlalchemy.orm import Session
 from db.database import get_db
 from db.models import PromptTemplate
+from business.prompt_template_cache import PromptTemplateCache
 
 
 # New title template configuration
@@ -70,6 +71,8 @@ def add_title_template():
 
         # Commit the changes
         db.commit()
+        # Running servers reload the templates on their next request
+        PromptTemplateCache.invalidate()
 
         print(f"\n✅ Title template successfully {operation}!")
         print(f"   Category: {TITLE_TEMPLATE['category']}")
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Script to backfill file metadata (dimensions, byte size, dominant colour, perceptual hash)
+for generated images that were stored before metadata extraction existed.
+
+Usage:
+    python scripts/backfill_image_metadata.py [--batch-size 100] [--max-images N]
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from business.image_similarity_service import ImageSimilarityService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill image metadata and perceptual hashes")
+    parser.add_argument("--batch-size", type=int, default=100, help="Images loaded per DB query (default 100)")
+    parser.add_argument("--max-images", type=int, default=None, help="Stop after this many images (default all)")
+    args = parser.parse_args()
+
+    print("🖼️  Backfilling image metadata...")
+
+    try:
+        results = ImageSimilarityService().backfill_metadata(
+            batch_size=args.batch_size,
+            max_images=args.max_images
+        )
+    except Exception as e:
+        print(f"\n❌ Error during backfill: {str(e)}")
+        sys.exit(1)
+
+    print(f"\n✅ Backfill completed!")
+    print(f"   Processed: {results['processed']}")
+    print(f"   Updated: {results['updated']}")
+    print(f"   Missing files: {results['missing_files']}")
+    print(f"   Errors: {results['errors']}")
+
+    if results["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Script to benchmark prompt templates: replays a corpus of inputs through
+PromptProcessor.process_template and ChatController and reports latency percentiles,
+token counts and output size per template version.
+
+Run against real Ollama or the aitestmock stand-in (--ollama-url http://localhost:3080).
+Response cache, request coalescing, admission control and inference metrics are disabled,
+every input really reaches the backend. A candidate file benchmarks edited templates next to
+the current ones, a baseline report shows the change against an earlier run.
+
+Usage:
+    python scripts/benchmark_templates.py --corpus inputs.txt [--template image/enhance] [--repeat 3]
+        [--concurrency 1] [--ollama-url URL] [--candidate candidate.json] [--output report.json]
+        [--baseline report.json]
+
+Corpus: text file with one input per line, or a JSON list of strings.
+Candidate: JSON object {"category/action": {"pre_condition": "...", "model": "...", "max_tokens": 300}}
+"""
+
+import sys
+import os
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+NS_PER_MS = 1_000_000
+CANDIDATE_FIELDS = ('pre_condition', 'post_condition', 'model', 'temperature', 'max_tokens')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark prompt templates against Ollama or aitestmock")
+    parser.add_argument("--corpus", required=True, help="Input texts (one per line or JSON list)")
+    parser.add_argument("--template", action="append", default=[], help="category/action to benchmark (repeatable, default all active)")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per input (default 1)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Parallel requests (default 1)")
+    parser.add_argument("--ollama-url", default=None, help="Ollama host(s), comma separated (default OLLAMA_URLS from .env)")
+    parser.add_argument("--candidate", default=None, help="JSON file with edited template fields to compare")
+    parser.add_argument("--output", default=None, help="Write JSON report to this file")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON report to compare against")
+    return parser.parse_args()
+
+
+def configure_environment(args):
+    """Must run before config.settings is imported"""
+    if args.ollama_url:
+        os.environ["OLLAMA_URL"] = args.ollama_url.split(",")[0]
+        os.environ["OLLAMA_URLS"] = args.ollama_url
+    os.environ["CHAT_CACHE_ENABLED"] = "false"
+    os.environ["CHAT_SINGLE_FLIGHT_ENABLED"] = "false"
+    os.environ["CHAT_METRICS_ENABLED"] = "false"
+    os.environ["OLLAMA_ADMISSION_ENABLED"] = "false"
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    if path.endswith(".json"):
+        return [str(item) for item in json.loads(content) if str(item).strip()]
+    return [line.strip() for line in content.splitlines() if line.strip()]
+
+
+def load_variants(template_filter, candidate_path):
+    """Active templates (optionally filtered) plus candidate versions as (label, template) tuples"""
+    from db.database import SessionLocal
+    from db.models import PromptTemplate
+
+    db = SessionLocal()
+    try:
+        templates = db.query(PromptTemplate).filter(PromptTemplate.active == True).all()
+        db.expunge_all()
+    finally:
+        db.close()
+
+    if template_filter:
+        templates = [t for t in templates if f"{t.category}/{t.action}" in template_filter]
+
+    candidates = {}
+    if candidate_path:
+        with open(candidate_path, encoding="utf-8") as f:
+            candidates = json.load(f)
+
+    variants = []
+    for template in sorted(templates, key=lambda t: (t.category, t.action)):
+        key = f"{template.category}/{template.action}"
+        variants.append((f"{key}@{template.version or '-'}", template))
+        if key in candidates:
+            fields = {field: getattr(template, field) for field in CANDIDATE_FIELDS}
+            fields.update({k: v for k, v in candidates[key].items() if k in CANDIDATE_FIELDS})
+            candidate = PromptTemplate(id=template.id, category=template.category, action=template.action,
+                                       version=f"{template.version or '-'}-candidate", **fields)
+            variants.append((f"{key}@{candidate.version}", candidate))
+    return variants
+
+
+def run_one(controller, template, user_input):
+    """One request through the production code path, returns measured values"""
+    from utils.prompt_processor import PromptProcessor
+
+    params = PromptProcessor.process_template(template, user_input)
+    started = time.monotonic()
+    response, status_code = controller.generate_chat(
+        model=params['model'],
+        pre_condition=template.pre_condition,
+        prompt=user_input,
+        post_condition=template.post_condition,
+        temperature=params['temperature'],
+        max_tokens=params['max_tokens'],
+        cache=False,
+        category=template.category,
+        action=template.action
+    )
+    latency_ms = (time.monotonic() - started) * 1000
+
+    if status_code != 200:
+        return {"error": response.get("error", f"HTTP {status_code}"), "latency_ms": latency_ms}
+
+    eval_count = response.get('eval_count') or 0
+    eval_duration = response.get('eval_duration') or 0
+    return {
+        "error": None,
+        "latency_ms": latency_ms,
+        "load_ms": (response.get('load_duration') or 0) / NS_PER_MS,
+        "prompt_tokens": response.get('prompt_eval_count') or 0,
+        "output_tokens": eval_count,
+        "output_chars": len(response.get('response') or ''),
+        "tokens_per_second": eval_count / (eval_duration / 1e9) if eval_duration else None
+    }
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))], 1)
+
+
+def average(values):
+    values = [v for v in values if v is not None]
+    return round(sum(values) / len(values), 1) if values else None
+
+
+def summarize(label, template, results):
+    ok = [r for r in results if r["error"] is None]
+    latencies = [r["latency_ms"] for r in ok]
+    return {
+        "template": label,
+        "model": template.model,
+        "max_tokens": template.max_tokens,
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "latency_p50_ms": percentile(latencies, 0.5),
+        "latency_p95_ms": percentile(latencies, 0.95),
+        "latency_p99_ms": percentile(latencies, 0.99),
+        "latency_max_ms": round(max(latencies), 1) if latencies else None,
+        "prompt_tokens_avg": average([r["prompt_tokens"] for r in ok]),
+        "output_tokens_avg": average([r["output_tokens"] for r in ok]),
+        "output_tokens_p95": percentile([r["output_tokens"] for r in ok], 0.95),
+        "output_chars_avg": average([r["output_chars"] for r in ok]),
+        "output_chars_p95": percentile([r["output_chars"] for r in ok], 0.95),
+        "tokens_per_second_avg": average([r["tokens_per_second"] for r in ok]),
+        "load_ms_avg": average([r["load_ms"] for r in ok]),
+        "sample_errors": sorted({r["error"] for r in results if r["error"]})[:3]
+    }
+
+
+def print_summary(summary, baseline):
+    print(f"\n📋 {summary['template']} ({summary['model']}, max_tokens {summary['max_tokens']})")
+    print(f"   Requests: {summary['requests']} (errors: {summary['errors']})")
+    for error in summary["sample_errors"]:
+        print(f"   ⚠️  {error}")
+
+    previous = baseline.get(summary["template"]) or baseline.get(summary["template"].split("@")[0]) or {}
+    for name, field in (("Latency p50 ms", "latency_p50_ms"), ("Latency p95 ms", "latency_p95_ms"),
+                        ("Latency p99 ms", "latency_p99_ms"), ("Prompt tokens avg", "prompt_tokens_avg"),
+                        ("Output tokens avg", "output_tokens_avg"), ("Output chars avg", "output_chars_avg"),
+                        ("Tokens/s avg", "tokens_per_second_avg")):
+        value, before = summary[field], previous.get(field)
+        delta = ""
+        if value is not None and before:
+            delta = f"  ({(value - before) / before * 100:+.1f}% vs baseline {before})"
+        print(f"   {name}: {value}{delta}")
+
+
+def main():
+    args = parse_args()
+    configure_environment(args)
+
+    from api.controllers.chat_controller import ChatController
+
+    inputs = load_corpus(args.corpus)
+    variants = load_variants(set(args.template), args.candidate)
+    if not inputs or not variants:
+        print("❌ Nothing to benchmark (empty corpus or no matching active templates)")
+        sys.exit(1)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = {item["template"]: item for item in json.load(f)["templates"]}
+        # Also match by category/action so a new template version is compared with the old one
+        baseline.update({label.split("@")[0]: item for label, item in list(baseline.items())
+                         if not label.endswith("-candidate")})
+
+    backend = os.environ.get("OLLAMA_URLS") or os.environ.get("OLLAMA_URL", "from .env")
+    print(f"🚀 Benchmarking {len(variants)} template version(s) x {len(inputs)} input(s) x {args.repeat} "
+          f"against {backend} (concurrency {args.concurrency})")
+
+    controller = ChatController()
+    summaries = []
+    started = time.monotonic()
+    for label, template in variants:
+        jobs = [user_input for user_input in inputs for _ in range(args.repeat)]
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+            futures = [executor.submit(run_one, controller, template, user_input) for user_input in jobs]
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append({"error": f"{type(e).__name__}: {e}", "latency_ms": 0})
+                print(f"   {label}: {len(results)}/{len(jobs)}", end="\r", flush=True)
+
+        summary = summarize(label, template, results)
+        summaries.append(summary)
+        print_summary(summary, baseline)
+
+    report = {
+        "backend": backend,
+        "inputs": len(inputs),
+        "repeat": args.repeat,
+        "concurrency": args.concurrency,
+        "elapsed_seconds": round(time.monotonic() - started, 1),
+        "templates": summaries
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+
+    print(f"\n✅ Benchmark completed in {report['elapsed_seconds']}s")
+    if any(summary["errors"] for summary in summaries):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Script to reconcile image files in IMAGES_DIR with rows in generated_images.
+
+Reports orphaned files (no database row), dangling rows (file missing) and stale
+'.part' files from interrupted downloads. Runs read-only unless a fix flag is given;
+orphaned files are moved to IMAGES_DIR/_orphaned instead of being deleted.
+
+Usage:
+    python scripts/reconcile_image_storage.py [--fix-orphans] [--fix-dangling] [--batch-size 1000]
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from business.image_reconciliation_service import ImageReconciliationService
+
+
+def print_progress(report):
+    print(f"   [{report['phase']}] files: {report['files_scanned']}, rows: {report['rows_scanned']}, "
+          f"orphans: {report['orphan_files']}, dangling: {report['dangling_rows']}", end="\r", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconcile image files with the database")
+    parser.add_argument("--fix-orphans", action="store_true", help="Quarantine orphaned files and remove stale temp files")
+    parser.add_argument("--fix-dangling", action="store_true", help="Delete database rows whose file is missing")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Filenames/rows per DB query (default 1000)")
+    args = parser.parse_args()
+
+    mode = "fix" if args.fix_orphans or args.fix_dangling else "report only"
+    print(f"🔍 Reconciling image storage ({mode})...")
+
+    try:
+        report = ImageReconciliationService().reconcile(
+            fix_orphans=args.fix_orphans,
+            fix_dangling=args.fix_dangling,
+            batch_size=args.batch_size,
+            progress_callback=print_progress
+        )
+    except Exception as e:
+        print(f"\n❌ Error during reconciliation: {str(e)}")
+        sys.exit(1)
+
+    print(f"\n\n✅ Reconciliation completed in {report['elapsed_seconds']}s")
+    print(f"   Files scanned: {report['files_scanned']}")
+    print(f"   Rows scanned: {report['rows_scanned']}")
+    print(f"   Orphaned files: {report['orphan_files']} (quarantined: {report['orphans_quarantined']})")
+    print(f"   Recent files skipped: {report['recent_files_skipped']}")
+    print(f"   Dangling rows: {report['dangling_rows']} (deleted: {report['dangling_rows_deleted']})")
+    print(f"   Stale temp files: {report['stale_temp_files']} (removed: {report['temp_files_removed']})")
+    print(f"   Errors: {report['errors']}")
+
+    for key, samples in report["samples"].items():
+        if samples:
+            print(f"\n⚠️  {key} (first {len(samples)}):")
+            for sample in samples:
+                print(f"   - {sample}")
+
+    if report["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 from sqlalchemy.orm import Session
 from db.database import get_db
 from db.models import PromptTemplate
+from business.prompt_template_cache import PromptTemplateCache
 
 
 # Templates from the current TypeScript service
@@ -115,6 +116,8 @@ def seed_prompt_templates():
 
         # Commit all changes
         db.commit()
+        # Running servers reload the templates on their next request
+        PromptTemplateCache.invalidate()
 
         print(f"\n✅ Seeding completed successfully!")
         print(f"   - Inserted: {inserted_count} new templates")
@@ -15,6 +15,7 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from db.database import get_db
+from business.prompt_template_cache import PromptTemplateCache
 from sqlalchemy import text
 import logging
 
@@ -82,6 +83,8 @@ def update_model_values():
 
         # Commit all changes
         db.commit()
+        # Running servers reload the templates on their next request
+        PromptTemplateCache.invalidate()
         logger.info(f"✓ Successfully updated {len(updates_needed)} templates")
 
         # Verify the updates
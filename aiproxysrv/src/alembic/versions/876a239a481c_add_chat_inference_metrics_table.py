@@ -0,0 +1,50 @@
+"""Add chat_inference_metrics table
+
+Revision ID: 876a239a481c
+Revises: b319eefe20ce
+Create Date: 2026-10-19 14:12:36.504217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '876a239a481c'
+down_revision: Union[str, Sequence[str], None] = 'b319eefe20ce'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chat_inference_metrics',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('model', sa.String(length=50), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('action', sa.String(length=50), nullable=True),
+    sa.Column('input_chars', sa.Integer(), nullable=True),
+    sa.Column('prompt_chars', sa.Integer(), nullable=True),
+    sa.Column('streamed', sa.Boolean(), nullable=False),
+    sa.Column('total_duration_ms', sa.Float(), nullable=True),
+    sa.Column('load_duration_ms', sa.Float(), nullable=True),
+    sa.Column('prompt_eval_count', sa.Integer(), nullable=True),
+    sa.Column('prompt_eval_duration_ms', sa.Float(), nullable=True),
+    sa.Column('eval_count', sa.Integer(), nullable=True),
+    sa.Column('eval_duration_ms', sa.Float(), nullable=True),
+    sa.Column('tokens_per_second', sa.Float(), nullable=True),
+    sa.Column('cold_load', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_chat_inference_metrics_model_created', 'chat_inference_metrics', ['model', 'created_at'], unique=False)
+    op.create_index(op.f('ix_chat_inference_metrics_created_at'), 'chat_inference_metrics', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_chat_inference_metrics_created_at'), table_name='chat_inference_metrics')
+    op.drop_index('idx_chat_inference_metrics_model_created', table_name='chat_inference_metrics')
+    op.drop_table('chat_inference_metrics')
@@ -0,0 +1,38 @@
+"""Add file metadata and perceptual hash to generated_images
+
+Revision ID: b319eefe20ce
+Revises: b55ac4c3f97b
+Create Date: 2026-10-19 10:41:07.218649
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b319eefe20ce'
+down_revision: Union[str, Sequence[str], None] = 'b55ac4c3f97b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('generated_images', sa.Column('width', sa.Integer(), nullable=True))
+    op.add_column('generated_images', sa.Column('height', sa.Integer(), nullable=True))
+    op.add_column('generated_images', sa.Column('file_size', sa.Integer(), nullable=True))
+    op.add_column('generated_images', sa.Column('dominant_color', sa.String(length=7), nullable=True))
+    op.add_column('generated_images', sa.Column('phash', sa.String(length=16), nullable=True))
+    op.create_index(op.f('ix_generated_images_phash'), 'generated_images', ['phash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_generated_images_phash'), table_name='generated_images')
+    op.drop_column('generated_images', 'phash')
+    op.drop_column('generated_images', 'dominant_color')
+    op.drop_column('generated_images', 'file_size')
+    op.drop_column('generated_images', 'height')
+    op.drop_column('generated_images', 'width')
@@ -0,0 +1,34 @@
+"""Add prompt_hash lookup index to generated_images
+
+Revision ID: b55ac4c3f97b
+Revises: 6685241cf8e3
+Create Date: 2026-10-19 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b55ac4c3f97b'
+down_revision: Union[str, Sequence[str], None] = '6685241cf8e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite index for the image reuse lookup: prompt_hash + size, newest first
+    op.create_index(
+        'idx_generated_images_prompt_hash_size',
+        'generated_images',
+        ['prompt_hash', 'size', 'created_at'],
+        postgresql_using='btree'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_generated_images_prompt_hash_size', 'generated_images')
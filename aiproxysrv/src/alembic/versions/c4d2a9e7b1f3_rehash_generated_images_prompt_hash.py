@@ -0,0 +1,64 @@
+"""Recompute generated_images.prompt_hash from the normalized prompt
+
+Revision ID: c4d2a9e7b1f3
+Revises: 876a239a481c
+Create Date: 2026-10-19 16:41:08.120934
+
+"""
+import hashlib
+from typing import Sequence, Union, Callable
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d2a9e7b1f3'
+down_revision: Union[str, Sequence[str], None] = '876a239a481c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _normalized_hash(prompt: str) -> str:
+    # Same as ImageBusinessService._generate_prompt_hash (case and whitespace insensitive)
+    return hashlib.md5(" ".join(prompt.split()).lower().encode()).hexdigest()[:10]
+
+
+def _raw_hash(prompt: str) -> str:
+    return hashlib.md5(prompt.encode()).hexdigest()[:10]
+
+
+def _rehash(hash_fn: Callable[[str], str]) -> None:
+    """Rewrite prompt_hash of all rows in id-ordered batches, only rows whose hash changes are updated"""
+    bind = op.get_bind()
+    select = sa.text(
+        "SELECT id, prompt, prompt_hash FROM generated_images "
+        "WHERE CAST(id AS TEXT) > :last_id ORDER BY CAST(id AS TEXT) LIMIT :limit"
+    )
+    update = sa.text("UPDATE generated_images SET prompt_hash = :prompt_hash WHERE id = :id")
+
+    last_id = ""
+    while True:
+        rows = bind.execute(select, {"last_id": last_id, "limit": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        changes = [
+            {"id": row.id, "prompt_hash": hash_fn(row.prompt)}
+            for row in rows
+            if row.prompt is not None and row.prompt_hash != hash_fn(row.prompt)
+        ]
+        if changes:
+            bind.execute(update, changes)
+        last_id = str(rows[-1].id)
+
+
+def upgrade() -> None:
+    """Upgrade data - image reuse looks up hashes of the normalized prompt."""
+    _rehash(_normalized_hash)
+
+
+def downgrade() -> None:
+    """Downgrade data - restore hashes of the raw prompt."""
+    _rehash(_raw_hash)
@@ -53,7 +53,8 @@ def create_app():
     # Configure CORS to allow requests from Angular frontend
     CORS(app,
          origins="*",
-         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
+         methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+         expose_headers=["RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After"])
 
     # OpenAPI/Swagger Configuration
     spec = APISpec(
@@ -88,7 +89,9 @@ def create_app():
             from schemas.image_schemas import (
                 ImageGenerateRequest, ImageResponse, ImageGenerateResponse,
                 ImageListRequest, ImageListResponse, ImageUpdateRequest,
-                ImageUpdateResponse, ImageDeleteResponse
+                ImageUpdateResponse, ImageDeleteResponse,
+                ImageBatchGenerateRequest, ImageBatchItemResult, ImageBatchGenerateResponse,
+                ImageSimilarRequest, ImageDuplicateReportRequest, ImageReconcileRequest
             )
             from schemas.song_schemas import (
                 SongGenerateRequest, SongResponse, SongGenerateResponse,
@@ -99,7 +102,7 @@ def create_app():
                 SongJobInfoResponse, ForceCompleteResponse, QueueStatusResponse, TaskCancelResponse,
                 InstrumentalGenerateRequest, InstrumentalGenerateResponse
             )
-            from schemas.chat_schemas import ChatRequest, ChatResponse
+            from schemas.chat_schemas import ChatRequest, ChatResponse, ChatBatchRequest, ChatMetricsRequest
             from schemas.prompt_schemas import (
                 PromptTemplateCreate, PromptTemplateUpdate, PromptTemplateResponse,
                 PromptTemplateListResponse, PromptCategoryResponse, PromptTemplatesGroupedResponse
@@ -126,6 +129,12 @@ def create_app():
                 ("ImageUpdateRequest", ImageUpdateRequest),
                 ("ImageUpdateResponse", ImageUpdateResponse),
                 ("ImageDeleteResponse", ImageDeleteResponse),
+                ("ImageBatchGenerateRequest", ImageBatchGenerateRequest),
+                ("ImageBatchItemResult", ImageBatchItemResult),
+                ("ImageBatchGenerateResponse", ImageBatchGenerateResponse),
+                ("ImageSimilarRequest", ImageSimilarRequest),
+                ("ImageDuplicateReportRequest", ImageDuplicateReportRequest),
+                ("ImageReconcileRequest", ImageReconcileRequest),
                 # Song schemas
                 ("SongGenerateRequest", SongGenerateRequest),
                 ("SongResponse", SongResponse),
@@ -153,6 +162,8 @@ def create_app():
                 # Chat schemas
                 ("ChatRequest", ChatRequest),
                 ("ChatResponse", ChatResponse),
+                ("ChatBatchRequest", ChatBatchRequest),
+                ("ChatMetricsRequest", ChatMetricsRequest),
                 # Prompt schemas
                 ("PromptTemplateCreate", PromptTemplateCreate),
                 ("PromptTemplateUpdate", PromptTemplateUpdate),
@@ -440,4 +451,8 @@ def create_app():
     app.register_blueprint(api_prompt_v1)
     app.register_blueprint(api_user_v1)
 
+    # Preload prompt template models (runs in every worker, Redis lock allows one warmup per interval)
+    from business.ollama_warmup_service import OllamaWarmupService
+    OllamaWarmupService().start_scheduler()
+
     return app
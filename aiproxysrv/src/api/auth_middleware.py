@@ -1,18 +1,24 @@
 """
 JWT Authentication Middleware for Flask API
 """
+import time
 from functools import wraps
-from flask import request, jsonify, g
-from db.user_service import UserService
+from flask import request, jsonify, g, make_response
+from business.token_auth_service import TokenAuthService
+
+# Shared instance, verified tokens and revocations are cached per process
+token_auth = TokenAuthService()
 
 
 def jwt_required(f):
     """
     Decorator to require JWT authentication for API endpoints.
     Sets g.current_user_id and g.current_user_email if token is valid.
+    The time spent on authentication is reported as Server-Timing header ("auth;dur=<ms>").
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
+        auth_started = time.perf_counter()
         # Get Authorization header
         auth_header = request.headers.get('Authorization')
 
@@ -33,9 +39,8 @@ def jwt_required(f):
                 "error": "Authorization header must be in format 'Bearer <token>'"
             }), 401
 
-        # Validate JWT token
-        user_service = UserService()
-        payload = user_service.verify_jwt_token(token)
+        # Validate JWT token (cached per process, revoked tokens are rejected)
+        payload = token_auth.verify(token)
 
         if not payload:
             return jsonify({
@@ -46,8 +51,11 @@ def jwt_required(f):
         # Set user info in Flask's g object for use in route handlers
         g.current_user_id = payload.get('user_id')
         g.current_user_email = payload.get('email')
+        g.auth_duration_ms = (time.perf_counter() - auth_started) * 1000
 
-        return f(*args, **kwargs)
+        response = make_response(f(*args, **kwargs))
+        response.headers.add('Server-Timing', f"auth;dur={g.auth_duration_ms:.3f}")
+        return response
 
     return decorated_function
 
@@ -1,16 +1,70 @@
 """Chat Controller - Handles business logic for chat operations"""
+import json
+import time
 import traceback
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 import requests
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Callable, Iterator, List, Optional, Union
 from utils.logger import logger
-from config.settings import OLLAMA_URL, OLLAMA_TIMEOUT
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config.settings import (
+    OLLAMA_TIMEOUT, OLLAMA_QUEUE_MAX_WAIT, CHAT_BATCH_MAX_CONCURRENCY, CHAT_BATCH_MAX_ITEMS,
+    CHAT_METRICS_ENABLED, CHAT_METRICS_COLD_LOAD_MS
+)
+from business.chat_cache_service import ChatCacheService
+from business.single_flight_service import SingleFlightService
+from business.ollama_admission_service import OllamaAdmissionService, OllamaQueueFullError
+from business.chat_session_service import ChatSessionService
+from business.ollama_router_service import OllamaRouterService, OllamaNoBackendError
+from business.ollama_warmup_service import OllamaWarmupService
+from db.chat_metrics_service import ChatMetricsService
+
+NS_PER_MS = 1_000_000
+
+
+class ClosingStream:
+    """
+    Frame iterator that frees upstream resources on close(), even if iteration never started
+
+    Closing an unstarted generator does not run its finally block, so a client that disconnects
+    before the first chunk would keep the Ollama request, backend lease and admission slot.
+    """
+
+    def __init__(self, frames: Iterator[str], on_close: Callable[[], None]):
+        self.frames = frames
+        self.on_close = on_close
+
+    def __iter__(self) -> "ClosingStream":
+        return self
+
+    def __next__(self) -> str:
+        return next(self.frames)
+
+    def close(self) -> None:
+        try:
+            self.frames.close()
+        finally:
+            self.on_close()
 
 
 class ChatController:
     """Controller for chat generation via Ollama"""
 
+    def __init__(self):
+        self.cache_service = ChatCacheService()
+        self.router = OllamaRouterService()
+        self.admission = OllamaAdmissionService(backend_count=self.router.count_serving_backends)
+        self.session_service = ChatSessionService()
+        self.warmup = OllamaWarmupService()
+        # Lock outlives queue wait plus the longest possible Ollama call, so a crashed leader is taken over afterwards
+        self.single_flight = SingleFlightService("chat-inflight", lock_ttl=OLLAMA_QUEUE_MAX_WAIT + OLLAMA_TIMEOUT + 30)
+
     def generate_chat(self, model: str, pre_condition: str, prompt: str, post_condition: str,
-                     temperature: float = 0.3, max_tokens: int = 30) -> Tuple[Dict[str, Any], int]:
+                     temperature: float = 0.3, max_tokens: int = 30,
+                     cache: Optional[bool] = None, user_id: Optional[str] = None,
+                     category: Optional[str] = None, action: Optional[str] = None,
+                     session_id: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
         """
         Generate chat response with Ollama
 
@@ -21,6 +75,11 @@ class ChatController:
             post_condition: Text to append to prompt
             temperature: Sampling temperature (default 0.3)
             max_tokens: Maximum tokens to generate (default 30)
+            cache: Use response cache (None = only for temperature 0)
+            user_id: Requesting user, used for fair queueing
+            category: Prompt template category (recorded in inference metrics)
+            action: Prompt template action (recorded in inference metrics)
+            session_id: Continue server-side conversation (Ollama context), bypasses cache and coalescing
 
         Returns:
             Tuple of (response_data, status_code)
@@ -29,25 +88,38 @@ class ChatController:
         if not model or not prompt:
             return {"error": "Missing model or prompt"}, 400
 
-        # Build full prompt optimized for gpt-oss:20b with clear instruction separation
-        full_prompt = f"[INSTRUCTION] {pre_condition or ''} [USER] {prompt} [FORMAT] {post_condition or ''}"
+        full_prompt = self._build_prompt(pre_condition, prompt, post_condition)
 
         try:
             prompt_preview = full_prompt[:50] + ('...' if len(full_prompt) > 50 else '')
             logger.info("Generating chat", model=model, prompt_preview=prompt_preview)
 
-            # Call Ollama API
-            response_data = self._call_ollama_api(model, full_prompt, temperature, max_tokens)
+            if session_id:
+                return self._generate_session_turn(model, full_prompt, temperature, max_tokens, user_id, session_id,
+                                                   self._build_metrics_tags(prompt, full_prompt, category, action))
 
-            # Clean response (remove context)
-            cleaned_response = self._clean_ollama_response(response_data)
+            request_key = self.cache_service.build_key(model, full_prompt, temperature, max_tokens)
+            use_cache = self.cache_service.is_cacheable(temperature, cache)
+            if use_cache:
+                cached_response = self.cache_service.get(request_key)
+                if cached_response is not None:
+                    logger.info("Chat served from cache", model=model)
+                    return {**cached_response, "cached": True, "coalesced": False}, 200
 
-            logger.info("Chat generated successfully", model=model)
-            return cleaned_response, 200
+            # Identical concurrent requests share one Ollama call
+            metrics_tags = self._build_metrics_tags(prompt, full_prompt, category, action)
+            (response_data, status_code), shared = self.single_flight.run(
+                request_key,
+                lambda: self._execute_chat(model, full_prompt, temperature, max_tokens,
+                                           cache_key=request_key if use_cache else None, user_id=user_id,
+                                           metrics_tags=metrics_tags)
+            )
+            if shared:
+                logger.info("Chat result shared with concurrent identical request", model=model)
+            if status_code == 200:
+                response_data = {**response_data, "coalesced": shared}
+            return response_data, status_code
 
-        except OllamaAPIError as e:
-            logger.error("Ollama API Error during chat generation", error=str(e))
-            return {"error": f"Ollama API Error: {e}"}, 500
         except Exception as e:
             logger.error("Unexpected error in chat generation",
                         error_type=type(e).__name__,
@@ -55,34 +127,477 @@ class ChatController:
                         stacktrace=traceback.format_exc())
             return {"error": f"Unexpected Error: {e}"}, 500
 
-    def _call_ollama_api(self, model: str, prompt: str, temperature: float, max_tokens: int) -> Dict[str, Any]:
-        """Call Ollama API and return response"""
-        headers = {
-            'Content-Type': 'application/json'
-        }
+    def _execute_chat(self, model: str, full_prompt: str, temperature: float, max_tokens: int,
+                      cache_key: Optional[str] = None, user_id: Optional[str] = None,
+                      metrics_tags: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], int]:
+        """Call Ollama and store cacheable results, errors are returned so they can be shared too"""
+        try:
+            # Call Ollama API once a slot for the model is free
+            with self.admission.admit(model, user_id):
+                response_data = self._call_ollama_api(model, full_prompt, temperature, max_tokens)
+        except OllamaQueueFullError as e:
+            return {"error": str(e), "retry_after": e.retry_after}, 429
+        except OllamaAPIError as e:
+            logger.error("Ollama API Error during chat generation", error=str(e))
+            return {"error": f"Ollama API Error: {e}"}, 500
+
+        # Clean response (remove context)
+        cleaned_response = self._clean_ollama_response(response_data)
+        self._record_inference_metrics(model, cleaned_response, streamed=False, **(metrics_tags or {}))
+
+        if cache_key and cleaned_response.get('done', True):
+            self.cache_service.set(cache_key, cleaned_response)
+
+        logger.info("Chat generated successfully", model=model)
+        return {**cleaned_response, "cached": False}, 200
+
+    def _generate_session_turn(self, model: str, full_prompt: str, temperature: float, max_tokens: int,
+                               user_id: Optional[str], session_id: str,
+                               metrics_tags: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """Run one conversation turn, continuing from the stored Ollama context"""
+        session = self.session_service.load(user_id, session_id, model)
+        try:
+            with self.admission.admit(model, user_id):
+                response_data = self._call_ollama_api(model, full_prompt, temperature, max_tokens,
+                                                      context=session["context"] if session else None)
+        except OllamaQueueFullError as e:
+            return {"error": str(e), "retry_after": e.retry_after}, 429
+        except OllamaAPIError as e:
+            logger.error("Ollama API Error during chat session turn", error=str(e), session_id=session_id)
+            return {"error": f"Ollama API Error: {e}"}, 500
+
+        session_info = self.session_service.save(user_id, session_id, model, response_data.get('context'), session)
+        cleaned_response = self._clean_ollama_response(response_data)
+        self._record_inference_metrics(model, cleaned_response, streamed=False, **metrics_tags)
+
+        logger.info("Chat session turn completed", model=model, session_id=session_id, turn=session_info["turn"])
+        return {**cleaned_response, "cached": False, "coalesced": False, "session": session_info}, 200
+
+    def get_session(self, session_id: str, user_id: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
+        """Get conversation session summary (turns, context size, expiry)"""
+        try:
+            info = self.session_service.get_info(user_id, session_id)
+            if info is None:
+                return {"error": "Session not found"}, 404
+            return info, 200
+        except Exception as e:
+            logger.error("Error reading chat session", session_id=session_id, error_type=type(e).__name__, error=str(e))
+            return {"error": f"Failed to read session: {e}"}, 500
+
+    def delete_session(self, session_id: str, user_id: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
+        """End conversation session and drop its stored context"""
+        try:
+            if not self.session_service.delete(user_id, session_id):
+                return {"error": "Session not found"}, 404
+            return {"id": session_id, "message": "Session deleted"}, 200
+        except Exception as e:
+            logger.error("Error deleting chat session", session_id=session_id, error_type=type(e).__name__, error=str(e))
+            return {"error": f"Failed to delete session: {e}"}, 500
 
+    def generate_chat_batch(self, model: str, pre_condition: str, inputs: List[str], post_condition: str,
+                            temperature: float = 0.3, max_tokens: int = 30, cache: Optional[bool] = None,
+                            stream_format: str = "ndjson",
+                            user_id: Optional[str] = None) -> Tuple[Union[Iterator[str], Dict[str, Any]], int]:
+        """
+        Apply one template to many inputs with bounded concurrency
+
+        Every item goes through generate_chat (cache, coalescing and admission queue apply).
+        Results are streamed in completion order, each frame carries the input index; a final
+        frame contains the summary.
+
+        Args:
+            model: Ollama model to use for all items
+            pre_condition: Text to prepend to each input
+            inputs: Input texts
+            post_condition: Text to append to each input
+            temperature: Sampling temperature (default 0.3)
+            max_tokens: Maximum tokens to generate per item (default 30)
+            cache: Use response cache (None = only for temperature 0)
+            stream_format: "ndjson" (chunked JSON lines) or "sse" (text/event-stream)
+            user_id: Requesting user, used for fair queueing
+
+        Returns:
+            Tuple of (result frame iterator or error response_data, status_code)
+        """
+        if not model or not inputs:
+            return {"error": "Missing model or inputs"}, 400
+        if len(inputs) > CHAT_BATCH_MAX_ITEMS:
+            return {"error": f"Too many inputs: {len(inputs)} (maximum {CHAT_BATCH_MAX_ITEMS})"}, 400
+
+        logger.info("Starting chat batch", model=model, items=len(inputs), concurrency=CHAT_BATCH_MAX_CONCURRENCY)
+        return self._run_chat_batch(model, pre_condition, inputs, post_condition, temperature, max_tokens,
+                                    cache, stream_format, user_id), 200
+
+    def _run_chat_batch(self, model: str, pre_condition: str, inputs: List[str], post_condition: str,
+                        temperature: float, max_tokens: int, cache: Optional[bool], stream_format: str,
+                        user_id: Optional[str]) -> Iterator[str]:
+        """Run batch items in a thread pool and yield one frame per finished item"""
+        started = time.monotonic()
+        summary = {"total_requested": len(inputs), "succeeded": 0, "failed": 0, "cached": 0}
+        executor = ThreadPoolExecutor(max_workers=min(CHAT_BATCH_MAX_CONCURRENCY, len(inputs)))
+        try:
+            futures = {
+                executor.submit(self.generate_chat, model, pre_condition, text, post_condition,
+                                temperature, max_tokens, cache, user_id): index
+                for index, text in enumerate(inputs)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    response_data, status_code = future.result()
+                except Exception as e:
+                    response_data, status_code = {"error": f"Unexpected Error: {e}"}, 500
+
+                if status_code == 200:
+                    summary["succeeded"] += 1
+                    summary["cached"] += 1 if response_data.get("cached") else 0
+                    frame = {"index": index, "status": "success", "result": response_data}
+                else:
+                    summary["failed"] += 1
+                    frame = {"index": index, "status": "error", "status_code": status_code,
+                             "error": response_data.get("error")}
+                yield self._format_stream_frame(frame, stream_format, event="item")
+
+            summary["duration_ms"] = int((time.monotonic() - started) * 1000)
+            logger.info("Chat batch completed", model=model, **summary)
+            yield self._format_stream_frame({"done": True, "summary": summary}, stream_format, event="done")
+        finally:
+            # Client disconnect: drop items that have not started yet
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _build_metrics_tags(self, prompt: str, full_prompt: str, category: Optional[str],
+                            action: Optional[str]) -> Dict[str, Any]:
+        return {"category": category, "action": action, "input_chars": len(prompt), "prompt_chars": len(full_prompt)}
+
+    def _record_inference_metrics(self, model: str, response_data: Dict[str, Any], streamed: bool, **tags) -> None:
+        """Persist Ollama timing stats of one call (durations are reported in ns)"""
+        if not CHAT_METRICS_ENABLED:
+            return
+
+        def to_ms(key: str) -> Optional[float]:
+            value = response_data.get(key)
+            return value / NS_PER_MS if value is not None else None
+
+        eval_count = response_data.get('eval_count')
+        eval_duration = response_data.get('eval_duration')
+        load_duration_ms = to_ms('load_duration')
+        ChatMetricsService.record_inference(model, {
+            "total_duration_ms": to_ms('total_duration'),
+            "load_duration_ms": load_duration_ms,
+            "prompt_eval_count": response_data.get('prompt_eval_count'),
+            "prompt_eval_duration_ms": to_ms('prompt_eval_duration'),
+            "eval_count": eval_count,
+            "eval_duration_ms": to_ms('eval_duration'),
+            "tokens_per_second": eval_count / (eval_duration / 1e9) if eval_count and eval_duration else None,
+            "cold_load": load_duration_ms is not None and load_duration_ms >= CHAT_METRICS_COLD_LOAD_MS
+        }, streamed=streamed, **tags)
+
+    def get_metrics_report(self, hours: int = 24) -> Tuple[Dict[str, Any], int]:
+        """
+        Get inference metrics per model and per template for the last hours
+
+        Args:
+            hours: Size of the rolling window
+
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            since = datetime.now(timezone.utc) - timedelta(hours=hours)
+
+            def finish(row: Dict[str, Any]) -> Dict[str, Any]:
+                row = {key: round(float(value), 2) if isinstance(value, (float, Decimal)) else value for key, value in row.items()}
+                row["cold_load_ratio"] = round(row["cold_loads"] / row["requests"], 4) if row["requests"] else 0.0
+                return row
+
+            return {
+                "window_hours": hours,
+                "since": since.isoformat(),
+                "cold_load_threshold_ms": CHAT_METRICS_COLD_LOAD_MS,
+                "models": [finish(row) for row in ChatMetricsService.get_aggregates(since)],
+                "templates": [finish(row) for row in ChatMetricsService.get_aggregates(since, by_template=True)]
+            }, 200
+        except Exception as e:
+            logger.error("Error building chat metrics report", error_type=type(e).__name__, error=str(e))
+            return {"error": f"Failed to build metrics report: {e}"}, 500
+
+    def get_queue_status(self) -> Tuple[Dict[str, Any], int]:
+        """Get Ollama admission queue depth, active slots and wait/run times per model"""
+        try:
+            return self.admission.get_queue_status(), 200
+        except Exception as e:
+            logger.error("Error reading Ollama queue status", error_type=type(e).__name__, error=str(e))
+            return {"error": f"Failed to read queue status: {e}"}, 500
+
+    def get_backends_status(self) -> Tuple[Dict[str, Any], int]:
+        """Get health, installed/loaded models and in-flight requests per Ollama host"""
+        try:
+            return self.router.get_status(), 200
+        except Exception as e:
+            logger.error("Error reading Ollama backend status", error_type=type(e).__name__, error=str(e))
+            return {"error": f"Failed to read backend status: {e}"}, 500
+
+    def get_warmup_status(self) -> Tuple[Dict[str, Any], int]:
+        """Get warmup configuration and last load times per template model"""
+        try:
+            return self.warmup.get_status(), 200
+        except Exception as e:
+            logger.error("Error reading Ollama warmup status", error_type=type(e).__name__, error=str(e))
+            return {"error": f"Failed to read warmup status: {e}"}, 500
+
+    def trigger_warmup(self) -> Tuple[Dict[str, Any], int]:
+        """Start warming all template models now"""
+        try:
+            models = self.warmup.trigger()
+            logger.info("Ollama warmup triggered", models=models)
+            return {"message": "Warmup started", "models": models}, 202
+        except Exception as e:
+            logger.error("Error starting Ollama warmup", error_type=type(e).__name__, error=str(e))
+            return {"error": f"Failed to start warmup: {e}"}, 500
+
+    def get_cache_stats(self) -> Tuple[Dict[str, Any], int]:
+        """Get chat response cache statistics (hit ratio, size, evictions)"""
+        try:
+            return self.cache_service.get_stats(), 200
+        except Exception as e:
+            logger.error("Error reading chat cache stats", error_type=type(e).__name__, error=str(e))
+            return {"error": f"Failed to read cache stats: {e}"}, 500
+
+    def clear_cache(self) -> Tuple[Dict[str, Any], int]:
+        """Remove all cached chat responses"""
+        try:
+            removed = self.cache_service.clear()
+            return {"removed": removed, "message": "Chat cache cleared"}, 200
+        except Exception as e:
+            logger.error("Error clearing chat cache", error_type=type(e).__name__, error=str(e))
+            return {"error": f"Failed to clear cache: {e}"}, 500
+
+    def stream_chat(self, model: str, pre_condition: str, prompt: str, post_condition: str,
+                    temperature: float = 0.3, max_tokens: int = 30, stream_format: str = "sse",
+                    user_id: Optional[str] = None, category: Optional[str] = None,
+                    action: Optional[str] = None,
+                    session_id: Optional[str] = None) -> Tuple[Union[Iterator[str], Dict[str, Any]], int]:
+        """
+        Generate chat response with Ollama as token stream
+
+        The Ollama request is opened before returning, so connection and HTTP errors are
+        reported as regular JSON error responses. Afterwards every Ollama NDJSON frame is
+        forwarded as-is (without context), including the final frame with the timing stats.
+
+        Args:
+            model: Ollama model to use (e.g. "llama3.2:3b")
+            pre_condition: Text to prepend to prompt
+            prompt: Main prompt text
+            post_condition: Text to append to prompt
+            temperature: Sampling temperature (default 0.3)
+            max_tokens: Maximum tokens to generate (default 30)
+            stream_format: "sse" (text/event-stream) or "ndjson" (chunked JSON lines)
+            user_id: Requesting user, used for fair queueing
+            category: Prompt template category (recorded in inference metrics)
+            action: Prompt template action (recorded in inference metrics)
+            session_id: Continue server-side conversation (Ollama context)
+
+        Returns:
+            Tuple of (chunk iterator or error response_data, status_code)
+        """
+        if not model or not prompt:
+            return {"error": "Missing model or prompt"}, 400
+
+        full_prompt = self._build_prompt(pre_condition, prompt, post_condition)
+
+        try:
+            ticket = self.admission.acquire(model, user_id)
+        except OllamaQueueFullError as e:
+            return {"error": str(e), "retry_after": e.retry_after}, 429
+        started = time.monotonic()
+        last_renewed = [started]
+
+        def release_slot():
+            self.admission.release(model, ticket, (time.monotonic() - started) * 1000)
+
+        def renew_slot():
+            # Streams may outlive the lease (OLLAMA_TIMEOUT only applies between chunks)
+            if time.monotonic() - last_renewed[0] > self.admission.lease_ms / 3000:
+                last_renewed[0] = time.monotonic()
+                self.admission.renew(model, ticket)
+
+        try:
+            session = self.session_service.load(user_id, session_id, model) if session_id else None
+            logger.info("Streaming chat", model=model, stream_format=stream_format)
+            resp, release_backend = self._open_ollama_stream(model, full_prompt, temperature, max_tokens,
+                                                             context=session["context"] if session else None)
+        except OllamaAPIError as e:
+            release_slot()
+            logger.error("Ollama API Error during chat streaming", error=str(e))
+            return {"error": f"Ollama API Error: {e}"}, 500
+        except Exception:
+            release_slot()
+            raise
+
+        def save_session(frame: Dict[str, Any]) -> Dict[str, Any]:
+            return {"session": self.session_service.save(user_id, session_id, model, frame.get('context'), session)}
+
+        metrics_tags = self._build_metrics_tags(prompt, full_prompt, category, action)
+
+        released = [False]
+
+        def release_all():
+            # Called by the relay's finally and by ClosingStream.close(), whichever comes first
+            if released[0]:
+                return
+            released[0] = True
+            resp.close()
+            release_backend()
+            release_slot()
+
+        frames = self._relay_ollama_stream(resp, model, stream_format, on_close=release_all, metrics_tags=metrics_tags,
+                                           on_done=save_session if session_id else None, on_frame=renew_slot)
+        return ClosingStream(frames, release_all), 200
+
+    def _build_prompt(self, pre_condition: str, prompt: str, post_condition: str) -> str:
+        """Build full prompt optimized for gpt-oss:20b with clear instruction separation"""
+        return f"[INSTRUCTION] {pre_condition or ''} [USER] {prompt} [FORMAT] {post_condition or ''}"
+
+    def _build_payload(self, model: str, prompt: str, temperature: float, max_tokens: int, stream: bool,
+                       context: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Build Ollama /api/generate payload (context continues a previous conversation)"""
         payload = {
             'model': model,
             'prompt': prompt,
-            'stream': False,
+            'stream': stream,
+            # Same keep_alive as the warmup, otherwise every request resets it to Ollama's default
+            'keep_alive': OllamaWarmupService.get_keep_alive(model),
             'options': {
                 'temperature': temperature,
                 'max_tokens': max_tokens
             }
         }
+        if context:
+            payload['context'] = context
+        return payload
+
+    def _open_ollama_stream(self, model: str, prompt: str, temperature: float, max_tokens: int,
+                            context: Optional[List[int]] = None) -> Tuple[requests.Response, Callable[[], None]]:
+        """Open streaming Ollama request on the best backend, the read timeout applies between chunks"""
+        logger.debug("Calling Ollama API (stream)", model=model)
+
+        try:
+            resp, release_backend = self.router.request(
+                model,
+                "/api/generate",
+                headers={'Content-Type': 'application/json'},
+                json=self._build_payload(model, prompt, temperature, max_tokens, stream=True, context=context),
+                timeout=OLLAMA_TIMEOUT,
+                stream=True
+            )
+        except OllamaNoBackendError as e:
+            logger.error("No Ollama backend available", model=model, error=str(e))
+            raise OllamaAPIError(str(e))
+        except requests.exceptions.RequestException as e:
+            logger.error("Ollama API Network Error", error_type=type(e).__name__, error=str(e))
+            raise OllamaAPIError(f"Network Error: {e}")
+
+        if resp.status_code != 200:
+            response_text = resp.text
+            resp.close()
+            release_backend()
+            logger.error("Ollama API Error Response", status_code=resp.status_code, response_text=response_text)
+            try:
+                error_data = json.loads(response_text)
+            except ValueError:
+                raise OllamaAPIError(f"HTTP {resp.status_code}: {response_text}")
+            raise OllamaAPIError(error_data)
+
+        return resp, release_backend
+
+    def _relay_ollama_stream(self, resp: requests.Response, model: str, stream_format: str,
+                             on_close: Optional[Callable[[], None]] = None,
+                             metrics_tags: Optional[Dict[str, Any]] = None,
+                             on_done: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                             on_frame: Optional[Callable[[], None]] = None) -> Iterator[str]:
+        """
+        Forward Ollama NDJSON frames as SSE events or NDJSON lines, on_done may add fields to the final frame
+        and on_frame is called for every received line (e.g. to keep the admission lease alive)
+        """
+        chunks = 0
+        try:
+            for line in resp.iter_lines():
+                if on_frame:
+                    on_frame()
+                if not line:
+                    continue
+                try:
+                    frame = json.loads(line)
+                except ValueError:
+                    logger.warning("Skipping invalid Ollama stream frame", model=model)
+                    continue
+
+                if 'error' in frame:
+                    logger.error("Ollama stream error", model=model, error=frame['error'])
+                    yield self._format_stream_frame({"error": f"Ollama API Error: {frame['error']}", "done": True},
+                                                    stream_format, event="error")
+                    return
+
+                chunks += 1
+                if frame.get('done'):
+                    logger.info("Chat stream completed", model=model, chunks=chunks,
+                                eval_count=frame.get('eval_count'), total_duration=frame.get('total_duration'))
+                    extra = on_done(frame) if on_done else {}
+                    # Before the last yield, a client disconnecting now must not lose the metrics
+                    self._record_inference_metrics(model, frame, streamed=True, **(metrics_tags or {}))
+                    yield self._format_stream_frame({**self._clean_ollama_response(frame), **extra}, stream_format, event="done")
+                    return
+
+                yield self._format_stream_frame(frame, stream_format)
+
+            # Upstream closed without final frame
+            logger.warning("Ollama stream ended without done frame", model=model, chunks=chunks)
+            yield self._format_stream_frame({"error": "Ollama stream ended unexpectedly", "done": True},
+                                            stream_format, event="error")
+        except requests.exceptions.RequestException as e:
+            logger.error("Ollama stream interrupted", model=model, chunks=chunks, error_type=type(e).__name__, error=str(e))
+            yield self._format_stream_frame({"error": f"Network Error: {e}", "done": True}, stream_format, event="error")
+        finally:
+            # Also runs when the client disconnects (GeneratorExit) - frees the Ollama request and slot
+            resp.close()
+            if on_close:
+                on_close()
+
+    def _format_stream_frame(self, frame: Dict[str, Any], stream_format: str, event: Optional[str] = None) -> str:
+        """Serialize one frame for the selected stream format"""
+        data = json.dumps(frame, ensure_ascii=False)
+        if stream_format == "ndjson":
+            return f"{data}\n"
+        if event:
+            return f"event: {event}\ndata: {data}\n\n"
+        return f"data: {data}\n\n"
+
+    def _call_ollama_api(self, model: str, prompt: str, temperature: float, max_tokens: int,
+                         context: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Call Ollama API and return response"""
+        headers = {
+            'Content-Type': 'application/json'
+        }
+
+        payload = self._build_payload(model, prompt, temperature, max_tokens, stream=False, context=context)
 
-        api_url = f"{OLLAMA_URL}/api/generate"
-        logger.debug("Calling Ollama API", api_url=api_url)
+        logger.debug("Calling Ollama API", model=model)
 
         try:
-            resp = requests.post(
-                api_url,
+            resp, release_backend = self.router.request(
+                model,
+                "/api/generate",
                 headers=headers,
                 json=payload,
                 timeout=OLLAMA_TIMEOUT
             )
-            logger.debug("Ollama API response received", status_code=resp.status_code)
+            # Body is already read (no streaming), the backend is free again
+            release_backend()
+            logger.debug("Ollama API response received", status_code=resp.status_code, backend=resp.url)
             resp.raise_for_status()
+        except OllamaNoBackendError as e:
+            logger.error("No Ollama backend available", model=model, error=str(e))
+            raise OllamaAPIError(str(e))
         except requests.exceptions.RequestException as e:
             logger.error("Ollama API Network Error", error_type=type(e).__name__, error=str(e))
             raise OllamaAPIError(f"Network Error: {e}")
@@ -2,6 +2,8 @@
 import logging
 from typing import Tuple, Dict, Any, List, Optional
 from business.image_business_service import ImageBusinessService, ImageGenerationError
+from business.image_similarity_service import ImageSimilarityService, ImageSimilarityError
+from celery_app import celery_app, reconcile_image_storage_task
 
 logger = logging.getLogger(__name__)
 
@@ -11,8 +13,10 @@ class ImageController:
 
     def __init__(self):
         self.business_service = ImageBusinessService()
+        self.similarity_service = ImageSimilarityService()
 
-    def generate_image(self, prompt: str, size: str, title: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
+    def generate_image(self, prompt: str, size: str, title: Optional[str] = None,
+                       reuse: Optional[bool] = None) -> Tuple[Dict[str, Any], int]:
         """
         Generate image via business service
 
@@ -20,6 +24,7 @@ class ImageController:
             prompt: Image generation prompt
             size: Image size specification
             title: Optional image title
+            reuse: Optional flag to reuse an existing identical image (None = server default)
 
         Returns:
             Tuple of (response_data, status_code)
@@ -29,7 +34,7 @@ class ImageController:
             return {"error": "Missing prompt or size"}, 400
 
         try:
-            result = self.business_service.generate_image(prompt, size, title)
+            result = self.business_service.generate_image(prompt, size, title, reuse=reuse)
             return result, 200
 
         except ImageGenerationError as e:
@@ -39,6 +44,40 @@ class ImageController:
             logger.error(f"Unexpected error in image generation: {type(e).__name__}: {e}")
             return {"error": "Internal server error"}, 500
 
+    def generate_images_batch(self, items: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
+        """
+        Generate multiple images concurrently via business service
+
+        Args:
+            items: List of dicts with prompt, size and optional title/reuse
+
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        if not items:
+            return {"error": "No items provided"}, 400
+
+        try:
+            result = self.business_service.generate_images_batch(items)
+
+            # Determine response status based on results
+            summary = result["summary"]
+            if summary["failed"] == 0:
+                status_code = 200
+            elif summary["succeeded"] > 0:
+                status_code = 207  # Multi-Status
+            else:
+                status_code = 500
+
+            return result, status_code
+
+        except ImageGenerationError as e:
+            logger.error(f"Batch image generation failed: {e}")
+            return {"error": str(e)}, 400
+        except Exception as e:
+            logger.error(f"Unexpected error in batch image generation: {type(e).__name__}: {e}")
+            return {"error": "Internal server error"}, 500
+
     def get_images(self, limit: int = 20, offset: int = 0, search: str = '',
                    sort_by: str = 'created_at', sort_direction: str = 'desc') -> Tuple[Dict[str, Any], int]:
         """
@@ -183,4 +222,99 @@ class ImageController:
             return {"error": str(e)}, 500
         except Exception as e:
             logger.error(f"Unexpected error updating image {image_id}: {type(e).__name__}: {e}")
-            return {"error": "Internal server error"}, 500
\ No newline at end of file
+            return {"error": "Internal server error"}, 500
+
+    def get_similar_images(self, image_id: str, max_distance: int = 8, limit: int = 20) -> Tuple[Dict[str, Any], int]:
+        """
+        Get visually similar images by perceptual hash distance
+
+        Args:
+            image_id: ID of the reference image
+            max_distance: Maximum hamming distance (lower is more similar)
+            limit: Maximum number of results
+
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            result = self.similarity_service.find_similar_images(image_id, max_distance, limit)
+
+            if result is None:
+                return {"error": "Image not found"}, 404
+
+            return result, 200
+
+        except ImageSimilarityError as e:
+            logger.error(f"Failed to find similar images for {image_id}: {e}")
+            return {"error": str(e)}, 500
+        except Exception as e:
+            logger.error(f"Unexpected error finding similar images for {image_id}: {type(e).__name__}: {e}")
+            return {"error": "Internal server error"}, 500
+
+    def get_duplicate_report(self, max_distance: int = 4) -> Tuple[Dict[str, Any], int]:
+        """
+        Get report of near-duplicate image groups
+
+        Args:
+            max_distance: Maximum hamming distance to treat images as duplicates
+
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            result = self.similarity_service.get_duplicate_report(max_distance)
+            return result, 200
+
+        except ImageSimilarityError as e:
+            logger.error(f"Failed to build duplicate report: {e}")
+            return {"error": str(e)}, 500
+        except Exception as e:
+            logger.error(f"Unexpected error building duplicate report: {type(e).__name__}: {e}")
+            return {"error": "Internal server error"}, 500
+
+    def start_reconciliation(self, fix_orphans: bool = False, fix_dangling: bool = False,
+                             batch_size: int = 1000) -> Tuple[Dict[str, Any], int]:
+        """
+        Enqueue image storage reconciliation job
+
+        Args:
+            fix_orphans: Quarantine files without database row
+            fix_dangling: Delete database rows without file
+            batch_size: Filenames/rows checked per database query
+
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            task = reconcile_image_storage_task.delay(fix_orphans, fix_dangling, batch_size)
+            return {"task_id": task.id, "status": "PENDING"}, 202
+
+        except Exception as e:
+            logger.error(f"Failed to enqueue image reconciliation: {type(e).__name__}: {e}")
+            return {"error": "Failed to start reconciliation"}, 500
+
+    def get_reconciliation_status(self, task_id: str) -> Tuple[Dict[str, Any], int]:
+        """
+        Get status and report of an image storage reconciliation job
+
+        Args:
+            task_id: Celery task ID
+
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            result = celery_app.AsyncResult(task_id)
+
+            if result.state == 'PROGRESS':
+                return {"task_id": task_id, "status": "PROGRESS", "progress": result.info}, 200
+            elif result.state == 'SUCCESS':
+                return {"task_id": task_id, "status": "SUCCESS", "result": result.result}, 200
+            elif result.state == 'FAILURE':
+                return {"task_id": task_id, "status": "FAILURE", "error": str(result.result)}, 200
+
+            return {"task_id": task_id, "status": result.state}, 200
+
+        except Exception as e:
+            logger.error(f"Error getting reconciliation status for {task_id}: {type(e).__name__}: {e}")
+            return {"error": "Internal server error"}, 500
@@ -2,12 +2,11 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from db.models import PromptTemplate
+from business.prompt_template_cache import PromptTemplateCache
 from schemas.prompt_schemas import (
     PromptTemplateCreate,
     PromptTemplateUpdate,
-    PromptTemplateResponse,
-    PromptCategoryResponse,
-    PromptTemplatesGroupedResponse
+    PromptTemplateResponse
 )
 from typing import Dict, Any, Optional, Tuple
 
@@ -16,68 +15,44 @@ class PromptController:
     """Controller for prompt template operations"""
 
     @staticmethod
-    def get_all_templates(db: Session) -> Tuple[Dict[str, Any], int]:
-        """Get all prompt templates grouped by category and action"""
+    def get_all_templates(db: Session, grouped: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], int]:
+        """Get all prompt templates grouped by category and action (served from the template cache or given snapshot)"""
         try:
-            templates = db.query(PromptTemplate).filter(PromptTemplate.active == True).all()
-
-            # Group by category and action
-            grouped: Dict[str, Dict[str, Any]] = {}
-            for template in templates:
-                if template.category not in grouped:
-                    grouped[template.category] = {}
-
-                template_data = PromptTemplateResponse.model_validate(template)
-                grouped[template.category][template.action] = template_data
-
-            response = PromptTemplatesGroupedResponse(categories=grouped)
-            return response.model_dump(), 200
+            return {"categories": grouped if grouped is not None else PromptTemplateCache.get_grouped(db)}, 200
 
         except Exception as e:
             return {"error": f"Failed to retrieve templates: {str(e)}"}, 500
 
     @staticmethod
-    def get_category_templates(db: Session, category: str) -> Tuple[Dict[str, Any], int]:
+    def get_category_templates(db: Session, category: str,
+                               grouped: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], int]:
         """Get all templates for a specific category"""
         try:
-            templates = db.query(PromptTemplate).filter(
-                PromptTemplate.category == category,
-                PromptTemplate.active == True
-            ).all()
+            if grouped is None:
+                grouped = PromptTemplateCache.get_grouped(db)
+            templates_by_action = grouped.get(category)
 
-            if not templates:
+            if not templates_by_action:
                 return {"error": f"No templates found for category '{category}'"}, 404
 
-            # Group by action
-            templates_by_action: Dict[str, PromptTemplateResponse] = {}
-            for template in templates:
-                template_data = PromptTemplateResponse.model_validate(template)
-                templates_by_action[template.action] = template_data
-
-            response = PromptCategoryResponse(
-                category=category,
-                templates=templates_by_action
-            )
-            return response.model_dump(), 200
+            return {"category": category, "templates": templates_by_action}, 200
 
         except Exception as e:
             return {"error": f"Failed to retrieve category templates: {str(e)}"}, 500
 
     @staticmethod
-    def get_specific_template(db: Session, category: str, action: str) -> Tuple[Dict[str, Any], int]:
+    def get_specific_template(db: Session, category: str, action: str,
+                              grouped: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], int]:
         """Get a specific template by category and action"""
         try:
-            template = db.query(PromptTemplate).filter(
-                PromptTemplate.category == category,
-                PromptTemplate.action == action,
-                PromptTemplate.active == True
-            ).first()
+            if grouped is None:
+                grouped = PromptTemplateCache.get_grouped(db)
+            template = grouped.get(category, {}).get(action)
 
             if not template:
                 return {"error": f"Template not found for category '{category}' and action '{action}'"}, 404
 
-            response = PromptTemplateResponse.model_validate(template)
-            return response.model_dump(), 200
+            return template, 200
 
         except Exception as e:
             return {"error": f"Failed to retrieve template: {str(e)}"}, 500
@@ -112,6 +87,7 @@ class PromptController:
             # updated_at will be set automatically by SQLAlchemy onupdate trigger
             db.commit()
             db.refresh(template)
+            PromptTemplateCache.invalidate()
 
             response = PromptTemplateResponse.model_validate(template)
             return response.model_dump(), 200
@@ -138,6 +114,7 @@ class PromptController:
             db.add(new_template)
             db.commit()
             db.refresh(new_template)
+            PromptTemplateCache.invalidate()
 
             response = PromptTemplateResponse.model_validate(new_template)
             return response.model_dump(), 201
@@ -163,6 +140,7 @@ class PromptController:
 
             template.active = False
             db.commit()
+            PromptTemplateCache.invalidate()
 
             return {"message": f"Template for category '{category}' and action '{action}' has been deactivated"}, 200
 
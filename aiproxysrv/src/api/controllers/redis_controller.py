@@ -1,11 +1,21 @@
 """Redis Controller - Handles business logic for Redis operations"""
 import traceback
+import os
 import redis
 import json
-from typing import Tuple, Dict, Any, List
+from typing import Tuple, Dict, Any, List, Optional
 from config.settings import CELERY_BROKER_URL
+from db.redis_client import get_redis_client, get_pool_stats
+from db.song_service import song_service
+from celery_app import compact_task_results_task
 from utils.logger import logger
 
+TASK_META_PREFIX = "celery-task-meta-"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Keys per SCAN call in summary mode (no page size applies there)
+SUMMARY_SCAN_COUNT = 1000
+
 
 class RedisController:
     """Controller for Redis task operations"""
@@ -14,83 +24,172 @@ class RedisController:
         self.redis_url = CELERY_BROKER_URL
     
     def _get_redis_connection(self) -> redis.Redis:
-        """Get Redis connection"""
-        return redis.from_url(self.redis_url)
-    
-    def list_celery_tasks(self) -> Tuple[Dict[str, Any], int]:
+        """Get shared Redis client (process-wide pool)"""
+        return get_redis_client(self.redis_url, socket_timeout=5)
+
+    def get_pool_stats(self) -> Tuple[Dict[str, Any], int]:
         """
-        List all Celery task metadata
-        
+        Connection pool usage of this worker process
+
         Returns:
             Tuple of (response_data, status_code)
         """
+        return {"pid": os.getpid(), "pools": get_pool_stats()}, 200
+
+    @staticmethod
+    def _page_size(limit: Optional[int]) -> int:
+        return max(1, min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+    def _scan_pages(self, r: redis.Redis, cursor: int, count: int):
+        """
+        SCAN task meta keys from cursor, yields (next_cursor, keys, values) per SCAN page
+
+        Values of a page are fetched with one MGET, so every page costs two round trips
+        regardless of its size. Keys expired between SCAN and MGET have value None.
+        """
+        while True:
+            cursor, keys = r.scan(cursor=cursor, match=f"{TASK_META_PREFIX}*", count=count)
+            values = r.mget(keys) if keys else []
+            yield cursor, keys, values
+            if cursor == 0:
+                return
+
+    def list_celery_tasks(self, cursor: int = 0, limit: Optional[int] = None, summary: bool = False) -> Tuple[Dict[str, Any], int]:
+        """
+        List Celery task metadata page by page
+
+        Args:
+            cursor: SCAN cursor from the previous page (0 = start)
+            limit: Page size (default 100, max 1000), a page ends at a SCAN boundary and may hold
+                   slightly more tasks
+            summary: Only count tasks by status over all keys, without metadata
+
+        Returns:
+            Tuple of (response_data, status_code), next_cursor is None on the last page
+        """
         try:
             logger.debug("Connecting to Redis", redis_url=self.redis_url)
             r = self._get_redis_connection()
-            pattern = "celery-task-meta-*"
+            if summary:
+                return self._summarize_tasks(r), 200
 
+            page_size = self._page_size(limit)
             tasks = []
-            for key in r.scan_iter(match=pattern):
-                key_str = key.decode()
-                task_id = key_str[len("celery-task-meta-"):]
-
-                meta_json = r.get(key)
-                meta_str = meta_json.decode() if meta_json else None
+            next_cursor = 0
+            for next_cursor, keys, values in self._scan_pages(r, cursor, page_size):
+                for key, meta_json in zip(keys, values):
+                    key_str = key.decode()
+                    tasks.append({
+                        "key": key_str,
+                        "task_id": key_str[len(TASK_META_PREFIX):],
+                        "meta": meta_json.decode() if meta_json else None
+                    })
+                if len(tasks) >= page_size:
+                    break
 
-                tasks.append({
-                    "key": key_str,
-                    "task_id": task_id,
-                    "meta": meta_str
-                })
-
-            logger.info("Retrieved tasks from Redis", task_count=len(tasks))
-            return {"tasks": tasks}, 200
+            logger.info("Retrieved tasks from Redis", task_count=len(tasks), next_cursor=next_cursor)
+            return {"tasks": tasks, "count": len(tasks), "next_cursor": next_cursor or None}, 200
 
         except Exception as e:
             logger.error("Error listing Redis tasks", error=str(e), error_type=type(e).__name__, stacktrace=traceback.format_exc())
             return {"error": str(e)}, 500
+
+    def _summarize_tasks(self, r: redis.Redis) -> Dict[str, Any]:
+        """Task counts by status over all meta keys, memory stays bounded by one SCAN page"""
+        by_status: Dict[str, int] = {}
+        total = 0
+        for _, _, values in self._scan_pages(r, 0, SUMMARY_SCAN_COUNT):
+            for meta_json in values:
+                if not meta_json:
+                    continue
+                try:
+                    status = json.loads(meta_json).get("status") or "UNKNOWN"
+                except (ValueError, AttributeError):
+                    status = "UNKNOWN"
+                by_status[status] = by_status.get(status, 0) + 1
+                total += 1
+
+        logger.info("Summarized tasks in Redis", task_count=total)
+        return {"total": total, "by_status": by_status}
     
-    def list_redis_keys(self) -> Tuple[Dict[str, Any], int]:
+    def list_redis_keys(self, cursor: int = 0, limit: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
         """
-        List all Celery meta keys, sorted by created_at
+        List successful Celery meta keys page by page, each page sorted by created_at
         
+        Args:
+            cursor: SCAN cursor from the previous page (0 = start)
+            limit: Page size (default 100, max 1000)
+
         Returns:
-            Tuple of (response_data, status_code)
+            Tuple of (response_data, status_code), next_cursor is None on the last page
         """
         try:
             r = self._get_redis_connection()
-            pattern = "celery-task-meta-*"
+            page_size = self._page_size(limit)
             tasks = []
-            
-            for key_bytes in r.scan_iter(match=pattern):
-                key_str = key_bytes.decode()
-                task_id = key_str.removeprefix("celery-task-meta-")
-                
-                meta_json = r.get(key_bytes)
-                if not meta_json:
-                    continue
-                
-                meta = json.loads(meta_json)
-                
-                if meta.get("status") != "SUCCESS":
-                    continue
-                
-                result = meta.get("result", {}).get("result")
-                created_at = result.get("created_at") if result else ""
-                
-                tasks.append({
-                    "key": key_str,
-                    "task_id": task_id,
-                    "created_at": created_at
-                })
+            next_cursor = 0
+
+            for next_cursor, keys, values in self._scan_pages(r, cursor, page_size):
+                for key_bytes, meta_json in zip(keys, values):
+                    if not meta_json:
+                        continue
+
+                    meta = json.loads(meta_json)
+
+                    if meta.get("status") != "SUCCESS":
+                        continue
+
+                    result = (meta.get("result") or {}).get("result")
+                    created_at = result.get("created_at") if isinstance(result, dict) else ""
+
+                    key_str = key_bytes.decode()
+                    tasks.append({
+                        "key": key_str,
+                        "task_id": key_str.removeprefix(TASK_META_PREFIX),
+                        "created_at": created_at or ""
+                    })
+                if len(tasks) >= page_size:
+                    break
             
             tasks.sort(key=lambda t: t["created_at"], reverse=True)
-            return {"tasks": tasks}, 200
+            return {"tasks": tasks, "count": len(tasks), "next_cursor": next_cursor or None}, 200
 
         except Exception as exc:
             logger.error("Error listing Redis keys", error=str(exc), error_type=type(exc).__name__, stacktrace=traceback.format_exc())
             return {"error": str(exc)}, 500
     
+    def get_compaction_report(self) -> Tuple[Dict[str, Any], int]:
+        """
+        Report of the last task result compaction (reclaimed keys and bytes)
+
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            report = song_service.get_compaction_report()
+            if report is None:
+                return {"error": "Compaction has not run yet"}, 404
+            return report, 200
+
+        except Exception as exc:
+            logger.error("Error reading compaction report", error=str(exc), error_type=type(exc).__name__)
+            return {"error": str(exc)}, 500
+
+    def trigger_compaction(self) -> Tuple[Dict[str, Any], int]:
+        """
+        Start a task result compaction now (runs on the Celery worker)
+
+        Returns:
+            Tuple of (response_data, status_code)
+        """
+        try:
+            task = compact_task_results_task.delay()
+            return {"task_id": task.id, "status": "PENDING"}, 202
+
+        except Exception as exc:
+            logger.error("Failed to enqueue task result compaction", error=str(exc), error_type=type(exc).__name__)
+            return {"error": "Failed to start compaction"}, 500
+
     def delete_redis_key(self, task_id: str) -> Tuple[Dict[str, Any], int]:
         """
         Delete a Redis key by task ID
@@ -103,8 +202,7 @@ class RedisController:
         """
         try:
             r = self._get_redis_connection()
-            pattern = "celery-task-meta-"
-            celery_task_id = f"{pattern}{task_id}"
+            celery_task_id = f"{TASK_META_PREFIX}{task_id}"
             
             deleted = r.delete(celery_task_id)
             
@@ -4,10 +4,13 @@ import time
 import json
 from typing import Tuple, Dict, Any
 from config.settings import MUREKA_API_KEY, MUREKA_STATUS_ENDPOINT
-from celery_app import celery_app, get_slot_status
+from celery_app import celery_app, get_slot_status, MAINTENANCE_QUEUE
 from db.song_service import song_service
+from business.queue_status_service import QueueStatusService
 from utils.logger import logger
 
+queue_status_service = QueueStatusService()
+
 
 class SongTaskController:
     """Controller for song task management operations"""
@@ -224,10 +227,11 @@ class SongTaskController:
             return {"error": str(e)}, 500
     
     def get_queue_status(self) -> Tuple[Dict[str, Any], int]:
-        """Get Queue Status"""
+        """Get Queue Status - broker queue depth, reserved/active tasks, MUREKA slots and per task type metrics"""
         try:
-            slot_status = get_slot_status()
-            return slot_status, 200
+            status = queue_status_service.get_status([celery_app.conf.task_default_queue, MAINTENANCE_QUEUE])
+            status["slots"] = get_slot_status()
+            return status, 200
         except Exception as e:
             logger.error("Error getting queue status", error=str(e))
             return {"error": str(e)}, 500
\ No newline at end of file
@@ -5,6 +5,8 @@ from typing import Tuple, Dict, Any, Optional
 from datetime import datetime, timedelta
 from db.database import SessionLocal
 from db.user_service import UserService
+from business.token_auth_service import TokenAuthService
+from business.password_hasher import PasswordHashBusyError
 from schemas.user_schemas import (
     UserCreateRequest, UserCreateResponse,
     LoginRequest, LoginResponse,
@@ -22,6 +24,7 @@ class UserController:
 
     def __init__(self):
         self.user_service = UserService()
+        self.token_auth = TokenAuthService()
 
     def _get_db(self):
         """Get database session"""
@@ -36,18 +39,24 @@ class UserController:
         """Format success response"""
         return response_model.model_dump(), status_code
 
-    def create_user(self, request: UserCreateRequest) -> Tuple[Dict[str, Any], int]:
+    def _format_busy_response(self, error: PasswordHashBusyError) -> Tuple[Dict[str, Any], int]:
+        """Format 429 response for rejected password operations"""
+        error_response = ErrorResponse(error=str(error))
+        return {**error_response.model_dump(), "retry_after": error.retry_after}, 429
+
+    def create_user(self, request: UserCreateRequest, client_ip: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
         """Create a new user"""
         db = self._get_db()
         try:
             # Create user using service
-            user = self.user_service.create_user(
-                db=db,
-                email=request.email,
-                password=request.password,
-                first_name=request.first_name,
-                last_name=request.last_name
-            )
+            with self.user_service.password_hasher.limit(ip=client_ip):
+                user = self.user_service.create_user(
+                    db=db,
+                    email=request.email,
+                    password=request.password,
+                    first_name=request.first_name,
+                    last_name=request.last_name
+                )
 
             if not user:
                 return self._format_error_response("Failed to create user", 500)
@@ -60,6 +69,8 @@ class UserController:
             )
             return self._format_success_response(response, 201)
 
+        except PasswordHashBusyError as e:
+            return self._format_busy_response(e)
         except ValueError as e:
             return self._format_error_response(str(e), 400)
         except Exception as e:
@@ -68,16 +79,17 @@ class UserController:
         finally:
             db.close()
 
-    def login(self, request: LoginRequest) -> Tuple[Dict[str, Any], int]:
+    def login(self, request: LoginRequest, client_ip: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
         """Authenticate user and return JWT token"""
         db = self._get_db()
         try:
             # Authenticate user
-            user = self.user_service.authenticate_user(
-                db=db,
-                email=request.email,
-                password=request.password
-            )
+            with self.user_service.password_hasher.limit(account=request.email, ip=client_ip):
+                user = self.user_service.authenticate_user(
+                    db=db,
+                    email=request.email,
+                    password=request.password
+                )
 
             if not user:
                 return self._format_error_response("Invalid email or password", 401)
@@ -98,14 +110,23 @@ class UserController:
             )
             return self._format_success_response(response, 200)
 
+        except PasswordHashBusyError as e:
+            return self._format_busy_response(e)
         except Exception as e:
             logger.error("Error during login", error=str(e))
             return self._format_error_response("Internal server error", 500)
         finally:
             db.close()
 
-    def logout(self) -> Tuple[Dict[str, Any], int]:
-        """Logout user (token invalidation would happen on frontend)"""
+    def logout(self, token: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
+        """Logout user, the token is revoked until it expires"""
+        if token:
+            try:
+                self.token_auth.revoke(token)
+            except Exception as e:
+                logger.error("Error revoking token on logout", error=str(e))
+                return self._format_error_response("Logout failed, token could not be revoked", 500)
+
         response = LogoutResponse(
             success=True,
             message="Logout successful"
@@ -162,12 +183,13 @@ class UserController:
         """Change user password"""
         db = self._get_db()
         try:
-            success = self.user_service.change_password(
-                db=db,
-                user_id=user_id,
-                old_password=request.old_password,
-                new_password=request.new_password
-            )
+            with self.user_service.password_hasher.limit(account=user_id):
+                success = self.user_service.change_password(
+                    db=db,
+                    user_id=user_id,
+                    old_password=request.old_password,
+                    new_password=request.new_password
+                )
 
             if not success:
                 return self._format_error_response("Invalid current password or user not found", 400)
@@ -178,6 +200,8 @@ class UserController:
             )
             return self._format_success_response(response, 200)
 
+        except PasswordHashBusyError as e:
+            return self._format_busy_response(e)
         except Exception as e:
             logger.error("Error changing password", error=str(e))
             return self._format_error_response("Internal server error", 500)
@@ -188,11 +212,12 @@ class UserController:
         """Reset user password (admin function)"""
         db = self._get_db()
         try:
-            success = self.user_service.reset_password(
-                db=db,
-                email=request.email,
-                new_password=request.new_password
-            )
+            with self.user_service.password_hasher.limit(account=request.email):
+                success = self.user_service.reset_password(
+                    db=db,
+                    email=request.email,
+                    new_password=request.new_password
+                )
 
             if not success:
                 return self._format_error_response("User not found", 404)
@@ -203,6 +228,8 @@ class UserController:
             )
             return self._format_success_response(response, 200)
 
+        except PasswordHashBusyError as e:
+            return self._format_busy_response(e)
         except Exception as e:
             logger.error("Error resetting password", error=str(e))
             return self._format_error_response("Internal server error", 500)
@@ -230,10 +257,14 @@ class UserController:
         finally:
             db.close()
 
+    def get_auth_stats(self) -> Tuple[Dict[str, Any], int]:
+        """Get token cache and revocation statistics of this worker"""
+        return self.token_auth.get_stats(), 200
+
     def validate_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Validate JWT token and return user info"""
         try:
-            payload = self.user_service.verify_jwt_token(token)
+            payload = self.token_auth.verify(token)
             if payload:
                 return {
                     'user_id': payload.get('user_id'),
@@ -0,0 +1,58 @@
+"""
+Rate Limit Middleware for Flask API
+"""
+from functools import wraps
+from typing import Optional
+from flask import jsonify, g, make_response, request
+from business.rate_limit_service import RateLimitService
+
+# Shared instance, one Redis round trip per request
+rate_limiter = RateLimitService()
+
+
+def _request_cost(cost_field: Optional[str]) -> int:
+    """Number of items in the JSON list cost_field of the request body (1 for single requests)"""
+    if not cost_field:
+        return 1
+    body = request.get_json(silent=True)
+    items = body.get(cost_field) if isinstance(body, dict) else None
+    return max(1, len(items)) if isinstance(items, list) else 1
+
+
+def rate_limited(group: str, cost_field: Optional[str] = None):
+    """
+    Decorator to throttle an endpoint per authenticated user and route group.
+    Must be placed below @jwt_required (uses g.current_user_id).
+    Batch endpoints pass cost_field, the JSON list whose length is charged.
+    Responses carry RateLimit-* headers, rejected requests get 429 with Retry-After.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            cost = _request_cost(cost_field)
+            state = rate_limiter.check(str(getattr(g, 'current_user_id', '') or ''), group, cost)
+            if state is None:
+                return f(*args, **kwargs)
+
+            headers = RateLimitService.get_headers(state)
+            if not state["allowed"]:
+                if state["cost_exceeds_limit"]:
+                    error = f"Batch of {cost} {group} requests exceeds the burst limit of {state['limit']}"
+                elif state["daily_quota"] and state["quota_used"] + cost > state["daily_quota"]:
+                    error = f"Daily {group} quota of {state['daily_quota']} exhausted"
+                else:
+                    error = f"Too many {group} requests, please slow down"
+                response = jsonify({
+                    "success": False,
+                    "error": error,
+                    "retry_after": state["retry_after"]
+                })
+                response.headers.update(headers)
+                return response, 429
+
+            response = make_response(f(*args, **kwargs))
+            response.headers.update(headers)
+            return response
+
+        return decorated_function
+    return decorator
@@ -3,15 +3,18 @@ Chat Generation Routes - Ollama Integration with Pydantic validation
 """
 import traceback
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask_pydantic import validate
 from sqlalchemy.orm import Session
 from api.controllers.chat_controller import ChatController
-from api.auth_middleware import jwt_required
+from api.auth_middleware import jwt_required, get_current_user
+from api.rate_limit_middleware import rate_limited
 from api.controllers.prompt_controller import PromptController
+from business.prompt_template_cache import PromptTemplateCache
 from db.database import get_db
 from utils.prompt_processor import PromptProcessor
-from schemas.chat_schemas import ChatRequest, ChatResponse, ChatErrorResponse, UnifiedChatRequest
+from schemas.chat_schemas import ChatRequest, ChatResponse, ChatErrorResponse, UnifiedChatRequest, ChatBatchRequest, ChatMetricsRequest
+from schemas.prompt_schemas import PromptTemplateResponse
 from schemas.common_schemas import ErrorResponse
 from config.settings import CHAT_DEBUG_LOGGING
 from utils.logger import logger
@@ -21,21 +24,90 @@ api_chat_v1 = Blueprint("api_chat_v1", __name__, url_prefix="/api/v1/ollama/chat
 # Controller instance
 chat_controller = ChatController()
 
+STREAM_MIMETYPES = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson"
+}
+
+
+def _json_response(response_data, status_code):
+    """JSON response, adds Retry-After when the Ollama queue rejected the request"""
+    response = jsonify(response_data)
+    if status_code == 429 and "retry_after" in response_data:
+        response.headers["Retry-After"] = str(response_data["retry_after"])
+    return response, status_code
+
+
+def _current_user_id():
+    user = get_current_user()
+    return str(user["user_id"]) if user else None
+
+
+def _resolve_template(category: str, action: str):
+    """Template conditions and AI parameters (with PromptProcessor defaults) from the template cache, None if not found"""
+    db: Session = next(get_db())
+    try:
+        template = PromptTemplateCache.get_template(db, category, action)
+    finally:
+        db.close()
+    if template is None:
+        return None
+
+    return {
+        "pre_condition": template["pre_condition"],
+        "post_condition": template["post_condition"],
+        **PromptProcessor.resolve_ai_parameters(PromptTemplateResponse.model_construct(**template))
+    }
+
+
+def _stream_response(stream_format: str, **chat_args):
+    """Open Ollama token stream and wrap it in a chunked Flask response"""
+    chunks, status_code = chat_controller.stream_chat(stream_format=stream_format, user_id=_current_user_id(), **chat_args)
+    return _chunked_response(chunks, status_code, stream_format)
+
+
+def _chunked_response(chunks, status_code, stream_format: str):
+    """Wrap frame iterator in a chunked Flask response (or JSON error)"""
+    if status_code != 200:
+        return _json_response(chunks, status_code)
+
+    response = Response(
+        stream_with_context(chunks),
+        mimetype=STREAM_MIMETYPES[stream_format],
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering (nginx)
+        }
+    )
+    # stream_with_context only closes the iterator once iteration started, the WSGI close() always runs
+    if hasattr(chunks, "close"):
+        response.call_on_close(chunks.close)
+    return response
+
+
 @api_chat_v1.route('/generate', methods=['POST'])
 @jwt_required
+@rate_limited("chat")
 @validate()
 def generate(body: ChatRequest):
     """Generate chat response with Ollama"""
     try:
-        response_data, status_code = chat_controller.generate_chat(
+        chat_args = dict(
             model=body.model,
             pre_condition=body.pre_condition,
             prompt=body.prompt,
             post_condition=body.post_condition,
             temperature=body.options.temperature,
-            max_tokens=body.options.max_tokens
+            max_tokens=body.options.max_tokens,
+            session_id=body.session_id
         )
-        return jsonify(response_data), status_code
+        if body.stream:
+            return _stream_response(body.stream_format, **chat_args)
+
+        response_data, status_code = chat_controller.generate_chat(
+            cache=body.cache, user_id=_current_user_id(), **chat_args
+        )
+        return _json_response(response_data, status_code)
     except Exception as e:
         error_response = ChatErrorResponse(error=str(e), model=body.model)
         return jsonify(error_response.dict()), 500
@@ -43,10 +115,26 @@ def generate(body: ChatRequest):
 
 @api_chat_v1.route('/generate-unified', methods=['POST'])
 @jwt_required
+@rate_limited("chat")
 @validate()
 def generate_unified(body: UnifiedChatRequest):
     """Generate chat response with unified request structure and template support"""
     try:
+        # Resolve template server-side when category/action are given, request fields override it
+        template = {}
+        if body.category and body.action:
+            template = _resolve_template(body.category, body.action)
+            if template is None:
+                if body.model is None or body.temperature is None or body.max_tokens is None:
+                    return jsonify({"error": f"Template not found for category '{body.category}' and action '{body.action}'"}), 404
+                template = {}
+
+        body.pre_condition = body.pre_condition if body.pre_condition is not None else template.get("pre_condition", "")
+        body.post_condition = body.post_condition if body.post_condition is not None else template.get("post_condition", "")
+        body.model = body.model if body.model is not None else template.get("model")
+        body.temperature = body.temperature if body.temperature is not None else template.get("temperature")
+        body.max_tokens = body.max_tokens if body.max_tokens is not None else template.get("max_tokens")
+
         # Validate that all required template parameters are provided
         if body.model is None:
             raise ValueError("Model parameter is required but not provided by template")
@@ -73,18 +161,118 @@ def generate_unified(body: UnifiedChatRequest):
             # Minimal logging
             logger.info("Chat request", model=body.model, input_length=len(body.input_text))
 
-        response_data, status_code = chat_controller.generate_chat(
+        chat_args = dict(
             model=body.model,
             pre_condition=body.pre_condition,
             prompt=body.input_text,
             post_condition=body.post_condition,
             temperature=body.temperature,
-            max_tokens=body.max_tokens
+            max_tokens=body.max_tokens,
+            category=body.category,
+            action=body.action,
+            session_id=body.session_id
+        )
+        if body.stream:
+            return _stream_response(body.stream_format, **chat_args)
+
+        response_data, status_code = chat_controller.generate_chat(
+            cache=body.cache, user_id=_current_user_id(), **chat_args
         )
-        return jsonify(response_data), status_code
+        return _json_response(response_data, status_code)
     except Exception as e:
         logging.error(f"Error in generate_unified: {str(e)}")
         error_response = ChatErrorResponse(error=str(e), model=body.model)
         return jsonify(error_response.dict()), 500
 
 
+@api_chat_v1.route('/generate-batch', methods=['POST'])
+@jwt_required
+@rate_limited("chat", cost_field="inputs")
+@validate()
+def generate_batch(body: ChatBatchRequest):
+    """Apply one template to many inputs, results are streamed per item as they complete"""
+    chunks, status_code = chat_controller.generate_chat_batch(
+        model=body.model,
+        pre_condition=body.pre_condition,
+        inputs=body.inputs,
+        post_condition=body.post_condition,
+        temperature=body.temperature,
+        max_tokens=body.max_tokens,
+        cache=body.cache,
+        stream_format=body.stream_format,
+        user_id=_current_user_id()
+    )
+    return _chunked_response(chunks, status_code, body.stream_format)
+
+
+@api_chat_v1.route('/session/<string:session_id>', methods=['GET'])
+@jwt_required
+def get_session(session_id: str):
+    """Get conversation session summary"""
+    response_data, status_code = chat_controller.get_session(session_id, user_id=_current_user_id())
+    return jsonify(response_data), status_code
+
+
+@api_chat_v1.route('/session/<string:session_id>', methods=['DELETE'])
+@jwt_required
+def delete_session(session_id: str):
+    """End conversation session"""
+    response_data, status_code = chat_controller.delete_session(session_id, user_id=_current_user_id())
+    return jsonify(response_data), status_code
+
+
+@api_chat_v1.route('/metrics', methods=['GET'])
+@jwt_required
+@validate()
+def get_metrics(query: ChatMetricsRequest):
+    """Get inference latency, tokens/sec and cold-load metrics per model and template"""
+    response_data, status_code = chat_controller.get_metrics_report(hours=query.hours)
+    return jsonify(response_data), status_code
+
+
+@api_chat_v1.route('/queue', methods=['GET'])
+@jwt_required
+def get_queue_status():
+    """Get Ollama admission queue status per model"""
+    response_data, status_code = chat_controller.get_queue_status()
+    return jsonify(response_data), status_code
+
+
+@api_chat_v1.route('/backends', methods=['GET'])
+@jwt_required
+def get_backends_status():
+    """Get health and load of all Ollama hosts"""
+    response_data, status_code = chat_controller.get_backends_status()
+    return jsonify(response_data), status_code
+
+
+@api_chat_v1.route('/warmup', methods=['GET'])
+@jwt_required
+def get_warmup_status():
+    """Get warmup status and load times of prompt template models"""
+    response_data, status_code = chat_controller.get_warmup_status()
+    return jsonify(response_data), status_code
+
+
+@api_chat_v1.route('/warmup', methods=['POST'])
+@jwt_required
+def trigger_warmup():
+    """Preload all prompt template models now"""
+    response_data, status_code = chat_controller.trigger_warmup()
+    return jsonify(response_data), status_code
+
+
+@api_chat_v1.route('/cache/stats', methods=['GET'])
+@jwt_required
+def get_cache_stats():
+    """Get chat response cache statistics"""
+    response_data, status_code = chat_controller.get_cache_stats()
+    return jsonify(response_data), status_code
+
+
+@api_chat_v1.route('/cache', methods=['DELETE'])
+@jwt_required
+def clear_cache():
+    """Clear chat response cache"""
+    response_data, status_code = chat_controller.clear_cache()
+    return jsonify(response_data), status_code
@@ -7,11 +7,14 @@ from flask_pydantic import validate
 from config.settings import IMAGES_DIR
 from api.controllers.image_controller import ImageController
 from api.auth_middleware import jwt_required
+from api.rate_limit_middleware import rate_limited
 from schemas.image_schemas import (
     ImageGenerateRequest, ImageGenerateResponse,
+    ImageBatchGenerateRequest,
     ImageListRequest, ImageListResponse,
     ImageUpdateRequest, ImageUpdateResponse,
-    ImageDeleteResponse
+    ImageDeleteResponse, ImageSimilarRequest, ImageDuplicateReportRequest,
+    ImageReconcileRequest
 )
 from schemas.common_schemas import ErrorResponse
 from utils.logger import logger
@@ -23,6 +26,7 @@ image_controller = ImageController()
 
 @api_image_v1.route('/generate', methods=['POST'])
 @jwt_required
+@rate_limited("image")
 @validate()
 def generate(body: ImageGenerateRequest):
     """Generate image with DALL-E"""
@@ -30,7 +34,8 @@ def generate(body: ImageGenerateRequest):
         response_data, status_code = image_controller.generate_image(
             prompt=body.prompt,
             size=body.size,
-            title=body.title
+            title=body.title,
+            reuse=body.reuse
         )
         return jsonify(response_data), status_code
     except Exception as e:
@@ -38,6 +43,21 @@ def generate(body: ImageGenerateRequest):
         return jsonify(error_response.dict()), 500
 
 
+@api_image_v1.route('/generate-batch', methods=['POST'])
+@jwt_required
+@rate_limited("image", cost_field="items")
+@validate()
+def generate_batch(body: ImageBatchGenerateRequest):
+    """Generate multiple images with DALL-E concurrently"""
+    try:
+        items = [item.model_dump() for item in body.items]
+        response_data, status_code = image_controller.generate_images_batch(items)
+        return jsonify(response_data), status_code
+    except Exception as e:
+        error_response = ErrorResponse(error=str(e))
+        return jsonify(error_response.dict()), 500
+
+
 @api_image_v1.route('/list', methods=['GET'])
 @jwt_required
 @validate()
@@ -79,6 +99,49 @@ def get_image(image_id):
     return jsonify(response_data), status_code
 
 
+@api_image_v1.route('/id/<string:image_id>/similar', methods=['GET'])
+@jwt_required
+@validate()
+def get_similar_images(image_id: str, query: ImageSimilarRequest):
+    """Get visually similar images by perceptual hash"""
+    response_data, status_code = image_controller.get_similar_images(
+        image_id, max_distance=query.max_distance, limit=query.limit
+    )
+
+    return jsonify(response_data), status_code
+
+
+@api_image_v1.route('/duplicates', methods=['GET'])
+@jwt_required
+@validate()
+def get_duplicate_report(query: ImageDuplicateReportRequest):
+    """Get report of near-duplicate image groups"""
+    response_data, status_code = image_controller.get_duplicate_report(max_distance=query.max_distance)
+
+    return jsonify(response_data), status_code
+
+
+@api_image_v1.route('/reconcile', methods=['POST'])
+@jwt_required
+@validate()
+def start_reconciliation(body: ImageReconcileRequest):
+    """Start background reconciliation of image files and database rows"""
+    response_data, status_code = image_controller.start_reconciliation(
+        fix_orphans=body.fix_orphans, fix_dangling=body.fix_dangling, batch_size=body.batch_size
+    )
+
+    return jsonify(response_data), status_code
+
+
+@api_image_v1.route('/reconcile/<string:task_id>', methods=['GET'])
+@jwt_required
+def get_reconciliation_status(task_id: str):
+    """Get progress or report of an image reconciliation job"""
+    response_data, status_code = image_controller.get_reconciliation_status(task_id)
+
+    return jsonify(response_data), status_code
+
+
 @api_image_v1.route('/id/<string:image_id>', methods=['DELETE'])
 @jwt_required
 def delete_image(image_id):
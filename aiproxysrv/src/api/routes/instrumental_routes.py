@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_pydantic import validate
 from api.controllers.song_controller import SongController
 from api.auth_middleware import jwt_required
+from api.rate_limit_middleware import rate_limited
 from schemas.song_schemas import (
     InstrumentalGenerateRequest, InstrumentalGenerateResponse,
     SongHealthResponse
@@ -18,6 +19,7 @@ song_controller = SongController()
 
 @api_instrumental_v1.route("/generate", methods=["POST"])
 @jwt_required
+@rate_limited("song")
 @validate()
 def instrumental_generate(body: InstrumentalGenerateRequest):
     """Startet Instrumental-Generierung"""
@@ -1,8 +1,9 @@
 """API routes for prompt template management"""
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from sqlalchemy.orm import Session
 from db.database import get_db
 from api.controllers.prompt_controller import PromptController
+from business.prompt_template_cache import PromptTemplateCache
 from api.auth_middleware import jwt_required
 from schemas.prompt_schemas import (
     PromptTemplateCreate,
@@ -14,14 +15,43 @@ from pydantic import ValidationError
 api_prompt_v1 = Blueprint("api_prompt_v1", __name__, url_prefix="/api/v1/prompts")
 
 
+def _template_snapshot(db: Session):
+    """Template snapshot and its generation, (None, 0) on load errors so the controller reports them as JSON"""
+    try:
+        return PromptTemplateCache.get_snapshot(db)
+    except Exception:
+        # Generation 0 never matches a loaded snapshot, nothing is cached for this request
+        return None, 0
+
+
+def _cached_response(cache_key: str, generation: int, result, status_code: int):
+    """
+    JSON response with the serialized body from the template cache, 304 if the client's ETag matches
+
+    result must be built from the template snapshot of generation (PromptTemplateCache.get_snapshot).
+    """
+    if status_code != 200:
+        return jsonify(result), status_code
+
+    body, etag = PromptTemplateCache.get_serialized(
+        cache_key, generation, lambda: f"{current_app.json.dumps(result)}\n".encode("utf-8")
+    )
+    response = current_app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    # Clients must revalidate, a changed template is visible immediately
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
+
+
 @api_prompt_v1.route("", methods=["GET"])
 @jwt_required
 def get_all_templates():
     """Get all prompt templates grouped by category and action"""
     db: Session = next(get_db())
     try:
-        result, status_code = PromptController.get_all_templates(db)
-        return jsonify(result), status_code
+        grouped, generation = _template_snapshot(db)
+        result, status_code = PromptController.get_all_templates(db, grouped)
+        return _cached_response("all", generation, result, status_code)
     finally:
         db.close()
 
@@ -32,8 +62,9 @@ def get_category_templates(category: str):
     """Get all templates for a specific category"""
     db: Session = next(get_db())
     try:
-        result, status_code = PromptController.get_category_templates(db, category)
-        return jsonify(result), status_code
+        grouped, generation = _template_snapshot(db)
+        result, status_code = PromptController.get_category_templates(db, category, grouped)
+        return _cached_response(f"category:{category}", generation, result, status_code)
     finally:
         db.close()
 
@@ -44,8 +75,9 @@ def get_specific_template(category: str, action: str):
     """Get a specific template by category and action"""
     db: Session = next(get_db())
     try:
-        result, status_code = PromptController.get_specific_template(db, category, action)
-        return jsonify(result), status_code
+        grouped, generation = _template_snapshot(db)
+        result, status_code = PromptController.get_specific_template(db, category, action, grouped)
+        return _cached_response(f"template:{category}:{action}", generation, result, status_code)
     finally:
         db.close()
 
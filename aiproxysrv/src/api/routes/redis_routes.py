@@ -1,4 +1,4 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 import sys
 import traceback
 from api.controllers.redis_controller import RedisController
@@ -13,9 +13,16 @@ redis_controller = RedisController()
 @jwt_required
 def list_celery_tasks_route():
     """
-    Gibt alle Celery‑Task‑Metadaten zurück.
+    Gibt Celery‑Task‑Metadaten seitenweise zurück.
+
+    Query: cursor (next_cursor der vorherigen Seite), limit (max. 1000),
+    summary=true liefert nur die Anzahl Tasks pro Status.
     """
-    response_data, status_code = redis_controller.list_celery_tasks()
+    response_data, status_code = redis_controller.list_celery_tasks(
+        cursor=request.args.get("cursor", 0, type=int),
+        limit=request.args.get("limit", None, type=int),
+        summary=request.args.get("summary", "false").lower() == "true"
+    )
     return jsonify(response_data), status_code
 
 
@@ -23,9 +30,44 @@ def list_celery_tasks_route():
 @jwt_required
 def list_redis_keys():
     """
-    Gibt alle Celery‑Meta‑Keys zurück, sortiert nach `created_at`.
+    Gibt erfolgreiche Celery‑Meta‑Keys seitenweise zurück, pro Seite sortiert nach `created_at`.
+
+    Query: cursor (next_cursor der vorherigen Seite), limit (max. 1000).
+    """
+    response_data, status_code = redis_controller.list_redis_keys(
+        cursor=request.args.get("cursor", 0, type=int),
+        limit=request.args.get("limit", None, type=int)
+    )
+    return jsonify(response_data), status_code
+
+
+@api_redis_v1.route("/pools", methods=["GET"])
+@jwt_required
+def get_pool_stats():
+    """
+    Gibt die Auslastung der Redis‑Connection‑Pools dieses Worker‑Prozesses zurück.
+    """
+    response_data, status_code = redis_controller.get_pool_stats()
+    return jsonify(response_data), status_code
+
+
+@api_redis_v1.route("/compaction", methods=["GET"])
+@jwt_required
+def get_compaction_report():
+    """
+    Gibt den Bericht der letzten Kompaktierung der Task‑Resultate zurück (entfernte Keys und Bytes).
+    """
+    response_data, status_code = redis_controller.get_compaction_report()
+    return jsonify(response_data), status_code
+
+
+@api_redis_v1.route("/compaction", methods=["POST"])
+@jwt_required
+def trigger_compaction():
+    """
+    Startet die Kompaktierung der Task‑Resultate sofort.
     """
-    response_data, status_code = redis_controller.list_redis_keys()
+    response_data, status_code = redis_controller.trigger_compaction()
     return jsonify(response_data), status_code
 
 
@@ -5,6 +5,7 @@ from flask import Blueprint, request, jsonify
 from flask_pydantic import validate
 from api.controllers.song_controller import SongController
 from api.auth_middleware import jwt_required
+from api.rate_limit_middleware import rate_limited
 from schemas.song_schemas import (
     SongGenerateRequest, SongGenerateResponse,
     StemGenerateRequest, StemGenerateResponse,
@@ -34,6 +35,7 @@ def mureka_account():
 
 @api_song_v1.route("/generate", methods=["POST"])
 @jwt_required
+@rate_limited("song")
 @validate()
 def song_generate(body: SongGenerateRequest):
     """Startet Song-Generierung"""
@@ -54,6 +56,7 @@ def song_generate(body: SongGenerateRequest):
 
 @api_song_v1.route("/stem/generate", methods=["POST"])
 @jwt_required
+@rate_limited("song")
 @validate()
 def stems_generator(body: StemGenerateRequest):
     """Erstelle stems anhand einer MP3"""
@@ -229,7 +232,7 @@ def delete_task_result(task_id):
 @api_song_task_v1.route("/queue-status", methods=["GET"])
 @jwt_required
 def queue_status():
-    """Gibt Queue-Status zurück"""
+    """Gibt Queue-Status zurück (Queue-Länge, reservierte/aktive Tasks, MUREKA-Slots, Durchsatz und Warte-/Laufzeiten pro Task-Typ)"""
     response_data, status_code = song_controller.get_queue_status()
     
     return jsonify(response_data), status_code
@@ -4,6 +4,7 @@ User Authentication and Management Routes
 from flask import Blueprint, request, jsonify
 from flask_pydantic import validate
 from api.controllers.user_controller import UserController
+from api.auth_middleware import jwt_required
 from schemas.user_schemas import (
     UserCreateRequest, LoginRequest, UserUpdateRequest,
     PasswordChangeRequest, PasswordResetRequest
@@ -16,13 +17,21 @@ api_user_v1 = Blueprint("api_user_v1", __name__, url_prefix="/api/v1/user")
 user_controller = UserController()
 
 
+def _json_response(response_data, status_code):
+    """JSON response, rejected password operations (429) carry a Retry-After header"""
+    response = jsonify(response_data)
+    if status_code == 429:
+        response.headers["Retry-After"] = str(response_data.get("retry_after", 1))
+    return response, status_code
+
+
 @api_user_v1.route("/create", methods=["POST"])
 @validate()
 def create_user(body: UserCreateRequest):
     """Create a new user account"""
     try:
-        response_data, status_code = user_controller.create_user(body)
-        return jsonify(response_data), status_code
+        response_data, status_code = user_controller.create_user(body, client_ip=request.remote_addr)
+        return _json_response(response_data, status_code)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -32,17 +41,19 @@ def create_user(body: UserCreateRequest):
 def login(body: LoginRequest):
     """Authenticate user and return JWT token"""
     try:
-        response_data, status_code = user_controller.login(body)
-        return jsonify(response_data), status_code
+        response_data, status_code = user_controller.login(body, client_ip=request.remote_addr)
+        return _json_response(response_data, status_code)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
 
 @api_user_v1.route("/logout", methods=["POST"])
 def logout():
-    """Logout user (frontend handles token removal)"""
+    """Logout user and revoke the bearer token"""
     try:
-        response_data, status_code = user_controller.logout()
+        auth_header = request.headers.get('Authorization')
+        token = auth_header.split(' ')[1] if auth_header and auth_header.startswith('Bearer ') else None
+        response_data, status_code = user_controller.logout(token)
         return jsonify(response_data), status_code
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
@@ -75,7 +86,7 @@ def change_password(user_id: str, body: PasswordChangeRequest):
     """Change user password"""
     try:
         response_data, status_code = user_controller.change_password(user_id, body)
-        return jsonify(response_data), status_code
+        return _json_response(response_data, status_code)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -86,7 +97,7 @@ def reset_password(body: PasswordResetRequest):
     """Reset user password (admin function)"""
     try:
         response_data, status_code = user_controller.reset_password(body)
-        return jsonify(response_data), status_code
+        return _json_response(response_data, status_code)
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -107,6 +118,14 @@ def list_users():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@api_user_v1.route("/auth-stats", methods=["GET"])
+@jwt_required
+def get_auth_stats():
+    """Get token cache and revocation statistics (per worker process)"""
+    response_data, status_code = user_controller.get_auth_stats()
+    return jsonify(response_data), status_code
+
+
 @api_user_v1.route("/validate-token", methods=["POST"])
 def validate_token():
     """Validate JWT token"""
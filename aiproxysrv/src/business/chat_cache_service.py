@@ -0,0 +1,150 @@
+"""Chat Cache Service - Redis response cache for deterministic Ollama chat requests"""
+import hashlib
+import json
+import logging
+import time
+from typing import Dict, Any, Optional
+import redis
+from config.settings import (
+    REDIS_URL, CHAT_CACHE_ENABLED, CHAT_CACHE_TTL, CHAT_CACHE_MAX_ENTRIES, CHAT_CACHE_MAX_ENTRY_BYTES
+)
+from db.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "chat-cache"
+ENTRY_PREFIX = f"{KEY_PREFIX}:entry:"
+# Sorted set of cache keys scored by last use, drives LRU eviction
+LRU_KEY = f"{KEY_PREFIX}:lru"
+STATS_KEY = f"{KEY_PREFIX}:stats"
+
+
+class ChatCacheService:
+    """
+    Response cache keyed by model, built prompt, temperature and max_tokens.
+
+    Entries expire CHAT_CACHE_TTL seconds after their last hit; beyond CHAT_CACHE_MAX_ENTRIES
+    the least recently used entries are evicted. Redis errors never fail the chat request,
+    the cache is simply bypassed.
+    """
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+
+    def _get_redis_connection(self) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        if self._redis is None:
+            self._redis = get_redis_client(self.redis_url)
+        return self._redis
+
+    @staticmethod
+    def is_cacheable(temperature: float, cache: Optional[bool] = None) -> bool:
+        """Cache only deterministic requests (temperature 0) unless the caller opts in or out"""
+        if not CHAT_CACHE_ENABLED:
+            return False
+        if cache is not None:
+            return cache
+        return temperature == 0
+
+    @staticmethod
+    def build_key(model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        """Hash of everything that influences the Ollama output"""
+        material = json.dumps(
+            {"model": model, "prompt": prompt, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return cached response or None, refreshes TTL and LRU position on hit"""
+        try:
+            r = self._get_redis_connection()
+            raw = r.get(ENTRY_PREFIX + key)
+
+            pipe = r.pipeline(transaction=False)
+            if raw is None:
+                pipe.hincrby(STATS_KEY, "misses", 1)
+            else:
+                pipe.hincrby(STATS_KEY, "hits", 1)
+                pipe.expire(ENTRY_PREFIX + key, CHAT_CACHE_TTL)
+                pipe.zadd(LRU_KEY, {key: time.time()})
+            pipe.execute()
+
+            return json.loads(raw) if raw is not None else None
+
+        except (redis.RedisError, ValueError) as e:
+            logger.warning(f"Chat cache lookup failed: {type(e).__name__}: {e}")
+            return None
+
+    def set(self, key: str, response: Dict[str, Any]) -> bool:
+        """Store response and evict least recently used entries beyond the size bound"""
+        payload = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        try:
+            r = self._get_redis_connection()
+            if len(payload) > CHAT_CACHE_MAX_ENTRY_BYTES:
+                r.hincrby(STATS_KEY, "skipped_too_large", 1)
+                return False
+
+            now = time.time()
+            pipe = r.pipeline(transaction=False)
+            pipe.set(ENTRY_PREFIX + key, payload, ex=CHAT_CACHE_TTL)
+            pipe.zadd(LRU_KEY, {key: now})
+            # Drop LRU members whose entries already expired via TTL
+            pipe.zremrangebyscore(LRU_KEY, "-inf", now - CHAT_CACHE_TTL)
+            pipe.hincrby(STATS_KEY, "stores", 1)
+            pipe.zcard(LRU_KEY)
+            size = pipe.execute()[-1]
+
+            overflow = size - CHAT_CACHE_MAX_ENTRIES
+            if overflow > 0:
+                evicted = [member for member, _ in r.zpopmin(LRU_KEY, overflow)]
+                if evicted:
+                    pipe = r.pipeline(transaction=False)
+                    pipe.delete(*[ENTRY_PREFIX + member.decode() for member in evicted])
+                    pipe.hincrby(STATS_KEY, "evictions", len(evicted))
+                    pipe.execute()
+            return True
+
+        except redis.RedisError as e:
+            logger.warning(f"Chat cache store failed: {type(e).__name__}: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, hit ratio and current size"""
+        r = self._get_redis_connection()
+        pipe = r.pipeline(transaction=False)
+        pipe.hgetall(STATS_KEY)
+        pipe.zcard(LRU_KEY)
+        raw_stats, entries = pipe.execute()
+
+        stats = {name.decode(): int(value) for name, value in raw_stats.items()}
+        hits = stats.get("hits", 0)
+        misses = stats.get("misses", 0)
+        lookups = hits + misses
+
+        return {
+            "enabled": CHAT_CACHE_ENABLED,
+            "entries": entries,
+            "max_entries": CHAT_CACHE_MAX_ENTRIES,
+            "ttl_seconds": CHAT_CACHE_TTL,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "stores": stats.get("stores", 0),
+            "evictions": stats.get("evictions", 0),
+            "skipped_too_large": stats.get("skipped_too_large", 0)
+        }
+
+    def clear(self) -> int:
+        """Remove all cache entries and reset counters, returns number of removed entries"""
+        r = self._get_redis_connection()
+        removed = 0
+        while True:
+            members = r.zpopmin(LRU_KEY, 500)
+            if not members:
+                break
+            removed += r.delete(*[ENTRY_PREFIX + member.decode() for member, _ in members])
+        r.delete(STATS_KEY)
+        logger.info(f"Chat cache cleared: {removed} entries removed")
+        return removed
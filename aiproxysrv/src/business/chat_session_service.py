@@ -0,0 +1,128 @@
+"""Chat Session Service - Stores Ollama context per conversation session in Redis"""
+import json
+import logging
+import time
+from typing import Dict, Any, List, Optional
+import redis
+from config.settings import REDIS_URL, CHAT_SESSION_TTL, CHAT_SESSION_MAX_CONTEXT_TOKENS
+from db.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "chat-session"
+
+
+class ChatSessionError(Exception):
+    """Base exception for chat session errors"""
+    pass
+
+
+class ChatSessionService:
+    """
+    Server-side conversation sessions.
+
+    Ollama returns the encoded conversation as `context`; passing it back on the next turn
+    lets Ollama continue without re-evaluating the whole history. Sessions are scoped per
+    user, expire CHAT_SESSION_TTL seconds after the last turn and are reset once the context
+    exceeds CHAT_SESSION_MAX_CONTEXT_TOKENS or the model changes.
+    """
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+
+    def _get_redis_connection(self) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        if self._redis is None:
+            self._redis = get_redis_client(self.redis_url)
+        return self._redis
+
+    def _key(self, user_id: Optional[str], session_id: str) -> str:
+        return f"{KEY_PREFIX}:{user_id or 'anonymous'}:{session_id}"
+
+    def load(self, user_id: Optional[str], session_id: str, model: str) -> Optional[Dict[str, Any]]:
+        """
+        Load session state for the next turn
+
+        Returns:
+            Session dict (model, context, turns, created_at) or None if new, expired or for another model
+        """
+        try:
+            raw = self._get_redis_connection().get(self._key(user_id, session_id))
+        except redis.RedisError as e:
+            # Without the context the turn still works, just with full prompt evaluation
+            logger.warning(f"Chat session load failed, starting without context: {type(e).__name__}: {e}")
+            return None
+        if raw is None:
+            return None
+
+        session = json.loads(raw)
+        if session.get("model") != model:
+            logger.info(f"Chat session {session_id} switched model {session.get('model')} -> {model}, resetting context")
+            return None
+        return session
+
+    def save(self, user_id: Optional[str], session_id: str, model: str, context: Optional[List[int]],
+             previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Store context returned by Ollama after a turn
+
+        Returns:
+            Session info for the response (id, turn, context_tokens, reset, expires_in)
+        """
+        turn = (previous or {}).get("turns", 0) + 1
+        reset = False
+        if not context or len(context) > CHAT_SESSION_MAX_CONTEXT_TOKENS:
+            # Too large (or missing) - next turn starts a fresh context
+            reset = bool(context)
+            context = []
+            turn = 0
+
+        session = {
+            "model": model,
+            "context": context,
+            "turns": turn,
+            "created_at": (previous or {}).get("created_at", time.time()),
+            "updated_at": time.time()
+        }
+        try:
+            self._get_redis_connection().set(
+                self._key(user_id, session_id), json.dumps(session, separators=(",", ":")), ex=CHAT_SESSION_TTL
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Chat session save failed: {type(e).__name__}: {e}")
+
+        return {
+            "id": session_id,
+            "turn": turn,
+            "context_tokens": len(context),
+            "reset": reset,
+            "expires_in": CHAT_SESSION_TTL
+        }
+
+    def get_info(self, user_id: Optional[str], session_id: str) -> Optional[Dict[str, Any]]:
+        """Return session summary without the context, None if not found"""
+        r = self._get_redis_connection()
+        key = self._key(user_id, session_id)
+        pipe = r.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.ttl(key)
+        raw, ttl = pipe.execute()
+        if raw is None:
+            return None
+
+        session = json.loads(raw)
+        return {
+            "id": session_id,
+            "model": session.get("model"),
+            "turns": session.get("turns", 0),
+            "context_tokens": len(session.get("context") or []),
+            "max_context_tokens": CHAT_SESSION_MAX_CONTEXT_TOKENS,
+            "created_at": session.get("created_at"),
+            "updated_at": session.get("updated_at"),
+            "expires_in": ttl
+        }
+
+    def delete(self, user_id: Optional[str], session_id: str) -> bool:
+        """End session, returns False if it did not exist"""
+        return bool(self._get_redis_connection().delete(self._key(user_id, session_id)))
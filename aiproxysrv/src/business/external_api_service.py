@@ -4,6 +4,7 @@ import logging
 import requests
 from typing import Dict, Any
 from config.settings import OPENAI_API_KEY, OPENAI_URL, OPENAI_MODEL
+from .openai_slot_service import OpenAISlotService, OpenAISlotTimeoutError
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,7 @@ class OpenAIService:
         self.api_key = OPENAI_API_KEY
         self.base_url = OPENAI_URL
         self.model = OPENAI_MODEL
+        self.slots = OpenAISlotService()
 
     def generate_image(self, prompt: str, size: str) -> str:
         """
@@ -51,15 +53,20 @@ class OpenAIService:
         logger.info(f"Calling OpenAI API: {api_url}")
 
         try:
-            response = requests.post(
-                api_url,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+            # Shared limit across batch threads and workers
+            with self.slots.slot():
+                response = requests.post(
+                    api_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=30
+                )
             logger.info(f"OpenAI API Response Status: {response.status_code}")
             response.raise_for_status()
 
+        except OpenAISlotTimeoutError as e:
+            logger.warning(f"OpenAI API busy: {e}")
+            raise OpenAIAPIError(str(e)) from e
         except requests.exceptions.RequestException as e:
             logger.error(f"OpenAI API Network Error: {type(e).__name__}: {e}")
             raise OpenAIAPIError(f"Network Error: {e}") from e
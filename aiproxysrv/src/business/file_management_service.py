@@ -1,12 +1,18 @@
 """File Management Service - Handles file operations for the application"""
 import os
+import time
+import hashlib
 import logging
 import requests
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Dict, Any, Iterable
+from config.settings import DOWNLOAD_BUFFER_SIZE, DOWNLOAD_MAX_RETRIES, DOWNLOAD_MAX_IMAGE_BYTES
 
 logger = logging.getLogger(__name__)
 
+# Allowed content types per asset kind (prefix match, e.g. 'image/' matches 'image/png')
+IMAGE_CONTENT_TYPES = ('image/',)
+
 
 class FileDownloadError(Exception):
     """Custom exception for file download errors"""
@@ -16,44 +22,164 @@ class FileDownloadError(Exception):
 class FileManagementService:
     """Service for file management operations"""
 
-    def download_and_save_file(self, url: str, file_path: Path, timeout: int = 30) -> None:
+    def download_file(self, url: str, file_path: Path, timeout: int = 30,
+                      max_bytes: Optional[int] = None,
+                      allowed_content_types: Optional[Iterable[str]] = None,
+                      resume: bool = False) -> Dict[str, Any]:
         """
-        Download file from URL and save to filesystem
+        Stream file from URL into a temp file and atomically move it into place
+
+        The data is written to '<file_path>.part' with a large buffer and hashed (SHA-256)
+        while writing. Size and content type limits abort the download early. The temp file
+        is fsynced and renamed, so file_path never contains a truncated file. With resume=True
+        the partial file is kept on failure and continued via HTTP Range requests.
 
         Args:
             url: URL to download from
             file_path: Local path where to save the file
             timeout: Request timeout in seconds
+            max_bytes: Optional maximum file size in bytes
+            allowed_content_types: Optional content type prefixes (e.g. IMAGE_CONTENT_TYPES)
+            resume: Keep partial downloads and resume them with Range requests
+
+        Returns:
+            Dict with path, size, sha256, content_type and resumed flag
 
         Raises:
-            FileDownloadError: If download or save fails
+            FileDownloadError: If download, validation or save fails
         """
-        try:
-            logger.info(f"Downloading file from {url}")
-            response = requests.get(url, stream=True, timeout=timeout)
-            response.raise_for_status()
+        file_path = Path(file_path)
+        temp_path = file_path.with_name(file_path.name + ".part")
+        attempts = DOWNLOAD_MAX_RETRIES + 1 if resume else 1
+        resumed = False
 
-            # Ensure parent directory exists
+        try:
             file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Save file
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-
-            logger.info(f"File downloaded and saved to: {file_path}")
-
+            if not resume and temp_path.exists():
+                temp_path.unlink()
+
+            for attempt in range(1, attempts + 1):
+                offset = temp_path.stat().st_size if temp_path.exists() else 0
+                try:
+                    content_type, size, sha256, appended = self._stream_to_temp(
+                        url, temp_path, offset, timeout, max_bytes, allowed_content_types
+                    )
+                    resumed = resumed or appended
+                    break
+                except requests.exceptions.RequestException as e:
+                    if attempt >= attempts:
+                        raise
+                    wait_time = min(2 ** attempt, 30)
+                    logger.warning(f"Download interrupted for {url} (attempt {attempt}/{attempts}), resuming in {wait_time}s: {e}")
+                    time.sleep(wait_time)
+
+            os.replace(temp_path, file_path)
+            self._fsync_directory(file_path.parent)
+
+            logger.info(f"File downloaded and saved to: {file_path} ({size} bytes, sha256={sha256[:12]}..., resumed={resumed})")
+            return {
+                "path": str(file_path),
+                "size": size,
+                "sha256": sha256,
+                "content_type": content_type,
+                "resumed": resumed
+            }
+
+        except FileDownloadError:
+            self._discard_temp_file(temp_path)
+            raise
         except requests.exceptions.RequestException as e:
             logger.error(f"Download failed for {url}: {e}")
+            if not resume:
+                self._discard_temp_file(temp_path)
             raise FileDownloadError(f"Download failed: {e}") from e
         except IOError as e:
             logger.error(f"File save failed for {file_path}: {e}")
+            self._discard_temp_file(temp_path)
             raise FileDownloadError(f"Save failed: {e}") from e
         except Exception as e:
             logger.error(f"Unexpected error downloading {url}: {e}")
+            self._discard_temp_file(temp_path)
             raise FileDownloadError(f"Unexpected error: {e}") from e
 
+    def download_image(self, url: str, file_path: Path, timeout: int = 30) -> Dict[str, Any]:
+        """Download image file with image content type and size limit"""
+        return self.download_file(
+            url, file_path, timeout=timeout,
+            max_bytes=DOWNLOAD_MAX_IMAGE_BYTES,
+            allowed_content_types=IMAGE_CONTENT_TYPES
+        )
+
+    def _stream_to_temp(self, url: str, temp_path: Path, offset: int, timeout: int,
+                        max_bytes: Optional[int], allowed_content_types: Optional[Iterable[str]]):
+        """Stream response body into temp file, returns (content_type, size, sha256, appended)"""
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        logger.info(f"Downloading file from {url}" + (f" (resuming at {offset} bytes)" if offset else ""))
+
+        with requests.get(url, stream=True, timeout=timeout, headers=headers) as response:
+            if offset and response.status_code == 416:
+                # Partial file is stale or already complete - start over
+                temp_path.unlink()
+                return self._stream_to_temp(url, temp_path, 0, timeout, max_bytes, allowed_content_types)
+            response.raise_for_status()
+
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if allowed_content_types and not any(content_type.startswith(t) for t in allowed_content_types):
+                raise FileDownloadError(f"Unexpected content type: {content_type or 'unknown'}")
+
+            content_length = response.headers.get("Content-Length")
+            append = offset > 0 and response.status_code == 206
+            expected_total = (offset if append else 0) + int(content_length) if content_length and content_length.isdigit() else None
+            if max_bytes and expected_total and expected_total > max_bytes:
+                raise FileDownloadError(f"File too large: {expected_total} bytes (max {max_bytes})")
+
+            # Hash existing partial content first when the server honours the Range request
+            sha256 = hashlib.sha256()
+            size = 0
+            if append:
+                with open(temp_path, "rb") as existing:
+                    for block in iter(lambda: existing.read(DOWNLOAD_BUFFER_SIZE), b""):
+                        sha256.update(block)
+                        size += len(block)
+
+            with open(temp_path, "ab" if append else "wb", buffering=DOWNLOAD_BUFFER_SIZE) as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_BUFFER_SIZE):
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if max_bytes and size > max_bytes:
+                        raise FileDownloadError(f"File too large: exceeded {max_bytes} bytes")
+                    sha256.update(chunk)
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+            if expected_total is not None and size != expected_total:
+                raise requests.exceptions.ChunkedEncodingError(
+                    f"Incomplete download: received {size} of {expected_total} bytes"
+                )
+
+            return content_type, size, sha256.hexdigest(), append
+
+    def _fsync_directory(self, directory: Path) -> None:
+        """Persist the rename in the directory entry (best effort, not supported everywhere)"""
+        try:
+            fd = os.open(str(directory), os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    def _discard_temp_file(self, temp_path: Path) -> None:
+        """Remove temp file after a failed download"""
+        try:
+            if temp_path.exists():
+                temp_path.unlink()
+        except OSError as e:
+            logger.warning(f"Could not remove temp file {temp_path}: {e}")
+
     def delete_file_if_exists(self, file_path: Optional[str]) -> bool:
         """
         Delete file if it exists
@@ -2,10 +2,17 @@
 import logging
 import hashlib
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional, TYPE_CHECKING
-from config.settings import OPENAI_MODEL, IMAGES_DIR, DELETE_PHYSICAL_FILES, IMAGE_BASE_URL
+from config.settings import (
+    OPENAI_MODEL, IMAGES_DIR, DELETE_PHYSICAL_FILES, IMAGE_BASE_URL,
+    IMAGE_REUSE_DEFAULT, IMAGE_REUSE_MAX_AGE_HOURS,
+    OPENAI_BATCH_MAX_CONCURRENCY, OPENAI_BATCH_MAX_ITEMS
+)
 from db.image_service import ImageService
+from utils.image_hashing import extract_image_metadata
 
 if TYPE_CHECKING:
     from db.models import GeneratedImage
@@ -27,14 +34,17 @@ class ImageBusinessService:
         self.images_dir.mkdir(parents=True, exist_ok=True)
         self.file_service = FileManagementService()
 
-    def generate_image(self, prompt: str, size: str, title: Optional[str] = None) -> Dict[str, Any]:
+    def generate_image(self, prompt: str, size: str, title: Optional[str] = None,
+                       reuse: Optional[bool] = None) -> Dict[str, Any]:
         """
         Generate image with validation and business logic
 
         Args:
             prompt: Image generation prompt
             size: Image size specification
-            title: Optional image title
+            title: Optional image title (not applied to a reused image, it keeps its original title)
+            reuse: Return an existing image for the same normalized prompt, size and model
+                   if one exists within the freshness window (None = IMAGE_REUSE_DEFAULT)
 
         Returns:
             Dict containing image URL and metadata
@@ -44,6 +54,12 @@ class ImageBusinessService:
         """
         self._validate_generation_request(prompt, size)
 
+        use_cache = IMAGE_REUSE_DEFAULT if reuse is None else reuse
+        if use_cache:
+            reused_response = self._find_reusable_image(prompt, size)
+            if reused_response:
+                return reused_response
+
         logger.info(f"Starting image generation for prompt: {prompt[:50]}{'...' if len(prompt) > 50 else ''}")
 
         try:
@@ -58,13 +74,17 @@ class ImageBusinessService:
             # Build local URL
             local_url = f"{IMAGE_BASE_URL}/{filename}"
 
+            # Extract file metadata (dimensions, size, colour, perceptual hash) for similarity search
+            file_metadata = self._extract_file_metadata(file_path)
+
             # Save metadata to database and get the generated image record
-            generated_image = self._save_image_metadata(prompt, size, filename, file_path, local_url, title)
+            generated_image = self._save_image_metadata(prompt, size, filename, file_path, local_url, title, file_metadata)
 
             logger.info(f"Image generated successfully: {filename}")
             response = {
                 "url": local_url,
-                "saved_path": str(file_path)
+                "saved_path": str(file_path),
+                "reused": False
             }
 
             # Include image ID if database save was successful
@@ -80,6 +100,62 @@ class ImageBusinessService:
             logger.error(f"Image generation failed: {type(e).__name__}: {e}")
             raise ImageGenerationError(f"Generation failed: {e}") from e
 
+    def generate_images_batch(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Generate multiple images concurrently with a bounded number of OpenAI calls
+
+        Args:
+            items: List of dicts with prompt, size and optional title/reuse
+
+        Returns:
+            Dict containing per-item results (in request order) and summary
+        """
+        if not items:
+            raise ImageGenerationError("No items provided")
+
+        if len(items) > OPENAI_BATCH_MAX_ITEMS:
+            raise ImageGenerationError(f"Too many items (max {OPENAI_BATCH_MAX_ITEMS} per request)")
+
+        def generate_item(index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                generated = self.generate_image(
+                    item.get("prompt"),
+                    item.get("size"),
+                    item.get("title"),
+                    reuse=item.get("reuse")
+                )
+                return {
+                    "index": index,
+                    "status": "success",
+                    "id": generated.get("id"),
+                    "url": generated.get("url"),
+                    "reused": generated.get("reused", False)
+                }
+            except Exception as e:
+                logger.error(f"Batch item {index} failed: {type(e).__name__}: {e}")
+                return {"index": index, "status": "error", "error": str(e)}
+
+        max_workers = max(1, min(OPENAI_BATCH_MAX_CONCURRENCY, len(items)))
+        logger.info(f"Starting batch image generation: {len(items)} items, concurrency {max_workers}")
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-batch") as executor:
+            # map() preserves request order while at most max_workers calls are in flight
+            results = list(executor.map(generate_item, range(len(items)), items))
+
+        succeeded = sum(1 for result in results if result["status"] == "success")
+        summary = {
+            "total_requested": len(items),
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded,
+            "reused": sum(1 for result in results if result.get("reused"))
+        }
+
+        logger.info(f"Batch image generation completed: {summary}")
+        return {
+            "summary": summary,
+            "results": results
+        }
+
     def get_images_with_pagination(self, limit: int = 20, offset: int = 0,
                                  search: str = '', sort_by: str = 'created_at',
                                  sort_direction: str = 'desc') -> Dict[str, Any]:
@@ -281,21 +357,71 @@ class ImageBusinessService:
         if not size:
             raise ImageGenerationError("Size is required")
 
+    def _find_reusable_image(self, prompt: str, size: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a fresh image with identical normalized prompt, size and model
+
+        The image is shared with the request that generated it, so its title is returned
+        unchanged instead of being overwritten by the new request's title.
+        """
+        try:
+            created_after = datetime.now(timezone.utc) - timedelta(hours=IMAGE_REUSE_MAX_AGE_HOURS)
+            candidates = ImageService.find_reusable_images(
+                prompt_hash=self._generate_prompt_hash(prompt),
+                size=size,
+                model_used=OPENAI_MODEL,
+                created_after=created_after
+            )
+        except Exception as e:
+            # The cache is an optimization only - fall back to a fresh generation
+            logger.warning(f"Image reuse lookup failed, generating new image: {type(e).__name__}: {e}")
+            return None
+
+        normalized_prompt = self._normalize_prompt(prompt)
+        for image in candidates:
+            # Short hashes can collide, so compare the normalized prompt as well
+            if self._normalize_prompt(image.prompt) != normalized_prompt:
+                continue
+            if not self.file_service.file_exists(image.file_path):
+                logger.debug(f"Skipping reuse candidate without file: {image.file_path}")
+                continue
+
+            logger.info(f"Reusing existing image {image.id} for prompt: {prompt[:50]}{'...' if len(prompt) > 50 else ''}")
+            return {
+                "url": image.local_url,
+                "saved_path": image.file_path,
+                "id": str(image.id),
+                "title": image.title,
+                "reused": True
+            }
+
+        return None
+
     def _process_and_save_image(self, image_url: str, prompt: str) -> Tuple[str, Path]:
         """Download and save image to filesystem"""
         # Generate filename
         prompt_hash = self._generate_prompt_hash(prompt)
-        filename = f"{prompt_hash}_{int(time.time())}.png"
+        # Millisecond timestamp keeps concurrent batch items with the same prompt unique
+        filename = f"{prompt_hash}_{int(time.time() * 1000)}.png"
         file_path = self.images_dir / filename
 
-        # Download and save
-        self.file_service.download_and_save_file(image_url, file_path)
+        # Download and save (atomic, size and content type checked)
+        self.file_service.download_image(image_url, file_path)
 
         logger.info(f"Image stored at: {file_path}")
         return filename, file_path
 
+    def _extract_file_metadata(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Extract file metadata, failures only skip similarity data and never fail generation"""
+        try:
+            return extract_image_metadata(str(file_path))
+        except Exception as e:
+            logger.warning(f"Could not extract metadata from {file_path}: {type(e).__name__}: {e}")
+            return None
+
     def _save_image_metadata(self, prompt: str, size: str, filename: str,
-                           file_path: Path, local_url: str, title: Optional[str] = None) -> Optional['GeneratedImage']:
+                           file_path: Path, local_url: str, title: Optional[str] = None,
+                           file_metadata: Optional[Dict[str, Any]] = None) -> Optional['GeneratedImage']:
         """Save image metadata to database"""
         return ImageService.save_generated_image(
             prompt=prompt,
@@ -305,7 +431,8 @@ class ImageBusinessService:
             local_url=local_url,
             model_used=OPENAI_MODEL,
             prompt_hash=self._generate_prompt_hash(prompt),
-            title=title
+            title=title,
+            file_metadata=file_metadata
         )
 
     def _transform_image_to_api_format(self, image, include_file_path: bool = False) -> Dict[str, Any]:
@@ -321,7 +448,12 @@ class ImageBusinessService:
             "tags": image.tags,
             "created_at": image.created_at.isoformat() if image.created_at else None,
             "updated_at": image.updated_at.isoformat() if image.updated_at else None,
-            "prompt_hash": image.prompt_hash
+            "prompt_hash": image.prompt_hash,
+            "width": image.width,
+            "height": image.height,
+            "file_size": image.file_size,
+            "dominant_color": image.dominant_color,
+            "phash": image.phash
         }
 
         if include_file_path:
@@ -329,6 +461,10 @@ class ImageBusinessService:
 
         return image_data
 
+    def _normalize_prompt(self, prompt: str) -> str:
+        """Normalize prompt for cache lookups (case and whitespace insensitive)"""
+        return " ".join(prompt.split()).lower()
+
     def _generate_prompt_hash(self, prompt: str) -> str:
-        """Generate hash for prompt"""
-        return hashlib.md5(prompt.encode()).hexdigest()[:10]
\ No newline at end of file
+        """Generate hash for normalized prompt"""
+        return hashlib.md5(self._normalize_prompt(prompt).encode()).hexdigest()[:10]
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""Image Reconciliation Service - Detects drift between IMAGES_DIR and generated_images"""
+import os
+import time
+import logging
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Set
+from config.settings import IMAGES_DIR
+from db.image_service import ImageService
+
+logger = logging.getLogger(__name__)
+
+# Orphaned files are moved here instead of being deleted, so a fix can be undone by hand
+ORPHAN_QUARANTINE_DIR = "_orphaned"
+# Leftover '.part' files from interrupted downloads older than this are considered stale. Files without
+# DB row younger than this are not treated as orphans either (row of a running generation not yet committed)
+STALE_TEMP_FILE_AGE_SECONDS = 3600
+# Maximum number of example filenames/IDs kept per category in the report
+SAMPLE_LIMIT = 100
+
+
+class ImagesDirectoryUnavailableError(Exception):
+    """Raised when IMAGES_DIR is missing (e.g. volume not mounted), every row would look dangling"""
+    pass
+
+
+class ImageReconciliationService:
+    """Streaming reconciliation of image files and database rows with bounded memory"""
+
+    def __init__(self, images_dir: Optional[str] = None):
+        self.images_dir = Path(images_dir or IMAGES_DIR)
+
+    def reconcile(self, fix_orphans: bool = False, fix_dangling: bool = False,
+                  batch_size: int = 1000,
+                  progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Compare IMAGES_DIR against generated_images in both directions
+
+        Args:
+            fix_orphans: Move files without DB row to the quarantine dir and remove stale temp files
+            fix_dangling: Delete DB rows whose file does not exist
+            batch_size: Filenames/rows per DB query
+            progress_callback: Optional callable receiving the current report after each batch
+
+        Returns:
+            Dict containing counts and sample entries for orphans, dangling rows and temp files
+
+        Raises:
+            ImagesDirectoryUnavailableError: IMAGES_DIR is not a directory (nothing is checked or fixed)
+        """
+        if not self.images_dir.is_dir():
+            logger.error(f"Images directory does not exist, reconciliation aborted: {self.images_dir}")
+            raise ImagesDirectoryUnavailableError(f"Images directory does not exist or is not mounted: {self.images_dir}")
+
+        started = time.monotonic()
+        report = {
+            "images_dir": str(self.images_dir),
+            "fix_orphans": fix_orphans,
+            "fix_dangling": fix_dangling,
+            "phase": "files",
+            "files_scanned": 0,
+            "orphan_files": 0,
+            "orphans_quarantined": 0,
+            "recent_files_skipped": 0,
+            "stale_temp_files": 0,
+            "temp_files_removed": 0,
+            "rows_scanned": 0,
+            "dangling_rows": 0,
+            "dangling_rows_deleted": 0,
+            "errors": 0,
+            "samples": {"orphan_files": [], "dangling_rows": [], "stale_temp_files": []}
+        }
+
+        def notify():
+            report["elapsed_seconds"] = round(time.monotonic() - started, 1)
+            if progress_callback:
+                progress_callback(report)
+
+        self._reconcile_files(report, fix_orphans, batch_size, notify)
+        report["phase"] = "rows"
+        self._reconcile_rows(report, fix_dangling, batch_size, notify)
+        report["phase"] = "done"
+        notify()
+
+        logger.info(
+            f"Image reconciliation finished: {report['files_scanned']} files, {report['rows_scanned']} rows, "
+            f"{report['orphan_files']} orphans, {report['dangling_rows']} dangling rows, "
+            f"{report['stale_temp_files']} stale temp files"
+        )
+        return report
+
+    def _reconcile_files(self, report: Dict[str, Any], fix: bool, batch_size: int, notify: Callable[[], None]) -> None:
+        """Walk IMAGES_DIR with os.scandir and check filenames against the DB in batches"""
+        batch: List[str] = []
+        recent: Set[str] = set()
+        now = time.time()
+        with os.scandir(self.images_dir) as entries:
+            for entry in entries:
+                if not entry.is_file(follow_symlinks=False) or entry.name.startswith('.'):
+                    continue
+
+                if entry.name.endswith(".part"):
+                    self._handle_temp_file(report, entry, now, fix)
+                    continue
+
+                report["files_scanned"] += 1
+                batch.append(entry.name)
+                try:
+                    if now - entry.stat(follow_symlinks=False).st_mtime < STALE_TEMP_FILE_AGE_SECONDS:
+                        recent.add(entry.name)
+                except OSError:
+                    recent.add(entry.name)  # Vanished or unreadable, never quarantine
+                if len(batch) >= batch_size:
+                    self._check_file_batch(report, batch, recent, fix)
+                    batch, recent = [], set()
+                    notify()
+
+        if batch:
+            self._check_file_batch(report, batch, recent, fix)
+            notify()
+
+    def _check_file_batch(self, report: Dict[str, Any], filenames: List[str], recent: Set[str], fix: bool) -> None:
+        """Report (and optionally quarantine) files that have no DB row and are older than the grace period"""
+        known = ImageService.get_existing_filenames(filenames)
+        for filename in filenames:
+            if filename in known:
+                continue
+            if filename in recent:
+                report["recent_files_skipped"] += 1  # Generation may not have committed its row yet
+                continue
+            report["orphan_files"] += 1
+            self._add_sample(report, "orphan_files", filename)
+            if fix:
+                try:
+                    quarantine_dir = self.images_dir / ORPHAN_QUARANTINE_DIR
+                    quarantine_dir.mkdir(exist_ok=True)
+                    os.replace(self.images_dir / filename, quarantine_dir / filename)
+                    report["orphans_quarantined"] += 1
+                except OSError as e:
+                    report["errors"] += 1
+                    logger.warning(f"Could not quarantine orphan file {filename}: {e}")
+
+    def _handle_temp_file(self, report: Dict[str, Any], entry: os.DirEntry, now: float, fix: bool) -> None:
+        """Report (and optionally remove) stale temp files left by interrupted downloads"""
+        try:
+            if now - entry.stat(follow_symlinks=False).st_mtime < STALE_TEMP_FILE_AGE_SECONDS:
+                return  # Download may still be in progress
+            report["stale_temp_files"] += 1
+            self._add_sample(report, "stale_temp_files", entry.name)
+            if fix:
+                os.remove(entry.path)
+                report["temp_files_removed"] += 1
+        except OSError as e:
+            report["errors"] += 1
+            logger.warning(f"Could not process temp file {entry.name}: {e}")
+
+    def _reconcile_rows(self, report: Dict[str, Any], fix: bool, batch_size: int, notify: Callable[[], None]) -> None:
+        """Stream DB rows and report (and optionally delete) rows whose file is missing"""
+        for rows in ImageService.iter_image_file_refs(batch_size=batch_size):
+            dangling_ids = []
+            for image_id, filename, file_path in rows:
+                report["rows_scanned"] += 1
+                if self._file_exists(filename, file_path):
+                    continue
+                report["dangling_rows"] += 1
+                dangling_ids.append(image_id)
+                self._add_sample(report, "dangling_rows", {"id": image_id, "filename": filename})
+
+            if fix and dangling_ids:
+                report["dangling_rows_deleted"] += ImageService.delete_images_by_ids(dangling_ids)
+            notify()
+
+    def _file_exists(self, filename: str, file_path: Optional[str]) -> bool:
+        """Check stored path first, then IMAGES_DIR (paths differ between dev and container)"""
+        if file_path and os.path.isfile(file_path):
+            return True
+        return bool(filename) and os.path.isfile(self.images_dir / filename)
+
+    def _add_sample(self, report: Dict[str, Any], key: str, value: Any) -> None:
+        samples = report["samples"][key]
+        if len(samples) < SAMPLE_LIMIT:
+            samples.append(value)
@@ -0,0 +1,297 @@
+"""Image Similarity Service - Perceptual-hash index for near-duplicate detection"""
+import logging
+import threading
+import time
+from itertools import combinations
+from typing import Dict, Any, List, Optional, Tuple
+from config.settings import IMAGE_SIMILARITY_CHECK_INTERVAL, IMAGE_SIMILARITY_MAX_INDEX_AGE
+from db.image_service import ImageService
+from utils.image_hashing import extract_image_metadata, hamming_distance, hex_to_phash
+
+logger = logging.getLogger(__name__)
+
+
+class ImageSimilarityError(Exception):
+    """Base exception for image similarity errors"""
+    pass
+
+
+class PerceptualHashIndex:
+    """
+    Multi-index hamming search over 64-bit hashes.
+
+    The hash is split into 4 chunks of 16 bits, each chunk has its own exact-match table.
+    Two hashes within distance r differ in at most r // 4 bits in at least one chunk
+    (pigeonhole), so a query only probes chunk values within that radius instead of
+    scanning all hashes.
+    """
+
+    CHUNKS = 4
+    CHUNK_BITS = 16
+    CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+    def __init__(self):
+        self._hashes: Dict[str, int] = {}
+        self._tables: List[Dict[int, set]] = [{} for _ in range(self.CHUNKS)]
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def _chunks(self, value: int) -> List[int]:
+        return [(value >> (i * self.CHUNK_BITS)) & self.CHUNK_MASK for i in range(self.CHUNKS)]
+
+    def add(self, image_id: str, phash: int) -> None:
+        """Add or replace hash for an image"""
+        if image_id in self._hashes:
+            self.remove(image_id)
+        self._hashes[image_id] = phash
+        for table, chunk in zip(self._tables, self._chunks(phash)):
+            table.setdefault(chunk, set()).add(image_id)
+
+    def remove(self, image_id: str) -> None:
+        """Remove image from the index"""
+        phash = self._hashes.pop(image_id, None)
+        if phash is None:
+            return
+        for table, chunk in zip(self._tables, self._chunks(phash)):
+            bucket = table.get(chunk)
+            if bucket:
+                bucket.discard(image_id)
+                if not bucket:
+                    del table[chunk]
+
+    def _chunk_variants(self, chunk: int, radius: int):
+        """Yield all chunk values within the given hamming radius"""
+        for distance in range(radius + 1):
+            for bits in combinations(range(self.CHUNK_BITS), distance):
+                variant = chunk
+                for bit in bits:
+                    variant ^= 1 << bit
+                yield variant
+
+    def search(self, phash: int, max_distance: int) -> List[Tuple[str, int]]:
+        """
+        Find all images within max_distance of the given hash.
+
+        Returns:
+            List of (image_id, distance) sorted by distance
+        """
+        chunk_radius = max_distance // self.CHUNKS
+        candidates = set()
+        for table, chunk in zip(self._tables, self._chunks(phash)):
+            for variant in self._chunk_variants(chunk, chunk_radius):
+                bucket = table.get(variant)
+                if bucket:
+                    candidates.update(bucket)
+
+        matches = []
+        for image_id in candidates:
+            distance = hamming_distance(phash, self._hashes[image_id])
+            if distance <= max_distance:
+                matches.append((image_id, distance))
+        matches.sort(key=lambda match: match[1])
+        return matches
+
+    def get(self, image_id: str) -> Optional[int]:
+        return self._hashes.get(image_id)
+
+    def items(self):
+        return self._hashes.items()
+
+
+class ImageSimilarityService:
+    """Business logic for similar-image lookups, dedupe reports and metadata backfill"""
+
+    # Process-wide index shared by all requests of this worker
+    _index: Optional[PerceptualHashIndex] = None
+    _index_signature = None
+    _index_built_at = 0.0
+    _last_check_at = 0.0
+    _lock = threading.Lock()
+
+    def _get_index(self) -> PerceptualHashIndex:
+        """Return the in-memory index, rebuilding it when the DB has changed"""
+        cls = ImageSimilarityService
+        now = time.monotonic()
+        if cls._index is not None and now - cls._last_check_at < IMAGE_SIMILARITY_CHECK_INTERVAL:
+            return cls._index
+
+        with cls._lock:
+            now = time.monotonic()
+            if cls._index is not None and now - cls._last_check_at < IMAGE_SIMILARITY_CHECK_INTERVAL:
+                return cls._index
+
+            signature = ImageService.get_phash_signature()
+            cls._last_check_at = now
+            if (cls._index is None or signature != cls._index_signature
+                    or now - cls._index_built_at > IMAGE_SIMILARITY_MAX_INDEX_AGE):
+                index = PerceptualHashIndex()
+                for image_id, phash in ImageService.get_phash_entries():
+                    index.add(image_id, hex_to_phash(phash))
+                cls._index = index
+                cls._index_signature = signature
+                cls._index_built_at = now
+                logger.info(f"Perceptual hash index built with {len(index)} images")
+
+            return cls._index
+
+    def find_similar_images(self, image_id: str, max_distance: int = 8, limit: int = 20) -> Optional[Dict[str, Any]]:
+        """
+        Find images visually similar to the given image
+
+        Args:
+            image_id: ID of the reference image
+            max_distance: Maximum hamming distance (0-64, lower is more similar)
+            limit: Maximum number of results
+
+        Returns:
+            Dict with reference image ID and similar images, or None if image not found
+        """
+        try:
+            image = ImageService.get_image_by_id(image_id)
+            if not image:
+                return None
+            if not image.phash:
+                raise ImageSimilarityError("Image has no perceptual hash yet (run metadata backfill)")
+
+            index = self._get_index()
+            start = time.perf_counter()
+            matches = [match for match in index.search(hex_to_phash(image.phash), max_distance) if match[0] != str(image.id)]
+            matches = matches[:limit]
+            lookup_ms = (time.perf_counter() - start) * 1000
+
+            distances = dict(matches)
+            images = {str(img.id): img for img in ImageService.get_images_by_ids(list(distances.keys()))}
+
+            similar = []
+            for match_id, distance in matches:
+                match = images.get(match_id)
+                if match:
+                    similar.append({
+                        "id": match_id,
+                        "distance": distance,
+                        "url": match.local_url,
+                        "title": match.title,
+                        "prompt": match.prompt,
+                        "created_at": match.created_at.isoformat() if match.created_at else None
+                    })
+
+            return {
+                "image_id": str(image.id),
+                "max_distance": max_distance,
+                "similar": similar,
+                "index_size": len(index),
+                "lookup_ms": round(lookup_ms, 3)
+            }
+
+        except ImageSimilarityError:
+            raise
+        except Exception as e:
+            logger.error(f"Error finding similar images for {image_id}: {type(e).__name__}: {e}")
+            raise ImageSimilarityError(f"Failed to find similar images: {e}") from e
+
+    def get_duplicate_report(self, max_distance: int = 4) -> Dict[str, Any]:
+        """
+        Group near-duplicate images (connected components within max_distance)
+
+        Args:
+            max_distance: Maximum hamming distance to treat two images as duplicates
+
+        Returns:
+            Dict containing duplicate groups and summary
+        """
+        try:
+            index = self._get_index()
+            start = time.perf_counter()
+
+            # Union-find over all pairs found by the index
+            parent: Dict[str, str] = {}
+
+            def find(node: str) -> str:
+                while parent.get(node, node) != node:
+                    node = parent[node]
+                return node
+
+            pair_distances: Dict[str, int] = {}
+            for image_id, phash in list(index.items()):
+                for match_id, distance in index.search(phash, max_distance):
+                    if match_id == image_id:
+                        continue
+                    root_a, root_b = find(image_id), find(match_id)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+                    pair_distances[image_id] = min(distance, pair_distances.get(image_id, distance))
+
+            groups: Dict[str, List[str]] = {}
+            for image_id in pair_distances:
+                groups.setdefault(find(image_id), []).append(image_id)
+
+            duplicate_groups = [
+                {
+                    "image_ids": sorted(members),
+                    "size": len(members),
+                    "min_distance": min(pair_distances[member] for member in members)
+                }
+                for members in groups.values() if len(members) > 1
+            ]
+            duplicate_groups.sort(key=lambda group: (-group["size"], group["min_distance"]))
+
+            return {
+                "max_distance": max_distance,
+                "groups": duplicate_groups,
+                "summary": {
+                    "indexed_images": len(index),
+                    "duplicate_groups": len(duplicate_groups),
+                    "images_in_groups": sum(group["size"] for group in duplicate_groups),
+                    "redundant_images": sum(group["size"] - 1 for group in duplicate_groups),
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 1)
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"Error building duplicate report: {type(e).__name__}: {e}")
+            raise ImageSimilarityError(f"Failed to build duplicate report: {e}") from e
+
+    def backfill_metadata(self, batch_size: int = 100, max_images: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Extract file metadata and perceptual hash for images stored before extraction existed
+
+        Args:
+            batch_size: Number of images loaded per DB query
+            max_images: Optional upper bound of images to process
+
+        Returns:
+            Dict containing processed/updated/missing/error counts
+        """
+        results = {"processed": 0, "updated": 0, "missing_files": 0, "errors": 0}
+        skipped_ids: List[str] = []
+
+        while max_images is None or results["processed"] < max_images:
+            limit = batch_size if max_images is None else min(batch_size, max_images - results["processed"])
+            images = ImageService.get_images_without_phash(limit=limit, exclude_ids=skipped_ids)
+            if not images:
+                break
+
+            for image in images:
+                results["processed"] += 1
+                try:
+                    metadata = extract_image_metadata(image.file_path)
+                except FileNotFoundError:
+                    results["missing_files"] += 1
+                    skipped_ids.append(str(image.id))
+                    continue
+                except Exception as e:
+                    logger.warning(f"Metadata extraction failed for {image.id}: {type(e).__name__}: {e}")
+                    results["errors"] += 1
+                    skipped_ids.append(str(image.id))
+                    continue
+
+                if ImageService.update_file_metadata(str(image.id), metadata):
+                    results["updated"] += 1
+                else:
+                    results["errors"] += 1
+                    skipped_ids.append(str(image.id))
+
+            logger.info(f"Metadata backfill progress: {results}")
+
+        return results
@@ -0,0 +1,297 @@
+"""Ollama Admission Service - Per-model concurrency limits with a fair, bounded wait queue"""
+import logging
+import math
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Callable
+import redis
+from config.settings import (
+    REDIS_URL, OLLAMA_TIMEOUT, OLLAMA_ADMISSION_ENABLED, OLLAMA_MODEL_CONCURRENCY,
+    OLLAMA_MODEL_CONCURRENCY_OVERRIDES, OLLAMA_QUEUE_MAX_SIZE, OLLAMA_QUEUE_MAX_WAIT
+)
+from db.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ollama-admission"
+MODELS_KEY = f"{KEY_PREFIX}:models"
+POLL_INTERVAL = 0.2
+# Waiters that stop polling for this long (worker killed) are dropped from the queue
+STALE_WAITER_MS = 10000
+# Recent wait/run durations kept per model for percentiles
+SAMPLE_SIZE = 200
+
+# Single script for all queue operations so cleanup, limit check and admission are atomic.
+# Queue score = round * 1e13 + enqueue time (ms). A user's n-th waiting request gets round n,
+# so users are served round-robin and one user cannot push everybody else back.
+ADMISSION_SCRIPT = """
+local waiting, heartbeat, ticket_users, user_counts, active = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5]
+local op, ticket, now = ARGV[1], ARGV[2], tonumber(ARGV[3])
+
+local function forget(t)
+    local user = redis.call('hget', ticket_users, t)
+    if user then
+        if redis.call('hincrby', user_counts, user, -1) <= 0 then
+            redis.call('hdel', user_counts, user)
+        end
+        redis.call('hdel', ticket_users, t)
+    end
+    redis.call('zrem', waiting, t)
+    redis.call('zrem', heartbeat, t)
+end
+
+redis.call('zremrangebyscore', active, '-inf', now)
+for _, t in ipairs(redis.call('zrangebyscore', heartbeat, '-inf', now - tonumber(ARGV[4]))) do
+    forget(t)
+end
+
+if op == 'enqueue' then
+    local user, max_queue = ARGV[5], tonumber(ARGV[6])
+    local depth = redis.call('zcard', waiting)
+    if depth >= max_queue then
+        return {-1, depth}
+    end
+    local round = tonumber(redis.call('hget', user_counts, user) or '0')
+    redis.call('hincrby', user_counts, user, 1)
+    redis.call('hset', ticket_users, ticket, user)
+    redis.call('zadd', waiting, round * 1e13 + now, ticket)
+    redis.call('zadd', heartbeat, now, ticket)
+    return {0, redis.call('zrank', waiting, ticket)}
+elseif op == 'poll' then
+    local limit, lease_ms = tonumber(ARGV[5]), tonumber(ARGV[6])
+    if not redis.call('zscore', waiting, ticket) then
+        return {-1, 0}
+    end
+    redis.call('zadd', heartbeat, now, ticket)
+    local rank = redis.call('zrank', waiting, ticket)
+    if rank < limit - redis.call('zcard', active) then
+        forget(ticket)
+        redis.call('zadd', active, now + lease_ms, ticket)
+        return {1, 0}
+    end
+    return {0, rank}
+end
+
+forget(ticket)
+return {0, 0}
+"""
+
+
+class OllamaQueueFullError(Exception):
+    """Raised when a request cannot be admitted (queue full or wait timeout)"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class OllamaAdmissionService:
+    """
+    Admission control in front of Ollama, shared by all gunicorn workers via Redis.
+
+    Each model has a concurrency limit (slots) and a bounded wait queue. The configured limit
+    applies per Ollama host, so with backend_count it is multiplied by the number of healthy
+    hosts that have the model loaded. Admitted requests hold
+    a slot lease that expires after OLLAMA_TIMEOUT, so crashed workers cannot leak slots.
+    Long-running streams extend their lease with renew().
+    If Redis is unavailable, requests are passed through without admission control.
+    """
+
+    def __init__(self, redis_url: str = REDIS_URL, backend_count: Optional[Callable[[str], int]] = None):
+        self.redis_url = redis_url
+        self.backend_count = backend_count
+        self.lease_ms = (OLLAMA_TIMEOUT + 30) * 1000
+        self._redis: Optional[redis.Redis] = None
+        self._script = None
+
+    def _get_redis_connection(self) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        if self._redis is None:
+            self._redis = get_redis_client(self.redis_url)
+            self._script = self._redis.register_script(ADMISSION_SCRIPT)
+        return self._redis
+
+    @staticmethod
+    def get_backend_limit(model: str) -> int:
+        """Concurrent Ollama requests allowed for a model on one host"""
+        return OLLAMA_MODEL_CONCURRENCY_OVERRIDES.get(model, OLLAMA_MODEL_CONCURRENCY)
+
+    def get_model_limit(self, model: str) -> int:
+        """Concurrent Ollama requests allowed for a model across all serving hosts"""
+        backends = self.backend_count(model) if self.backend_count else 1
+        return self.get_backend_limit(model) * max(1, backends)
+
+    def _keys(self, model: str) -> List[str]:
+        prefix = f"{KEY_PREFIX}:{model}"
+        return [f"{prefix}:waiting", f"{prefix}:heartbeat", f"{prefix}:ticket-users",
+                f"{prefix}:user-counts", f"{prefix}:active"]
+
+    def _run_script(self, model: str, op: str, ticket: str, *args) -> List[int]:
+        self._get_redis_connection()
+        result = self._script(keys=self._keys(model), args=[op, ticket, int(time.time() * 1000), STALE_WAITER_MS, *args])
+        return [int(value) for value in result]
+
+    @contextmanager
+    def admit(self, model: str, user_id: Optional[str] = None):
+        """
+        Hold an Ollama slot for the duration of the block
+
+        Raises:
+            OllamaQueueFullError: Queue is full or the request waited longer than OLLAMA_QUEUE_MAX_WAIT
+        """
+        ticket = self.acquire(model, user_id)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(model, ticket, (time.monotonic() - started) * 1000)
+
+    def acquire(self, model: str, user_id: Optional[str] = None) -> Optional[str]:
+        """
+        Wait for a free slot for the model
+
+        Args:
+            model: Ollama model name
+            user_id: Requesting user, used for fair ordering
+
+        Returns:
+            Ticket to pass to release(), None if admission control is bypassed
+        """
+        if not OLLAMA_ADMISSION_ENABLED:
+            return None
+
+        ticket = uuid.uuid4().hex
+        limit = self.get_model_limit(model)
+        started = time.monotonic()
+
+        try:
+            r = self._get_redis_connection()
+            r.sadd(MODELS_KEY, model)
+            self._enqueue(r, model, ticket, user_id)
+
+            while True:
+                status, position = self._run_script(model, "poll", ticket, limit, self.lease_ms)
+                if status == 1:
+                    break
+                if status < 0:
+                    # Dropped as stale (e.g. long GC pause) - queue again at the end, rejected if full meanwhile
+                    self._enqueue(r, model, ticket, user_id)
+                if time.monotonic() - started > OLLAMA_QUEUE_MAX_WAIT:
+                    self._run_script(model, "cancel", ticket)
+                    r.hincrby(self._stats_key(model), "timeouts", 1)
+                    logger.warning(f"Ollama queue wait timeout for {model} at position {position}")
+                    raise OllamaQueueFullError(f"Timed out waiting for Ollama model {model}",
+                                               self._estimate_retry_after(model, position))
+                time.sleep(POLL_INTERVAL)
+
+            wait_ms = int((time.monotonic() - started) * 1000)
+            pipe = r.pipeline(transaction=False)
+            pipe.hincrby(self._stats_key(model), "admitted", 1)
+            pipe.lpush(self._samples_key(model, "wait"), wait_ms)
+            pipe.ltrim(self._samples_key(model, "wait"), 0, SAMPLE_SIZE - 1)
+            pipe.execute()
+            if wait_ms > 1000:
+                logger.info(f"Ollama request for {model} admitted after {wait_ms} ms in queue")
+            return ticket
+
+        except redis.RedisError as e:
+            logger.warning(f"Ollama admission unavailable, passing request through: {type(e).__name__}: {e}")
+            return None
+
+    def renew(self, model: str, ticket: Optional[str]) -> None:
+        """Extend the slot lease of a running request (only if it still holds the slot)"""
+        if ticket is None:
+            return
+        try:
+            self._get_redis_connection().zadd(self._keys(model)[4], {ticket: int(time.time() * 1000) + self.lease_ms}, xx=True)
+        except redis.RedisError as e:
+            logger.warning(f"Ollama slot lease renewal failed: {type(e).__name__}: {e}")
+
+    def _enqueue(self, r: redis.Redis, model: str, ticket: str, user_id: Optional[str]) -> None:
+        """
+        Add the ticket to the model's wait queue
+
+        Raises:
+            OllamaQueueFullError: Queue is full (counted as rejected)
+        """
+        status, depth = self._run_script(model, "enqueue", ticket, str(user_id or "anonymous"), OLLAMA_QUEUE_MAX_SIZE)
+        if status < 0:
+            r.hincrby(self._stats_key(model), "rejected", 1)
+            logger.warning(f"Ollama queue full for {model} ({depth} waiting)")
+            raise OllamaQueueFullError(f"Ollama queue for {model} is full, try again later",
+                                       self._estimate_retry_after(model, depth))
+
+    def release(self, model: str, ticket: Optional[str], run_ms: float) -> None:
+        """Free the slot and record run time"""
+        if ticket is None:
+            return
+        try:
+            r = self._get_redis_connection()
+            pipe = r.pipeline(transaction=False)
+            pipe.zrem(self._keys(model)[4], ticket)
+            pipe.lpush(self._samples_key(model, "run"), int(run_ms))
+            pipe.ltrim(self._samples_key(model, "run"), 0, SAMPLE_SIZE - 1)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Ollama slot release failed (lease will expire): {type(e).__name__}: {e}")
+
+    def _stats_key(self, model: str) -> str:
+        return f"{KEY_PREFIX}:{model}:stats"
+
+    def _samples_key(self, model: str, kind: str) -> str:
+        return f"{KEY_PREFIX}:{model}:{kind}-samples"
+
+    def _estimate_retry_after(self, model: str, depth: int) -> int:
+        """Seconds until a queue position is likely free, based on recent run times"""
+        try:
+            samples = [int(value) for value in self._get_redis_connection().lrange(self._samples_key(model, "run"), 0, 19)]
+        except redis.RedisError:
+            samples = []
+        avg_run_s = (sum(samples) / len(samples) / 1000) if samples else 10
+        return max(1, math.ceil(avg_run_s * (depth + 1) / self.get_model_limit(model)))
+
+    def get_queue_status(self) -> Dict[str, Any]:
+        """Current depth, active slots and wait/run statistics per model"""
+        r = self._get_redis_connection()
+        models = sorted(model.decode() for model in r.smembers(MODELS_KEY))
+        now_ms = int(time.time() * 1000)
+
+        status = {}
+        for model in models:
+            waiting_key, _, _, _, active_key = self._keys(model)
+            pipe = r.pipeline(transaction=False)
+            pipe.zcard(waiting_key)
+            pipe.zcount(active_key, now_ms, "+inf")
+            pipe.hgetall(self._stats_key(model))
+            pipe.lrange(self._samples_key(model, "wait"), 0, -1)
+            pipe.lrange(self._samples_key(model, "run"), 0, -1)
+            waiting, active, raw_stats, wait_samples, run_samples = pipe.execute()
+
+            stats = {name.decode(): int(value) for name, value in raw_stats.items()}
+            status[model] = {
+                "limit": self.get_model_limit(model),
+                "limit_per_backend": self.get_backend_limit(model),
+                "active": active,
+                "waiting": waiting,
+                "max_queue": OLLAMA_QUEUE_MAX_SIZE,
+                "admitted": stats.get("admitted", 0),
+                "rejected": stats.get("rejected", 0),
+                "timeouts": stats.get("timeouts", 0),
+                "wait_ms": self._summarize([int(value) for value in wait_samples]),
+                "run_ms": self._summarize([int(value) for value in run_samples])
+            }
+
+        return {"enabled": OLLAMA_ADMISSION_ENABLED, "max_wait_seconds": OLLAMA_QUEUE_MAX_WAIT, "models": status}
+
+    @staticmethod
+    def _summarize(samples: List[int]) -> Dict[str, Any]:
+        if not samples:
+            return {"samples": 0, "p50": None, "p95": None, "max": None}
+        ordered = sorted(samples)
+        return {
+            "samples": len(ordered),
+            "p50": ordered[len(ordered) // 2],
+            "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            "max": ordered[-1]
+        }
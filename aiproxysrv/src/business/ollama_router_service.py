@@ -0,0 +1,265 @@
+"""Ollama Router Service - Routes chat traffic across a pool of Ollama hosts"""
+import logging
+import random
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Callable, Tuple
+import redis
+import requests
+from config.settings import (
+    REDIS_URL, OLLAMA_URLS, OLLAMA_TIMEOUT, OLLAMA_HEALTH_CHECK_INTERVAL,
+    OLLAMA_FAILURE_THRESHOLD, OLLAMA_BACKEND_COOLDOWN
+)
+from db.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ollama-router"
+DISCOVERY_TIMEOUT = 5
+# Status codes that make us try the next backend (model missing there, overloaded or crashed)
+FAILOVER_STATUS_CODES = {404, 500, 502, 503, 504}
+
+
+class OllamaNoBackendError(Exception):
+    """Raised when no healthy Ollama backend is available"""
+    pass
+
+
+class OllamaBackend:
+    """Health and model state of one Ollama host"""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.healthy = True  # Optimistic until the first check says otherwise
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.available_models: Optional[set] = None  # None = not discovered yet
+        self.loaded_models: set = set()
+        self.last_checked: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    def is_available(self, now: float) -> bool:
+        return self.healthy or now >= self.unhealthy_until
+
+    def has_model(self, model: str) -> bool:
+        return self.available_models is None or model in self.available_models
+
+    def to_dict(self, in_flight: int) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "consecutive_failures": self.consecutive_failures,
+            "in_flight": in_flight,
+            "available_models": sorted(self.available_models) if self.available_models is not None else None,
+            "loaded_models": sorted(self.loaded_models),
+            "last_checked": self.last_checked,
+            "last_error": self.last_error
+        }
+
+
+class OllamaRouterService:
+    """
+    Least-loaded routing with failover over OLLAMA_URLS.
+
+    Active checks poll /api/tags (installed models) and /api/ps (models in memory) every
+    OLLAMA_HEALTH_CHECK_INTERVAL seconds in a background thread. Passive checks count
+    connection errors and 5xx responses; after OLLAMA_FAILURE_THRESHOLD failures a backend is
+    skipped for OLLAMA_BACKEND_COOLDOWN seconds. In-flight requests per backend are tracked
+    as expiring leases in Redis so all gunicorn workers see the same load.
+    """
+
+    # Process-wide state shared by all controllers of this worker
+    _backends: List[OllamaBackend] = []
+    _lock = threading.Lock()
+    _checker: Optional[threading.Thread] = None
+    _local_in_flight: Dict[str, int] = {}
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        cls = OllamaRouterService
+        with cls._lock:
+            if not cls._backends:
+                cls._backends = [OllamaBackend(url) for url in OLLAMA_URLS]
+                cls._local_in_flight = {backend.url: 0 for backend in cls._backends}
+
+    def _get_redis_connection(self) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        if self._redis is None:
+            self._redis = get_redis_client(self.redis_url)
+        return self._redis
+
+    def _ensure_health_checker(self) -> None:
+        """Start the background checker lazily (after gunicorn fork, once per worker)"""
+        cls = OllamaRouterService
+        if cls._checker is not None and cls._checker.is_alive():
+            return
+        with cls._lock:
+            if cls._checker is None or not cls._checker.is_alive():
+                cls._checker = threading.Thread(target=self._health_check_loop, name="ollama-health-check", daemon=True)
+                cls._checker.start()
+
+    def _health_check_loop(self) -> None:
+        while True:
+            self.refresh()
+            time.sleep(OLLAMA_HEALTH_CHECK_INTERVAL)
+
+    def refresh(self) -> None:
+        """Active health check and model discovery for all backends"""
+        for backend in OllamaRouterService._backends:
+            try:
+                tags = requests.get(f"{backend.url}/api/tags", timeout=DISCOVERY_TIMEOUT)
+                tags.raise_for_status()
+                ps = requests.get(f"{backend.url}/api/ps", timeout=DISCOVERY_TIMEOUT)
+                ps.raise_for_status()
+
+                backend.available_models = {model["name"] for model in tags.json().get("models", [])}
+                backend.loaded_models = {model["name"] for model in ps.json().get("models", [])}
+                if not backend.healthy:
+                    logger.info(f"Ollama backend {backend.url} is healthy again")
+                self._mark_success(backend)
+            except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                self._mark_failure(backend, f"health check: {type(e).__name__}: {e}")
+            backend.last_checked = time.time()
+
+    def _mark_success(self, backend: OllamaBackend) -> None:
+        backend.healthy = True
+        backend.consecutive_failures = 0
+        backend.last_error = None
+
+    def _mark_failure(self, backend: OllamaBackend, error: str) -> None:
+        backend.consecutive_failures += 1
+        backend.last_error = error
+        if backend.consecutive_failures >= OLLAMA_FAILURE_THRESHOLD:
+            if backend.healthy:
+                logger.warning(f"Ollama backend {backend.url} marked unhealthy: {error}")
+            backend.healthy = False
+            backend.unhealthy_until = time.monotonic() + OLLAMA_BACKEND_COOLDOWN
+
+    def _in_flight(self) -> Dict[str, int]:
+        """In-flight requests per backend across all workers (local counts if Redis is down)"""
+        backends = OllamaRouterService._backends
+        try:
+            now = time.time()
+            pipe = self._get_redis_connection().pipeline(transaction=False)
+            for backend in backends:
+                pipe.zcount(self._in_flight_key(backend), now, "+inf")
+            return dict(zip([backend.url for backend in backends], pipe.execute()))
+        except redis.RedisError:
+            return dict(OllamaRouterService._local_in_flight)
+
+    def _in_flight_key(self, backend: OllamaBackend) -> str:
+        return f"{KEY_PREFIX}:{backend.url}:in-flight"
+
+    def select_backends(self, model: str) -> List[OllamaBackend]:
+        """
+        Order backends for a request: healthy first, model already loaded first, then least loaded
+        """
+        self._ensure_health_checker()
+        now = time.monotonic()
+        in_flight = self._in_flight()
+
+        candidates = [b for b in OllamaRouterService._backends if b.is_available(now) and b.has_model(model)]
+        # Random tie-break spreads equal load instead of always hitting the first host
+        random.shuffle(candidates)
+        candidates.sort(key=lambda b: (not b.healthy, model not in b.loaded_models, in_flight.get(b.url, 0)))
+        return candidates
+
+    def count_serving_backends(self, model: str) -> int:
+        """Healthy backends that have the model loaded (at least 1, the first request loads it somewhere)"""
+        self._ensure_health_checker()
+        now = time.monotonic()
+        serving = [b for b in OllamaRouterService._backends if b.is_available(now) and model in b.loaded_models]
+        return max(1, len(serving))
+
+    def request(self, model: str, path: str, **kwargs) -> Tuple[requests.Response, Callable[[], None]]:
+        """
+        POST to the best backend for the model, failing over on connection errors and 5xx/404
+
+        Only failures before Ollama accepted the request are retried elsewhere; read timeouts are
+        raised because the generation may still be running.
+
+        Returns:
+            Tuple of (response, release) - call release() once the response is fully consumed
+
+        Raises:
+            OllamaNoBackendError: No backend available for the model
+            requests.exceptions.RequestException: Last backend failed
+        """
+        backends = self.select_backends(model)
+        if not backends:
+            raise OllamaNoBackendError(f"No healthy Ollama backend available for model {model}")
+
+        last_error: Optional[Exception] = None
+        for attempt, backend in enumerate(backends):
+            release = self._acquire_lease(backend)
+            is_last = attempt == len(backends) - 1
+            try:
+                resp = requests.post(f"{backend.url}{path}", **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ConnectTimeout) as e:
+                release()
+                self._mark_failure(backend, f"{type(e).__name__}: {e}")
+                last_error = e
+                if not is_last:
+                    logger.warning(f"Ollama backend {backend.url} unreachable, failing over: {e}")
+                continue
+            except Exception:
+                release()
+                raise
+
+            if resp.status_code in FAILOVER_STATUS_CODES and not is_last:
+                logger.warning(f"Ollama backend {backend.url} returned {resp.status_code} for {model}, failing over")
+                if resp.status_code != 404:
+                    self._mark_failure(backend, f"HTTP {resp.status_code}")
+                resp.close()
+                release()
+                continue
+
+            if resp.status_code < 500:
+                self._mark_success(backend)
+            if resp.status_code == 200:
+                # Only a served request proves the model is (now) in memory there, a 404 means it is missing
+                backend.loaded_models.add(model)
+            return resp, release
+
+        raise last_error or OllamaNoBackendError(f"No Ollama backend could serve model {model}")
+
+    def _acquire_lease(self, backend: OllamaBackend) -> Callable[[], None]:
+        """Count request as in flight on the backend, returns idempotent release function"""
+        ticket = uuid.uuid4().hex
+        key = self._in_flight_key(backend)
+        with OllamaRouterService._lock:
+            OllamaRouterService._local_in_flight[backend.url] += 1
+        try:
+            self._get_redis_connection().zadd(key, {ticket: time.time() + OLLAMA_TIMEOUT + 30})
+        except redis.RedisError:
+            pass
+        released = False
+
+        def release():
+            nonlocal released
+            if released:
+                return
+            released = True
+            with OllamaRouterService._lock:
+                OllamaRouterService._local_in_flight[backend.url] -= 1
+            try:
+                r = self._get_redis_connection()
+                pipe = r.pipeline(transaction=False)
+                pipe.zrem(key, ticket)
+                pipe.zremrangebyscore(key, "-inf", time.time())
+                pipe.execute()
+            except redis.RedisError:
+                pass
+
+        return release
+
+    def get_status(self) -> Dict[str, Any]:
+        """Health, models and load of all backends"""
+        self._ensure_health_checker()
+        in_flight = self._in_flight()
+        return {
+            "health_check_interval": OLLAMA_HEALTH_CHECK_INTERVAL,
+            "backends": [backend.to_dict(in_flight.get(backend.url, 0)) for backend in OllamaRouterService._backends]
+        }
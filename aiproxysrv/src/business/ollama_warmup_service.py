@@ -0,0 +1,182 @@
+"""Ollama Warmup Service - Keeps the models used by prompt templates loaded on all Ollama hosts"""
+import json
+import logging
+import threading
+import time
+from typing import Dict, Any, List, Optional
+import redis
+import requests
+from config.settings import (
+    REDIS_URL, OLLAMA_TIMEOUT, OLLAMA_WARMUP_ENABLED, OLLAMA_WARMUP_INTERVAL,
+    OLLAMA_KEEP_ALIVE, OLLAMA_KEEP_ALIVE_OVERRIDES
+)
+from db.redis_client import get_redis_client
+from db.database import SessionLocal
+from db.models import PromptTemplate
+from business.ollama_router_service import OllamaRouterService
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ollama-warmup"
+STATUS_KEY = f"{KEY_PREFIX}:status"
+LOCK_KEY = f"{KEY_PREFIX}:lock"
+NS_PER_MS = 1_000_000
+
+
+class OllamaWarmupService:
+    """
+    Preloads the models of active prompt templates so interactive requests never wait for a cold load.
+
+    An empty /api/generate request makes Ollama load the model and keep it for `keep_alive`.
+    The scheduler repeats this every OLLAMA_WARMUP_INTERVAL seconds (shorter than keep_alive),
+    which also picks up template changes. Every gunicorn worker runs the scheduler, a Redis
+    lock makes sure only one of them warms per interval. Results (load time per host) are kept
+    in Redis for the status endpoint.
+    """
+
+    _scheduler: Optional[threading.Thread] = None
+    _lock = threading.Lock()
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        self.router = OllamaRouterService()
+
+    def _get_redis_connection(self) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        if self._redis is None:
+            self._redis = get_redis_client(self.redis_url)
+        return self._redis
+
+    @staticmethod
+    def get_keep_alive(model: str) -> str:
+        """How long Ollama keeps the model in memory after a request (Ollama duration, e.g. "30m")"""
+        return OLLAMA_KEEP_ALIVE_OVERRIDES.get(model, OLLAMA_KEEP_ALIVE)
+
+    @staticmethod
+    def get_template_models() -> List[str]:
+        """Distinct models referenced by active prompt templates"""
+        db = SessionLocal()
+        try:
+            rows = db.query(PromptTemplate.model).filter(
+                PromptTemplate.active == True,
+                PromptTemplate.model.isnot(None)
+            ).distinct().all()
+            return sorted(row.model for row in rows if row.model)
+        finally:
+            db.close()
+
+    def start_scheduler(self) -> None:
+        """Start the background warmup loop once per process"""
+        if not OLLAMA_WARMUP_ENABLED:
+            return
+        cls = OllamaWarmupService
+        with cls._lock:
+            if cls._scheduler is None or not cls._scheduler.is_alive():
+                cls._scheduler = threading.Thread(target=self._scheduler_loop, name="ollama-warmup", daemon=True)
+                cls._scheduler.start()
+                logger.info(f"Ollama warmup scheduler started (interval {OLLAMA_WARMUP_INTERVAL}s)")
+
+    def _scheduler_loop(self) -> None:
+        while True:
+            try:
+                self.warm_all()
+            except Exception as e:
+                # Database or Redis not reachable yet (e.g. container start order) - retry next interval
+                logger.warning(f"Ollama warmup run failed: {type(e).__name__}: {e}")
+            time.sleep(OLLAMA_WARMUP_INTERVAL)
+
+    def trigger(self) -> List[str]:
+        """Run a warmup now in the background, returns the models that will be warmed"""
+        models = self.get_template_models()
+        threading.Thread(target=self.warm_all, kwargs={"force": True}, name="ollama-warmup-manual", daemon=True).start()
+        return models
+
+    def warm_all(self, force: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Warm all template models on all hosts that have them installed
+
+        Args:
+            force: Ignore the interval lock (manual trigger)
+
+        Returns:
+            Results per model, None if another worker already warmed in this interval
+        """
+        if not force:
+            try:
+                if not self._get_redis_connection().set(LOCK_KEY, "1", nx=True, ex=max(OLLAMA_WARMUP_INTERVAL - 5, 1)):
+                    return None
+            except redis.RedisError as e:
+                logger.warning(f"Ollama warmup lock unavailable, warming anyway: {type(e).__name__}: {e}")
+
+        results = {}
+        for model in self.get_template_models():
+            results[model] = self.warm_model(model)
+
+        if results:
+            try:
+                self._get_redis_connection().hset(STATUS_KEY, mapping={
+                    model: json.dumps(result) for model, result in results.items()
+                })
+            except redis.RedisError as e:
+                logger.warning(f"Ollama warmup status not stored: {type(e).__name__}: {e}")
+        return results
+
+    def warm_model(self, model: str) -> Dict[str, Any]:
+        """
+        Load the model (or refresh its keep_alive) on every host that has it installed
+
+        Returns:
+            Dict with keep_alive, warmed_at and per host results (load_duration_ms, was_loaded, error)
+        """
+        keep_alive = self.get_keep_alive(model)
+        backends = self.router.select_backends(model)
+        hosts = []
+
+        for backend in backends:
+            was_loaded = model in backend.loaded_models
+            started = time.monotonic()
+            try:
+                resp = requests.post(
+                    f"{backend.url}/api/generate",
+                    json={"model": model, "keep_alive": keep_alive},
+                    timeout=OLLAMA_TIMEOUT
+                )
+                resp.raise_for_status()
+                data = resp.json()
+                backend.loaded_models.add(model)
+                load_duration_ms = int(data.get("load_duration", 0) / NS_PER_MS)
+                hosts.append({
+                    "url": backend.url,
+                    "was_loaded": was_loaded,
+                    "load_duration_ms": load_duration_ms,
+                    "total_ms": int((time.monotonic() - started) * 1000),
+                    "error": None
+                })
+                if not was_loaded:
+                    logger.info(f"Ollama model {model} loaded on {backend.url} in {load_duration_ms} ms (keep_alive {keep_alive})")
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning(f"Ollama warmup of {model} on {backend.url} failed: {type(e).__name__}: {e}")
+                hosts.append({"url": backend.url, "was_loaded": was_loaded, "load_duration_ms": None,
+                              "total_ms": int((time.monotonic() - started) * 1000), "error": str(e)})
+
+        if not backends:
+            logger.warning(f"Ollama warmup skipped for {model}: not installed on any healthy host")
+
+        return {
+            "keep_alive": keep_alive,
+            "warmed_at": time.time(),
+            "hosts": hosts,
+            "error": None if backends else "Model not installed on any healthy Ollama host"
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Configuration and last warmup result per template model"""
+        raw = self._get_redis_connection().hgetall(STATUS_KEY)
+        last_runs = {model.decode(): json.loads(result) for model, result in raw.items()}
+        models = self.get_template_models()
+        return {
+            "enabled": OLLAMA_WARMUP_ENABLED,
+            "interval_seconds": OLLAMA_WARMUP_INTERVAL,
+            "models": {model: last_runs.get(model) for model in models}
+        }
@@ -0,0 +1,89 @@
+"""OpenAI Slot Service - Caps concurrent OpenAI image calls across all workers with Redis leases"""
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+import redis
+from config.settings import REDIS_URL, OPENAI_MAX_CONCURRENT_REQUESTS, OPENAI_SLOT_MAX_WAIT
+from db.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+LEASES_KEY = "openai-slots:leases"
+# Leases of crashed workers expire after the OpenAI request timeout (+ margin)
+LEASE_SECONDS = 30 + 30
+POLL_INTERVAL = 0.5
+
+# Remove expired leases, then check and take a slot atomically: KEYS = leases, ARGV = ticket, now, expires, limit
+ACQUIRE_SCRIPT = """
+redis.call('zremrangebyscore', KEYS[1], '-inf', ARGV[2])
+if redis.call('zcard', KEYS[1]) >= tonumber(ARGV[4]) then
+    return 0
+end
+redis.call('zadd', KEYS[1], ARGV[3], ARGV[1])
+return 1
+"""
+
+
+class OpenAISlotTimeoutError(Exception):
+    """Raised when no OpenAI slot became free within OPENAI_SLOT_MAX_WAIT"""
+    pass
+
+
+class OpenAISlotService:
+    """
+    Shared concurrency limit for OpenAI image generation.
+
+    Batch requests fan out to several threads and every gunicorn/gevent worker runs its own
+    batches, so a per-request thread pool alone multiplies the load on the OpenAI account.
+    Every call holds a Redis lease instead, at most OPENAI_MAX_CONCURRENT_REQUESTS run at once.
+    If Redis is unavailable, calls are passed through without the limit.
+    """
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        self._script = None
+
+    def _get_redis_connection(self) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        if self._redis is None:
+            self._redis = get_redis_client(self.redis_url)
+            self._script = self._redis.register_script(ACQUIRE_SCRIPT)
+        return self._redis
+
+    def _acquire(self, ticket: str) -> bool:
+        """Wait for a free slot, False if Redis is unavailable (no lease held)"""
+        started = time.monotonic()
+        while True:
+            try:
+                self._get_redis_connection()
+                now = time.time()
+                if self._script(keys=[LEASES_KEY], args=[ticket, now, now + LEASE_SECONDS, OPENAI_MAX_CONCURRENT_REQUESTS]):
+                    return True
+            except redis.RedisError as e:
+                logger.warning(f"OpenAI slot state unavailable, continuing without slot: {type(e).__name__}: {e}")
+                return False
+            if time.monotonic() - started > OPENAI_SLOT_MAX_WAIT:
+                raise OpenAISlotTimeoutError(f"Timed out after {OPENAI_SLOT_MAX_WAIT}s waiting for a free OpenAI slot")
+            time.sleep(POLL_INTERVAL)
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold an OpenAI slot for the duration of the block
+
+        Raises:
+            OpenAISlotTimeoutError: All slots stayed busy for OPENAI_SLOT_MAX_WAIT seconds
+        """
+        ticket = uuid.uuid4().hex
+        acquired = self._acquire(ticket)
+        try:
+            yield
+        finally:
+            if acquired:
+                try:
+                    self._get_redis_connection().zrem(LEASES_KEY, ticket)
+                except redis.RedisError as e:
+                    logger.warning(f"OpenAI slot release failed (lease will expire): {type(e).__name__}: {e}")
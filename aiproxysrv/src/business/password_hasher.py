@@ -0,0 +1,174 @@
+"""Password Hasher - bcrypt in a bounded thread pool with global, per-account and per-IP concurrency limits"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Optional, TypeVar
+import bcrypt
+import redis
+from config.settings import (
+    REDIS_URL, PASSWORD_BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE,
+    PASSWORD_HASH_MAX_CONCURRENT, PASSWORD_HASH_MAX_PER_ACCOUNT, PASSWORD_HASH_MAX_PER_IP
+)
+from db.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+KEY_PREFIX = "password-hash"
+GLOBAL_KEY = f"{KEY_PREFIX}:global"
+# Leases of crashed workers expire after this many seconds
+LEASE_SECONDS = 30
+# How long a request waits for a free pool slot before it is rejected
+QUEUE_WAIT_SECONDS = 5
+
+# Acquire one lease on every key atomically, or none: KEYS = lease sets, ARGV = ticket, now, expiry, limits...
+ACQUIRE_SCRIPT = """
+local ticket, now, expires = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3])
+for i, key in ipairs(KEYS) do
+    redis.call('zremrangebyscore', key, '-inf', now)
+    if redis.call('zcard', key) >= tonumber(ARGV[3 + i]) then
+        return i
+    end
+end
+for _, key in ipairs(KEYS) do
+    redis.call('zadd', key, expires, ticket)
+    redis.call('expire', key, math.ceil(expires - now) + 1)
+end
+return 0
+"""
+
+try:
+    from gevent import monkey as _gevent_monkey
+    _GEVENT_PATCHED = _gevent_monkey.is_module_patched("threading")
+except ImportError:
+    _GEVENT_PATCHED = False
+
+
+class PasswordHashBusyError(Exception):
+    """Raised when a password operation exceeds a concurrency limit"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    bcrypt outside the request thread.
+
+    Hashes run in a bounded pool (PASSWORD_HASH_WORKERS threads per process, bcrypt releases the
+    GIL) with at most PASSWORD_HASH_MAX_QUEUE waiting jobs. On sync gunicorn workers the request
+    thread still blocks for the hash, so Redis leases limit concurrent password operations across
+    all workers (PASSWORD_HASH_MAX_CONCURRENT), per account and per client IP. A login burst is
+    rejected with 429 instead of occupying every API worker. Under gevent the hub's native thread
+    pool is used so the event loop keeps running.
+    """
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _slots: Optional[threading.BoundedSemaphore] = None
+    _init_lock = threading.Lock()
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        self._script = None
+
+    def _get_redis_connection(self) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        if self._redis is None:
+            self._redis = get_redis_client(self.redis_url)
+            self._script = self._redis.register_script(ACQUIRE_SCRIPT)
+        return self._redis
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._init_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+                cls._slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE)
+        return cls._executor
+
+    def _run(self, fn: Callable[..., T], *args) -> T:
+        """Run fn in the pool, rejects when the pool and its queue are full"""
+        if _GEVENT_PATCHED:
+            import gevent
+            return gevent.get_hub().threadpool.apply(fn, args)
+
+        executor = self._get_executor()
+        if not PasswordHasher._slots.acquire(timeout=QUEUE_WAIT_SECONDS):
+            logger.warning("Password hash pool saturated, rejecting request")
+            raise PasswordHashBusyError("Password service busy, please try again shortly", QUEUE_WAIT_SECONDS)
+        try:
+            return executor.submit(fn, *args).result()
+        finally:
+            PasswordHasher._slots.release()
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured cost"""
+        def _hash():
+            return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=PASSWORD_BCRYPT_ROUNDS)).decode('utf-8')
+        return self._run(_hash)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash"""
+        def _verify():
+            try:
+                return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+            except Exception:
+                return False
+        return self._run(_verify)
+
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """True if the hash was created with a different cost than PASSWORD_BCRYPT_ROUNDS"""
+        try:
+            return int(hashed_password.split('$')[2]) != PASSWORD_BCRYPT_ROUNDS
+        except (IndexError, ValueError):
+            return False
+
+    @contextmanager
+    def limit(self, account: Optional[str] = None, ip: Optional[str] = None):
+        """
+        Hold a password operation lease (global and for the account and client IP)
+
+        Raises:
+            PasswordHashBusyError: All workers, the account or the IP already have the maximum number of operations running
+        """
+        checks = [(GLOBAL_KEY, PASSWORD_HASH_MAX_CONCURRENT, "service")]
+        if account:
+            checks.append((f"{KEY_PREFIX}:account:{account.lower()}", PASSWORD_HASH_MAX_PER_ACCOUNT, "account"))
+        if ip:
+            checks.append((f"{KEY_PREFIX}:ip:{ip}", PASSWORD_HASH_MAX_PER_IP, "ip"))
+
+        ticket = uuid.uuid4().hex
+        acquired = False
+        try:
+            self._get_redis_connection()
+            now = time.time()
+            blocked = int(self._script(
+                keys=[key for key, _, _ in checks],
+                args=[ticket, now, now + LEASE_SECONDS, *[limit for _, limit, _ in checks]]
+            ))
+            if blocked:
+                scope = checks[blocked - 1][2]
+                logger.warning(f"Password operation limit per {scope} reached")
+                raise PasswordHashBusyError("Too many concurrent password operations, please try again shortly", 1)
+            acquired = True
+        except redis.RedisError as e:
+            logger.warning(f"Password operation limits unavailable, continuing: {type(e).__name__}: {e}")
+
+        try:
+            yield
+        finally:
+            if acquired:
+                try:
+                    pipe = self._get_redis_connection().pipeline(transaction=False)
+                    for key, _, _ in checks:
+                        pipe.zrem(key, ticket)
+                    pipe.execute()
+                except redis.RedisError as e:
+                    logger.warning(f"Password operation lease release failed (expires): {type(e).__name__}: {e}")
@@ -0,0 +1,131 @@
+"""Prompt Template Cache - Per-process template registry invalidated by a version counter in Redis"""
+import hashlib
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, Tuple
+import redis
+from sqlalchemy.orm import Session
+from config.settings import REDIS_URL
+from db.redis_client import get_redis_client
+from db.models import PromptTemplate
+from schemas.prompt_schemas import PromptTemplateResponse
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "prompt-templates:version"
+# Without Redis the version cannot be checked, templates are then reloaded after this many seconds
+FALLBACK_TTL = 30
+
+
+class PromptTemplateCache:
+    """
+    Active prompt templates, loaded once per process and grouped by category and action.
+
+    Every write (create, update, delete, seed scripts) increments VERSION_KEY in Redis. Readers
+    compare it with the version they loaded (one GET) and reload all templates when it changed.
+    Serialized responses are cached per loaded snapshot (generation), their ETag is derived from the body.
+    """
+
+    _lock = threading.Lock()
+    _version: Optional[int] = None
+    _loaded_at = 0.0
+    # Incremented on every load, identifies the snapshot a response was built from
+    _generation = 0
+    _grouped: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    _serialized: Dict[Tuple[int, str], Tuple[bytes, str]] = {}
+    _redis: Optional[redis.Redis] = None
+
+    @classmethod
+    def _get_redis_connection(cls) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        if cls._redis is None:
+            cls._redis = get_redis_client(REDIS_URL)
+        return cls._redis
+
+    @classmethod
+    def _current_version(cls) -> Optional[int]:
+        try:
+            return int(cls._get_redis_connection().get(VERSION_KEY) or 0)
+        except redis.RedisError as e:
+            logger.warning(f"Prompt template version check failed: {type(e).__name__}: {e}")
+            return None
+
+    @classmethod
+    def get_grouped(cls, db: Session) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Active templates as {category: {action: template dict}}, reloaded if the version changed
+
+        The returned dict is shared - callers must not modify it.
+        """
+        return cls.get_snapshot(db)[0]
+
+    @classmethod
+    def get_snapshot(cls, db: Session) -> Tuple[Dict[str, Dict[str, Dict[str, Any]]], int]:
+        """Grouped templates together with their generation (key for get_serialized)"""
+        version = cls._current_version()
+        with cls._lock:
+            snapshot = (cls._grouped, cls._generation)
+            if version is not None and version == cls._version:
+                return snapshot
+            if version is None and time.monotonic() - cls._loaded_at < FALLBACK_TTL:
+                return snapshot
+
+        # Version is read before loading, a write in between bumps it again and forces the next reload
+        templates = db.query(PromptTemplate).filter(PromptTemplate.active == True).all()
+        grouped: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for template in templates:
+            grouped.setdefault(template.category, {})[template.action] = \
+                PromptTemplateResponse.model_validate(template).model_dump()
+
+        with cls._lock:
+            cls._generation += 1
+            generation = cls._generation
+            cls._grouped = grouped
+            cls._serialized = {}
+            cls._version = version
+            cls._loaded_at = time.monotonic()
+        logger.info(f"Prompt templates loaded (version {version}, {len(templates)} templates)")
+        return grouped, generation
+
+    @classmethod
+    def get_template(cls, db: Session, category: str, action: str) -> Optional[Dict[str, Any]]:
+        """Single active template or None"""
+        return cls.get_grouped(db).get(category, {}).get(action)
+
+    @classmethod
+    def get_serialized(cls, key: str, generation: int, serialize: Callable[[], bytes]) -> Tuple[bytes, str]:
+        """
+        Serialized response body and ETag for a cache key, serialize() runs once per template snapshot
+
+        Args:
+            key: Response identity (e.g. "all", "category:<name>")
+            generation: Generation from get_snapshot() of the templates serialize() builds the body from
+            serialize: Builds the body, only cached if its snapshot is still the current one
+        """
+        cached = cls._serialized.get((generation, key))
+        if cached is not None:
+            return cached
+
+        body = serialize()
+        etag = hashlib.sha1(body).hexdigest()[:16]
+        with cls._lock:
+            # A reload in between replaced the snapshot, the body is still correct for this request only
+            if generation == cls._generation:
+                cls._serialized[(generation, key)] = (body, etag)
+        return body, etag
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Bump the version after a template write, all processes reload on their next read"""
+        with cls._lock:
+            cls._version = None
+            cls._loaded_at = 0.0
+            cls._generation += 1
+            cls._serialized = {}
+        try:
+            version = cls._get_redis_connection().incr(VERSION_KEY)
+            logger.info(f"Prompt template version bumped to {version}")
+        except redis.RedisError as e:
+            logger.warning(f"Prompt template version bump failed, other workers reload within {FALLBACK_TTL}s: "
+                           f"{type(e).__name__}: {e}")
@@ -0,0 +1,253 @@
+"""Queue Status Service - Celery queue depth, active tasks, throughput and wait/run histograms from Redis"""
+import json
+import logging
+import os
+import socket
+import time
+from typing import Dict, Any, List, Optional
+import redis
+from config.settings import REDIS_URL, CELERY_BROKER_URL, QUEUE_METRICS_ENABLED
+from db.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "queue-metrics"
+ENQUEUED_KEY = f"{KEY_PREFIX}:enqueued"
+ACTIVE_KEY = f"{KEY_PREFIX}:active"
+TASK_TYPES_KEY = f"{KEY_PREFIX}:task-types"
+# Kombu Redis transport: delivered but not yet acknowledged messages (reserved + active with acks_late)
+UNACKED_KEY = "unacked"
+# Kombu Redis transport stores priorities 3/6/9 in separate lists next to the queue
+PRIORITY_SUFFIXES = ("", "\x06\x163", "\x06\x166", "\x06\x169")
+
+# Histogram bucket upper bounds in seconds (last bucket: everything above)
+HISTOGRAM_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800)
+# Active entries older than the Celery task_time_limit (+ margin) belong to killed workers
+STALE_ACTIVE_SECONDS = 1800 + 60
+# Published tasks that never started (revoked, purged) are forgotten after one day
+ENQUEUED_RETENTION_SECONDS = 24 * 3600
+THROUGHPUT_WINDOWS_MINUTES = (5, 15, 60)
+HISTOGRAM_WINDOW_HOURS = 24
+
+
+class QueueStatusService:
+    """
+    Load numbers of the Celery pipeline, shared by API and workers via Redis.
+
+    Queue depth and unacknowledged messages are read from the broker. Task lifecycle signals
+    (publish, start, finish) record queue wait and run time per task type in hourly histogram
+    hashes and completions in per-minute counters, so throughput and histograms are rolling
+    windows. Recording never fails a task: Redis errors are logged and ignored.
+    """
+
+    # Start times of tasks running in this worker process (prerun -> postrun)
+    _started: Dict[str, float] = {}
+
+    def __init__(self, redis_url: str = REDIS_URL, broker_url: Optional[str] = CELERY_BROKER_URL):
+        self.redis_url = redis_url
+        self.broker_url = broker_url or redis_url
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+
+    def _get_redis_connection(self) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        return get_redis_client(self.redis_url)
+
+    def _get_broker_connection(self) -> redis.Redis:
+        return get_redis_client(self.broker_url)
+
+    @staticmethod
+    def task_type(task_name: Optional[str]) -> str:
+        return (task_name or "unknown").rsplit(".", 1)[-1]
+
+    @staticmethod
+    def _bucket(seconds: float) -> str:
+        for bound in HISTOGRAM_BUCKETS:
+            if seconds <= bound:
+                return f"le_{bound}"
+        return "le_inf"
+
+    def _observe(self, pipe, task_type: str, kind: str, seconds: float) -> None:
+        key = f"{KEY_PREFIX}:hist:{task_type}:{kind}:{int(time.time() // 3600)}"
+        pipe.hincrby(key, self._bucket(seconds), 1)
+        pipe.hincrby(key, "count", 1)
+        pipe.hincrbyfloat(key, "sum", round(seconds, 3))
+        pipe.expire(key, (HISTOGRAM_WINDOW_HOURS + 1) * 3600)
+
+    def record_enqueued(self, task_id: Optional[str], task_name: Optional[str]) -> None:
+        """Task published (API or beat process)"""
+        if not QUEUE_METRICS_ENABLED or not task_id:
+            return
+        now = time.time()
+        try:
+            pipe = self._get_redis_connection().pipeline(transaction=False)
+            pipe.zadd(ENQUEUED_KEY, {task_id: now})
+            pipe.zremrangebyscore(ENQUEUED_KEY, "-inf", now - ENQUEUED_RETENTION_SECONDS)
+            pipe.sadd(TASK_TYPES_KEY, self.task_type(task_name))
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Queue metrics: publish of {task_id} not recorded: {type(e).__name__}: {e}")
+
+    def record_started(self, task_id: str, task_name: str) -> None:
+        """Task started on a worker, records queue wait"""
+        if not QUEUE_METRICS_ENABLED:
+            return
+        now = time.time()
+        QueueStatusService._started[task_id] = now
+        task_type = self.task_type(task_name)
+        try:
+            r = self._get_redis_connection()
+            pipe = r.pipeline(transaction=False)
+            pipe.zscore(ENQUEUED_KEY, task_id)
+            pipe.zrem(ENQUEUED_KEY, task_id)
+            pipe.hset(ACTIVE_KEY, task_id, json.dumps({"task": task_type, "started_at": now, "worker": self.worker}))
+            enqueued_at = pipe.execute()[0]
+
+            if enqueued_at is not None:
+                pipe = r.pipeline(transaction=False)
+                self._observe(pipe, task_type, "wait", max(0.0, now - enqueued_at))
+                pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Queue metrics: start of {task_id} not recorded: {type(e).__name__}: {e}")
+
+    def record_finished(self, task_id: str, task_name: str, state: Optional[str]) -> None:
+        """Task finished (any state), records run time and completion"""
+        if not QUEUE_METRICS_ENABLED:
+            return
+        started_at = QueueStatusService._started.pop(task_id, None)
+        task_type = self.task_type(task_name)
+        minute = int(time.time() // 60)
+        try:
+            pipe = self._get_redis_connection().pipeline(transaction=False)
+            pipe.hdel(ACTIVE_KEY, task_id)
+            if state != "RETRY":
+                outcome = "done" if state == "SUCCESS" else "failed"
+                counter_key = f"{KEY_PREFIX}:{outcome}:{task_type}:{minute}"
+                pipe.incr(counter_key)
+                pipe.expire(counter_key, (max(THROUGHPUT_WINDOWS_MINUTES) + 5) * 60)
+            if started_at is not None:
+                self._observe(pipe, task_type, "run", time.time() - started_at)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Queue metrics: finish of {task_id} not recorded: {type(e).__name__}: {e}")
+
+    def _active_tasks(self, r: redis.Redis) -> List[Dict[str, Any]]:
+        """Running tasks of all workers, entries of killed workers are removed"""
+        now = time.time()
+        active, stale = [], []
+        for task_id, raw in r.hgetall(ACTIVE_KEY).items():
+            try:
+                entry = json.loads(raw)
+            except ValueError:
+                stale.append(task_id)
+                continue
+            if now - entry.get("started_at", 0) > STALE_ACTIVE_SECONDS:
+                stale.append(task_id)
+                continue
+            active.append({
+                "task_id": task_id.decode(),
+                "task": entry.get("task"),
+                "worker": entry.get("worker"),
+                "running_seconds": round(now - entry["started_at"], 1)
+            })
+        if stale:
+            r.hdel(ACTIVE_KEY, *stale)
+        return sorted(active, key=lambda t: -t["running_seconds"])
+
+    @staticmethod
+    def _summarize_histogram(hourly: List[Dict[bytes, bytes]]) -> Dict[str, Any]:
+        merged: Dict[str, float] = {}
+        for hour in hourly:
+            for field, value in hour.items():
+                merged[field.decode()] = merged.get(field.decode(), 0) + float(value)
+
+        count = int(merged.get("count", 0))
+        buckets = {f"le_{bound}": int(merged.get(f"le_{bound}", 0)) for bound in HISTOGRAM_BUCKETS}
+        buckets["le_inf"] = int(merged.get("le_inf", 0))
+
+        def percentile(p: float) -> Optional[float]:
+            # Upper bound of the bucket containing the percentile (None above the last bound)
+            if not count:
+                return None
+            seen = 0
+            for bound in HISTOGRAM_BUCKETS:
+                seen += buckets[f"le_{bound}"]
+                if seen >= count * p:
+                    return bound
+            return None
+
+        return {
+            "count": count,
+            "avg_seconds": round(merged.get("sum", 0) / count, 2) if count else None,
+            "p50_seconds_le": percentile(0.5),
+            "p95_seconds_le": percentile(0.95),
+            "buckets": buckets
+        }
+
+    def _task_type_metrics(self, r: redis.Redis) -> Dict[str, Any]:
+        task_types = sorted(value.decode() for value in r.smembers(TASK_TYPES_KEY))
+        minute = int(time.time() // 60)
+        hour = int(time.time() // 3600)
+        window = max(THROUGHPUT_WINDOWS_MINUTES)
+        minutes = range(minute - window + 1, minute + 1)
+        hours = range(hour - HISTOGRAM_WINDOW_HOURS + 1, hour + 1)
+
+        pipe = r.pipeline(transaction=False)
+        for task_type in task_types:
+            pipe.mget([f"{KEY_PREFIX}:done:{task_type}:{m}" for m in minutes])
+            pipe.mget([f"{KEY_PREFIX}:failed:{task_type}:{m}" for m in minutes])
+            for kind in ("wait", "run"):
+                for h in hours:
+                    pipe.hgetall(f"{KEY_PREFIX}:hist:{task_type}:{kind}:{h}")
+        results = iter(pipe.execute())
+
+        metrics = {}
+        for task_type in task_types:
+            done = [int(value or 0) for value in next(results)]
+            failed = [int(value or 0) for value in next(results)]
+            wait = [next(results) for _ in hours]
+            run = [next(results) for _ in hours]
+            metrics[task_type] = {
+                "completed": {f"last_{m}m": sum(done[-m:]) for m in THROUGHPUT_WINDOWS_MINUTES},
+                "failed": {f"last_{m}m": sum(failed[-m:]) for m in THROUGHPUT_WINDOWS_MINUTES},
+                "throughput_per_minute": round(sum(done) / window, 3),
+                f"queue_wait_{HISTOGRAM_WINDOW_HOURS}h": self._summarize_histogram(wait),
+                f"run_time_{HISTOGRAM_WINDOW_HOURS}h": self._summarize_histogram(run)
+            }
+        return metrics
+
+    def get_status(self, queues: List[str]) -> Dict[str, Any]:
+        """
+        Queue lengths, reserved and active tasks and per task type metrics
+
+        Args:
+            queues: Celery queue names (broker lists)
+
+        Raises:
+            redis.RedisError: Broker or metrics store unavailable
+        """
+        broker = self._get_broker_connection()
+        pipe = broker.pipeline(transaction=False)
+        for queue in queues:
+            for suffix in PRIORITY_SUFFIXES:
+                pipe.llen(f"{queue}{suffix}")
+        pipe.hlen(UNACKED_KEY)
+        lengths = pipe.execute()
+        unacked = lengths.pop()
+
+        queue_lengths = {
+            queue: sum(lengths[index * len(PRIORITY_SUFFIXES):(index + 1) * len(PRIORITY_SUFFIXES)])
+            for index, queue in enumerate(queues)
+        }
+
+        r = self._get_redis_connection()
+        active = self._active_tasks(r)
+        return {
+            "queued": sum(queue_lengths.values()),
+            "queues": queue_lengths,
+            "reserved": max(0, unacked - len(active)),
+            "active": len(active),
+            "active_tasks": active,
+            "waiting_to_start": r.zcard(ENQUEUED_KEY),
+            "task_types": self._task_type_metrics(r),
+            "metrics_enabled": QUEUE_METRICS_ENABLED
+        }
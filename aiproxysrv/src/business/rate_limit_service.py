@@ -0,0 +1,165 @@
+"""Rate Limit Service - Token bucket per user and route group with daily generation quotas in Redis"""
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Optional
+import redis
+from config.settings import REDIS_URL, RATE_LIMIT_ENABLED, RATE_LIMITS
+from db.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "rate-limit"
+
+# Refill bucket, check daily quota and consume in one call, times from the Redis clock so all workers agree.
+# KEYS = bucket hash, quota counter; ARGV = tokens per second, burst, daily quota (0 = none), seconds until quota reset, cost
+# Returns {allowed, remaining tokens, ms until bucket is full, retry after ms (-1 = cost above burst), quota used}
+RATE_LIMIT_SCRIPT = """
+local rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local quota, quota_reset = tonumber(ARGV[3]), tonumber(ARGV[4])
+local cost = tonumber(ARGV[5])
+local time = redis.call('time')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+local bucket = redis.call('hmget', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+
+local used = 0
+if quota > 0 then
+    used = tonumber(redis.call('get', KEYS[2]) or '0')
+end
+
+local allowed, retry_ms = 0, 0
+if cost > burst then
+    retry_ms = -1
+elseif quota > 0 and used + cost > quota then
+    retry_ms = quota_reset * 1000
+elseif tokens < cost then
+    retry_ms = math.ceil((cost - tokens) * 1000 / rate)
+else
+    allowed = 1
+    tokens = tokens - cost
+    if quota > 0 then
+        used = redis.call('incrby', KEYS[2], cost)
+        if used == cost then
+            redis.call('expire', KEYS[2], quota_reset + 60)
+        end
+    end
+end
+
+redis.call('hset', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('pexpire', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return {allowed, math.floor(tokens), math.ceil((burst - tokens) * 1000 / rate), retry_ms, used}
+"""
+
+
+class RateLimitService:
+    """
+    Per-user throttling for expensive endpoints, shared by all gunicorn workers via Redis.
+
+    Each route group (chat, image, song) has a token bucket (burst size, refill per minute) and
+    optionally a daily quota of generations (UTC day). Bucket and quota are checked and updated
+    by one Lua script, a request costs exactly one Redis round trip. Batch requests are charged
+    one token and one quota unit per item. If Redis is unavailable,
+    requests are passed through without limits.
+    """
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        self._script = None
+
+    def _get_redis_connection(self) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        if self._redis is None:
+            self._redis = get_redis_client(self.redis_url)
+            self._script = self._redis.register_script(RATE_LIMIT_SCRIPT)
+        return self._redis
+
+    @staticmethod
+    def _seconds_until_quota_reset(now: datetime) -> int:
+        tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        return max(1, math.ceil((tomorrow - now).total_seconds()))
+
+    def check(self, user_id: str, group: str, cost: int = 1) -> Optional[Dict[str, Any]]:
+        """
+        Consume cost requests from the user's bucket (and daily quota) of a route group
+
+        Args:
+            user_id: Authenticated user
+            group: Route group (key of RATE_LIMITS)
+            cost: Number of generations of the request (batch size), all or nothing
+
+        Returns:
+            Limit state (allowed, limit, remaining, reset and retry_after in seconds, quota usage,
+            cost_exceeds_limit if the request can never pass)
+            or None if rate limiting is disabled, not configured for the group or Redis is unavailable
+        """
+        limits = RATE_LIMITS.get(group)
+        if not RATE_LIMIT_ENABLED or not limits or not user_id:
+            return None
+
+        burst, per_minute, daily_quota = limits["burst"], limits["per_minute"], limits["daily_quota"]
+        cost = max(1, int(cost))
+        now = datetime.now(timezone.utc)
+        quota_reset = self._seconds_until_quota_reset(now)
+        keys = [f"{KEY_PREFIX}:bucket:{group}:{user_id}",
+                f"{KEY_PREFIX}:quota:{group}:{user_id}:{now:%Y%m%d}"]
+
+        try:
+            self._get_redis_connection()
+            allowed, remaining, reset_ms, retry_ms, quota_used = [
+                int(value) for value in self._script(keys=keys, args=[per_minute / 60, burst, daily_quota, quota_reset, cost])
+            ]
+        except redis.RedisError as e:
+            logger.warning(f"Rate limit check failed, request passed through: {type(e).__name__}: {e}")
+            return None
+
+        state = {
+            "allowed": bool(allowed),
+            "group": group,
+            "limit": burst,
+            "remaining": remaining,
+            "reset": math.ceil(reset_ms / 1000),
+            "retry_after": math.ceil(max(0, retry_ms) / 1000),
+            "cost": cost,
+            "cost_exceeds_limit": retry_ms < 0,
+            "window": math.ceil(burst * 60 / per_minute),
+            "daily_quota": daily_quota or None,
+            "quota_used": quota_used if daily_quota else None,
+            "quota_reset": quota_reset if daily_quota else None
+        }
+        if not allowed:
+            if retry_ms < 0:
+                reason = f"cost {cost} above burst"
+            elif daily_quota and quota_used + cost > daily_quota:
+                reason = "daily quota"
+            else:
+                reason = "rate limit"
+            logger.info(f"Request rejected by {reason} (group {group}, user {user_id}, retry after {state['retry_after']}s)")
+        return state
+
+    @staticmethod
+    def get_headers(state: Dict[str, Any]) -> Dict[str, str]:
+        """
+        RateLimit-* response headers (IETF draft), Limit/Remaining/Reset describe the policy closest to exhaustion
+        """
+        limit, remaining, reset = state["limit"], state["remaining"], state["reset"]
+        policy = f"{state['limit']};w={state['window']}"
+        if state["daily_quota"]:
+            quota_remaining = max(0, state["daily_quota"] - state["quota_used"])
+            policy += f", {state['daily_quota']};w=86400"
+            if quota_remaining <= remaining:
+                limit, remaining, reset = state["daily_quota"], quota_remaining, state["quota_reset"]
+
+        headers = {
+            "RateLimit-Limit": str(limit),
+            "RateLimit-Remaining": str(remaining),
+            "RateLimit-Reset": str(reset),
+            "RateLimit-Policy": policy
+        }
+        if not state["allowed"] and not state["cost_exceeds_limit"]:
+            headers["Retry-After"] = str(max(1, state["retry_after"]))
+        return headers
@@ -0,0 +1,122 @@
+"""Single-Flight Service - Coalesces identical concurrent calls across processes via Redis"""
+import json
+import logging
+import time
+import uuid
+from typing import Any, Callable, Optional, Tuple
+import redis
+from config.settings import REDIS_URL, CHAT_SINGLE_FLIGHT_ENABLED, CHAT_SINGLE_FLIGHT_RESULT_TTL
+from db.redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Followers poll the result key, a connection is only checked out for the duration of one poll
+POLL_INTERVAL = 0.1
+MAX_POLL_INTERVAL = 0.5
+
+# Delete the lock only if it is still ours (it may have expired and been taken over)
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_NO_RESULT = object()
+
+
+class SingleFlightService:
+    """
+    Runs a call once per key while identical calls are in flight.
+
+    The first caller (leader) takes a Redis lock and executes the call, then stores the JSON
+    result for a few seconds under a result key. Concurrent callers (followers) poll the result
+    key and the lock with the shared client and return the leader's result instead of calling
+    upstream themselves. Polling instead of one pubsub connection per waiter keeps a burst of
+    identical requests from draining the connection pool. If the leader dies, its lock expires
+    and a follower takes over.
+    """
+
+    def __init__(self, namespace: str, lock_ttl: int, redis_url: str = REDIS_URL,
+                 result_ttl: int = CHAT_SINGLE_FLIGHT_RESULT_TTL, enabled: bool = CHAT_SINGLE_FLIGHT_ENABLED):
+        self.namespace = namespace
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.enabled = enabled
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        self._release_script = None
+
+    def _get_redis_connection(self) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        if self._redis is None:
+            self._redis = get_redis_client(self.redis_url, socket_timeout=5)
+            self._release_script = self._redis.register_script(RELEASE_LOCK_SCRIPT)
+        return self._redis
+
+    def run(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Execute fn once for all concurrent callers with the same key
+
+        Args:
+            key: Identity of the call (e.g. hash of all request parameters)
+            fn: Call to execute, must return a JSON-serializable value
+
+        Returns:
+            Tuple of (result, shared) - shared is True if the result came from another caller
+        """
+        if not self.enabled:
+            return fn(), False
+
+        lock_key = f"{self.namespace}:lock:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_ttl
+
+        try:
+            r = self._get_redis_connection()
+            while time.monotonic() < deadline:
+                if r.set(lock_key, token, nx=True, ex=self.lock_ttl):
+                    return self._lead(r, key, lock_key, token, fn), False
+
+                result = self._follow(r, key, lock_key, deadline)
+                if result is not _NO_RESULT:
+                    logger.info(f"Single-flight result shared for {self.namespace} key {key[:12]}")
+                    return result, True
+                # Leader finished without result (failed or crashed) - try to take over
+
+            logger.warning(f"Single-flight wait timed out for {self.namespace} key {key[:12]}, calling directly")
+        except redis.RedisError as e:
+            logger.warning(f"Single-flight unavailable, calling directly: {type(e).__name__}: {e}")
+
+        return fn(), False
+
+    def _lead(self, r: redis.Redis, key: str, lock_key: str, token: str, fn: Callable[[], Any]) -> Any:
+        """Execute call, store result for followers and release lock"""
+        try:
+            result = fn()
+            try:
+                payload = json.dumps(result, ensure_ascii=False)
+                r.set(f"{self.namespace}:result:{key}", payload, ex=self.result_ttl)
+            except (redis.RedisError, TypeError, ValueError) as e:
+                logger.warning(f"Single-flight result publish failed: {type(e).__name__}: {e}")
+            return result
+        finally:
+            try:
+                self._release_script(keys=[lock_key], args=[token])
+            except redis.RedisError as e:
+                logger.warning(f"Single-flight lock release failed: {type(e).__name__}: {e}")
+
+    def _follow(self, r: redis.Redis, key: str, lock_key: str, deadline: float) -> Any:
+        """Wait for the leader's result, returns _NO_RESULT if the lock vanished without one"""
+        result_key = f"{self.namespace}:result:{key}"
+        interval = POLL_INTERVAL
+        while time.monotonic() < deadline:
+            # Result and lock in one round trip (MGET), the connection goes straight back to the pool
+            raw, locked = r.mget(result_key, lock_key)
+            if raw is not None:
+                return json.loads(raw)
+            if locked is None:
+                return _NO_RESULT
+            time.sleep(interval)
+            interval = min(interval * 2, MAX_POLL_INTERVAL)
+        return _NO_RESULT
@@ -0,0 +1,206 @@
+"""Token Auth Service - Cached JWT verification with a Redis-backed revocation list"""
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import redis
+from config.settings import REDIS_URL, JWT_CACHE_MAX_ENTRIES, JWT_REVOCATION_REFRESH_SECONDS
+from db.redis_client import get_redis_client
+from db.user_service import UserService
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY = "auth:revoked"
+REVOKED_VERSION_KEY = "auth:revoked:version"
+BLOOM_FALSE_POSITIVE_RATE = 0.01
+
+
+class BloomFilter:
+    """Compact set membership test without false negatives, sized for an expected capacity"""
+
+    def __init__(self, capacity: int, false_positive_rate: float = BLOOM_FALSE_POSITIVE_RATE):
+        capacity = max(capacity, 1024)
+        self.size = int(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes):
+        # Double hashing on the (already uniform) token digest
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, digest: bytes) -> None:
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class TokenAuthService:
+    """
+    Fast path for `jwt_required`.
+
+    Verified tokens are kept in a bounded per-process LRU (key: SHA-256 of the token) until their
+    `exp`, so signature checks run once per token and worker. Logout adds the token digest to a
+    Redis sorted set (score = exp). Each worker mirrors it into a bloom filter and reloads it when
+    the revocation version changed, checked every JWT_REVOCATION_REFRESH_SECONDS. Only bloom hits
+    are confirmed in Redis, normal requests stay in memory.
+    """
+
+    _lock = threading.Lock()
+    _verified: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+    _bloom = BloomFilter(0)
+    _revocation_version: Optional[int] = None
+    _next_refresh = 0.0
+    _stats = {"requests": 0, "cache_hits": 0, "verified": 0, "rejected": 0, "revoked": 0, "total_ms": 0.0}
+
+    def __init__(self, redis_url: str = REDIS_URL):
+        self.redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        self.user_service = UserService()
+
+    def _get_redis_connection(self) -> redis.Redis:
+        """Get shared Redis client (process-wide pool)"""
+        if self._redis is None:
+            self._redis = get_redis_client(self.redis_url)
+        return self._redis
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Verify token, served from the LRU when possible
+
+        Returns:
+            JWT payload or None if invalid, expired or revoked
+        """
+        started = time.perf_counter()
+        try:
+            return self._verify(token)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with TokenAuthService._lock:
+                TokenAuthService._stats["requests"] += 1
+                TokenAuthService._stats["total_ms"] += elapsed_ms
+
+    def _verify(self, token: str) -> Optional[Dict[str, Any]]:
+        cls = TokenAuthService
+        digest = self._digest(token)
+        self._refresh_revocations()
+
+        if self._is_revoked(digest):
+            with cls._lock:
+                cls._verified.pop(digest, None)
+                cls._stats["revoked"] += 1
+            return None
+
+        now = time.time()
+        with cls._lock:
+            cached = cls._verified.get(digest)
+            if cached is not None:
+                if cached[1] > now:
+                    cls._verified.move_to_end(digest)
+                    cls._stats["cache_hits"] += 1
+                    return cached[0]
+                del cls._verified[digest]
+
+        payload = self.user_service.verify_jwt_token(token)
+        with cls._lock:
+            if payload is None:
+                cls._stats["rejected"] += 1
+                return None
+            cls._stats["verified"] += 1
+            cls._verified[digest] = (payload, float(payload.get("exp", now)))
+            while len(cls._verified) > JWT_CACHE_MAX_ENTRIES:
+                cls._verified.popitem(last=False)
+        return payload
+
+    def _is_revoked(self, digest: bytes) -> bool:
+        if digest not in TokenAuthService._bloom:
+            return False
+        # Bloom hit (revoked or false positive) - confirm in Redis
+        try:
+            return self._get_redis_connection().zscore(REVOKED_KEY, digest.hex()) is not None
+        except redis.RedisError as e:
+            logger.warning(f"Token revocation check failed, rejecting bloom hit: {type(e).__name__}: {e}")
+            return True
+
+    def _refresh_revocations(self) -> None:
+        """Reload the revocation bloom filter if the version in Redis changed (at most once per interval)"""
+        cls = TokenAuthService
+        now = time.monotonic()
+        if now < cls._next_refresh:
+            return
+        cls._next_refresh = now + JWT_REVOCATION_REFRESH_SECONDS
+
+        try:
+            r = self._get_redis_connection()
+            version = int(r.get(REVOKED_VERSION_KEY) or 0)
+            if version == cls._revocation_version:
+                return
+            r.zremrangebyscore(REVOKED_KEY, "-inf", time.time())
+            revoked = r.zrangebyscore(REVOKED_KEY, time.time(), "+inf")
+        except redis.RedisError as e:
+            logger.warning(f"Token revocation list refresh failed: {type(e).__name__}: {e}")
+            return
+
+        bloom = BloomFilter(len(revoked) * 2)
+        for member in revoked:
+            bloom.add(bytes.fromhex(member.decode()))
+        with cls._lock:
+            cls._bloom = bloom
+            cls._revocation_version = version
+        logger.info(f"Token revocation list loaded (version {version}, {len(revoked)} tokens)")
+
+    def revoke(self, token: str) -> bool:
+        """
+        Revoke a token until it expires (logout)
+
+        Returns:
+            False if the token is invalid or already expired (nothing to revoke)
+        """
+        payload = self.user_service.verify_jwt_token(token)
+        if payload is None:
+            return False
+
+        digest = self._digest(token)
+        r = self._get_redis_connection()
+        pipe = r.pipeline(transaction=False)
+        pipe.zadd(REVOKED_KEY, {digest.hex(): float(payload.get("exp", time.time()))})
+        pipe.incr(REVOKED_VERSION_KEY)
+        pipe.execute()
+
+        # Effective immediately in this worker, other workers follow with the next refresh
+        with TokenAuthService._lock:
+            TokenAuthService._bloom.add(digest)
+            TokenAuthService._verified.pop(digest, None)
+        logger.info(f"Token revoked for user {payload.get('user_id')}")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Auth fast path statistics of this worker process"""
+        cls = TokenAuthService
+        with cls._lock:
+            stats = dict(cls._stats)
+            cached_tokens = len(cls._verified)
+        requests = stats.pop("requests")
+        total_ms = stats.pop("total_ms")
+        return {
+            "pid": os.getpid(),
+            "requests": requests,
+            **stats,
+            "cache_hit_ratio": round(stats["cache_hits"] / requests, 3) if requests else None,
+            "avg_auth_ms": round(total_ms / requests, 3) if requests else None,
+            "cached_tokens": cached_tokens,
+            "max_cached_tokens": JWT_CACHE_MAX_ENTRIES,
+            "revocation_version": cls._revocation_version,
+            "revocation_refresh_seconds": JWT_REVOCATION_REFRESH_SECONDS
+        }
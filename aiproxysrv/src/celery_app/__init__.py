@@ -2,8 +2,8 @@
 Celery App Package
 Exportiert die wichtigsten Objekte für einfachen Import
 """
-from .celery_config import celery_app
-from .tasks import generate_song_task, generate_instrumental_task
+from .celery_config import celery_app, MAINTENANCE_QUEUE
+from .tasks import generate_song_task, generate_instrumental_task, reconcile_image_storage_task, compact_task_results_task
 from .slot_manager import get_slot_status
 
-__all__ = ['celery_app', 'generate_song_task', 'generate_instrumental_task', 'get_slot_status']
+__all__ = ['celery_app', 'MAINTENANCE_QUEUE', 'generate_song_task', 'generate_instrumental_task', 'reconcile_image_storage_task', 'compact_task_results_task', 'get_slot_status']
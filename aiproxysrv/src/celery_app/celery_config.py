@@ -3,11 +3,18 @@ Celery Konfiguration - Zentraler Import-Point für Celery
 """
 import logging
 from celery import Celery
-from celery.signals import setup_logging, worker_process_init
-from config.settings import CELERY_BROKER_URL, CELERY_RESULT_BACKEND, LOG_LEVEL
+from celery.signals import setup_logging, worker_process_init, before_task_publish, task_prerun, task_postrun
+from config.settings import (
+    CELERY_BROKER_URL, CELERY_RESULT_BACKEND, LOG_LEVEL,
+    CELERY_RESULT_EXPIRES, CELERY_RESULT_COMPACTION_INTERVAL, CELERY_RESULT_COMPACTION_BATCH_SIZE
+)
 
 # IMPORTANT: Import logger FIRST to initialize loguru before Celery sets up its logging
 from utils.logger import CeleryInterceptHandler, logger
+from business.queue_status_service import QueueStatusService
+
+# Lange Wartungs-Tasks laufen auf einem eigenen Worker, damit sie die Song-Generierung nicht blockieren
+MAINTENANCE_QUEUE = "maintenance"
 
 # Celery App erstellen
 celery_app = Celery(
@@ -25,12 +32,32 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,
     task_acks_late=True,
 
+    # Image-Reconciliation scannt den gesamten Storage - nur der Maintenance-Worker (-Q maintenance) bearbeitet sie
+    task_routes={
+        "celery_app.tasks.reconcile_image_storage_task": {"queue": MAINTENANCE_QUEUE},
+    },
+
+    # Task-Resultate in Redis laufen nach CELERY_RESULT_EXPIRES ab (TTL pro Key)
+    result_expires=CELERY_RESULT_EXPIRES,
+
     # Tasks automatisch entdecken
     include=['celery_app.tasks'],
     # Tasks auch explizit importieren beim App-Start
     imports=['celery_app.tasks']
 )
 
+# Periodische Tasks (Worker mit --beat starten)
+if CELERY_RESULT_COMPACTION_INTERVAL > 0:
+    celery_app.conf.beat_schedule = {
+        "compact-task-results": {
+            "task": "celery_app.tasks.compact_task_results_task",
+            "schedule": CELERY_RESULT_COMPACTION_INTERVAL,
+            "kwargs": {"batch_size": CELERY_RESULT_COMPACTION_BATCH_SIZE},
+            # Keine Duplikate aufstauen, wenn der Worker länger mit einer Song-Generierung beschäftigt ist
+            "options": {"expires": CELERY_RESULT_COMPACTION_INTERVAL}
+        }
+    }
+
 
 def _configure_loguru_for_celery():
     """Configure all Celery loggers to use loguru"""
@@ -68,3 +95,23 @@ def configure_celery_logging(**kwargs):
 def configure_worker_logging(**kwargs):
     """Configure logging for each worker process"""
     _configure_loguru_for_celery()
+
+
+# Queue-Metriken: Wartezeit, Laufzeit und Durchsatz pro Task-Typ (gemeinsam in Redis)
+queue_metrics = QueueStatusService()
+
+
+@before_task_publish.connect
+def record_task_published(sender=None, headers=None, **kwargs):
+    """Wird im publizierenden Prozess aufgerufen (API, Beat, Retry)"""
+    queue_metrics.record_enqueued((headers or {}).get("id"), sender)
+
+
+@task_prerun.connect
+def record_task_started(task_id=None, task=None, **kwargs):
+    queue_metrics.record_started(task_id, task.name if task else None)
+
+
+@task_postrun.connect
+def record_task_finished(task_id=None, task=None, state=None, **kwargs):
+    queue_metrics.record_finished(task_id, task.name if task else None, state)
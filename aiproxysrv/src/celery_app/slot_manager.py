@@ -1,39 +1,63 @@
 """
-Simple Slot Management für MUREKA API
+Slot Management für MUREKA API - Leases in Redis, damit API und alle Worker denselben Stand sehen
 """
 import time
+import redis
+from config.settings import REDIS_URL, MUREKA_MAX_CONCURRENT_REQUESTS
+from db.redis_client import get_redis_client
 from utils.logger import logger
 
-# Global state - in Produktion sollte dies über Redis/DB laufen
-current_requests = 0
-active_tasks = {}
+LEASES_KEY = "mureka-slots:leases"
+# Leases abgestürzter Worker laufen nach dem Celery task_time_limit (+ Reserve) ab
+LEASE_SECONDS = 1800 + 60
+
+# Abgelaufene Leases entfernen, dann atomar prüfen und belegen: KEYS = leases, ARGV = task_id, now, expires, limit
+ACQUIRE_SCRIPT = """
+redis.call('zremrangebyscore', KEYS[1], '-inf', ARGV[2])
+if redis.call('zscore', KEYS[1], ARGV[1]) then
+    redis.call('zadd', KEYS[1], ARGV[3], ARGV[1])
+    return 1
+end
+if redis.call('zcard', KEYS[1]) >= tonumber(ARGV[4]) then
+    return 0
+end
+redis.call('zadd', KEYS[1], ARGV[3], ARGV[1])
+return 1
+"""
+
+_acquire_script = None
+
+
+def _get_redis_connection() -> redis.Redis:
+    """Get shared Redis client (process-wide pool)"""
+    global _acquire_script
+    r = get_redis_client(REDIS_URL)
+    if _acquire_script is None:
+        _acquire_script = r.register_script(ACQUIRE_SCRIPT)
+    return r
 
 
 def acquire_mureka_slot(task_id: str) -> bool:
     """Versucht einen MUREKA Slot zu akquirieren"""
-    global current_requests
     try:
-        if current_requests >= 1:
-            logger.debug("MUREKA slot not available", extra={"task_id": task_id, "current_requests": current_requests})
+        _get_redis_connection()
+        now = time.time()
+        if not _acquire_script(keys=[LEASES_KEY], args=[task_id, now, now + LEASE_SECONDS, MUREKA_MAX_CONCURRENT_REQUESTS]):
+            logger.debug("MUREKA slot not available", extra={"task_id": task_id})
             return False
-        current_requests += 1
-        active_tasks[task_id] = time.time()
-        logger.info("MUREKA slot acquired", extra={"task_id": task_id, "current_requests": current_requests})
+        logger.info("MUREKA slot acquired", extra={"task_id": task_id})
+        return True
+    except redis.RedisError as e:
+        # Ohne Redis kein gemeinsamer Zustand, der Worker (concurrency=1) begrenzt dann selbst
+        logger.warning("MUREKA slot state unavailable, continuing without slot", extra={"task_id": task_id, "error": str(e)})
         return True
-    except Exception as e:
-        logger.error("Error acquiring MUREKA slot", extra={"task_id": task_id, "error": str(e)})
-        return False
 
 
 def release_mureka_slot(task_id: str):
     """Gibt einen MUREKA Slot frei"""
-    global current_requests
     try:
-        if current_requests > 0:
-            current_requests -= 1
-        if task_id in active_tasks:
-            del active_tasks[task_id]
-        logger.info("MUREKA slot released", extra={"task_id": task_id, "current_requests": current_requests})
+        _get_redis_connection().zrem(LEASES_KEY, task_id)
+        logger.info("MUREKA slot released", extra={"task_id": task_id})
     except Exception as e:
         logger.error("Error releasing MUREKA slot", extra={"task_id": task_id, "error": str(e)})
 
@@ -50,10 +74,18 @@ def wait_for_mureka_slot(task_id: str, max_wait: int = 3600) -> bool:
 
 
 def get_slot_status() -> dict:
-    """Gibt den aktuellen Slot-Status zurück"""
+    """Gibt den aktuellen Slot-Status zurück (gemeinsamer Zustand aus Redis)"""
+    now = time.time()
+    r = _get_redis_connection()
+    r.zremrangebyscore(LEASES_KEY, "-inf", now)
+    leases = r.zrange(LEASES_KEY, 0, -1, withscores=True)
     return {
-        "current_requests": current_requests,
-        "max_concurrent": 1,
-        "active_tasks": len(active_tasks),
-        "available": current_requests < 1
+        "current_requests": len(leases),
+        "max_concurrent": MUREKA_MAX_CONCURRENT_REQUESTS,
+        "active_tasks": len(leases),
+        "available": len(leases) < MUREKA_MAX_CONCURRENT_REQUESTS,
+        "leases": [
+            {"task_id": task_id.decode(), "held_seconds": round(now - (expires - LEASE_SECONDS), 1)}
+            for task_id, expires in leases
+        ]
     }
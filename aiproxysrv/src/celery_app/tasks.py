@@ -11,6 +11,7 @@ from .slot_manager import wait_for_mureka_slot, release_mureka_slot
 from mureka import start_mureka_generation, wait_for_mureka_completion, start_mureka_instrumental_generation, wait_for_mureka_instrumental_completion
 from mureka.handlers import handle_http_error
 from db.song_service import song_service
+from config.settings import CELERY_RESULT_EXPIRES, CELERY_RESULT_COMPACTION_BATCH_SIZE
 from utils.logger import logger
 
 
@@ -321,4 +322,38 @@ def generate_instrumental_task(self, payload: dict) -> dict:
         try:
             release_mureka_slot(task_id)
         except Exception as e:
-            logger.error("Error releasing slot", extra={"task_id": task_id, "error": str(e)})
\ No newline at end of file
+            logger.error("Error releasing slot", extra={"task_id": task_id, "error": str(e)})
+
+@celery_app.task(bind=True)
+def reconcile_image_storage_task(self, fix_orphans: bool = False, fix_dangling: bool = False, batch_size: int = 1000) -> dict:
+    """Celery Task für Abgleich von Image-Dateien und Datenbank"""
+    from business.image_reconciliation_service import ImageReconciliationService
+
+    task_id = self.request.id
+    logger.info("Starting image reconciliation task", extra={
+        "task_id": task_id, "fix_orphans": fix_orphans, "fix_dangling": fix_dangling
+    })
+
+    def report_progress(report: dict):
+        self.update_state(state='PROGRESS', meta=report)
+
+    report = ImageReconciliationService().reconcile(
+        fix_orphans=fix_orphans,
+        fix_dangling=fix_dangling,
+        batch_size=batch_size,
+        progress_callback=report_progress
+    )
+
+    logger.info("Image reconciliation task completed", extra={
+        "task_id": task_id,
+        "orphan_files": report["orphan_files"],
+        "dangling_rows": report["dangling_rows"]
+    })
+    return report
+
+
+@celery_app.task(bind=True)
+def compact_task_results_task(self, batch_size: int = CELERY_RESULT_COMPACTION_BATCH_SIZE) -> dict:
+    """Celery Task zum Kompaktieren der Task-Resultate in Redis (beat-gesteuert)"""
+    logger.info("Starting task result compaction", extra={"task_id": self.request.id, "batch_size": batch_size})
+    return song_service.compact_task_results(batch_size=batch_size, result_expires=CELERY_RESULT_EXPIRES)
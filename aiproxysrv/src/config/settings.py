@@ -11,6 +11,13 @@ load_dotenv()
 # --------------------------------------------------
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
+# Task results expire after this many seconds (Redis TTL), older keys without TTL get it on compaction
+CELERY_RESULT_EXPIRES = int(os.getenv("CELERY_RESULT_EXPIRES", str(7 * 24 * 3600)))
+# Beat-scheduled compaction: unlink results of songs stored in Postgres (interval in seconds, 0 = off)
+CELERY_RESULT_COMPACTION_INTERVAL = int(os.getenv("CELERY_RESULT_COMPACTION_INTERVAL", "3600"))
+CELERY_RESULT_COMPACTION_BATCH_SIZE = int(os.getenv("CELERY_RESULT_COMPACTION_BATCH_SIZE", "500"))
+# Queue wait/run time histograms and throughput per task type (recorded by task signals in Redis)
+QUEUE_METRICS_ENABLED = os.getenv("QUEUE_METRICS_ENABLED", "true").lower() == "true"
 
 # --------------------------------------------------
 # MUREKA Config
@@ -25,6 +32,8 @@ MUREKA_BILLING_URL = os.getenv("MUREKA_BILLING_URL")
 MUREKA_TIMEOUT = int(os.getenv("MUREKA_TIMEOUT", "30"))
 MUREKA_POLL_INTERVAL = int(os.getenv("MUREKA_POLL_INTERVAL", "15"))
 MUREKA_MAX_POLL_ATTEMPTS = int(os.getenv("MUREKA_MAX_POLL_ATTEMPTS", "240"))
+# Concurrent MUREKA generations across all workers (slot leases in Redis)
+MUREKA_MAX_CONCURRENT_REQUESTS = int(os.getenv("MUREKA_MAX_CONCURRENT_REQUESTS", "1"))
 
 # Adaptive Polling Intervals
 MUREKA_POLL_INTERVAL_SHORT = int(os.getenv("MUREKA_POLL_INTERVAL_SHORT", "5"))
@@ -37,6 +46,14 @@ MUREKA_POLL_INTERVAL_LONG = int(os.getenv("MUREKA_POLL_INTERVAL_LONG", "30"))
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_URL = os.getenv("OPENAI_URL")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL")
+# Max concurrent OpenAI calls per batch request
+OPENAI_BATCH_MAX_CONCURRENCY = int(os.getenv("OPENAI_BATCH_MAX_CONCURRENCY", "3"))
+# Max concurrent OpenAI image calls across all workers and requests (keep below the account's images/min
+# rate limit) and how long a call waits for a free slot (seconds)
+OPENAI_MAX_CONCURRENT_REQUESTS = int(os.getenv("OPENAI_MAX_CONCURRENT_REQUESTS", "3"))
+OPENAI_SLOT_MAX_WAIT = int(os.getenv("OPENAI_SLOT_MAX_WAIT", "60"))
+# Max number of items accepted by a single batch request
+OPENAI_BATCH_MAX_ITEMS = int(os.getenv("OPENAI_BATCH_MAX_ITEMS", "10"))
 
 # --------------------------------------------------
 # Image URL Config
@@ -70,17 +87,111 @@ IMAGES_DIR = os.getenv("IMAGES_DIR", "./images" if DEBUG else "/images")
 # Control if physical files should be deleted (defaults to true if not set)
 # Only set to false in special cases where you want to keep files but delete DB records
 DELETE_PHYSICAL_FILES = os.getenv("DELETE_PHYSICAL_FILES", "true").lower() == "true"
+# Prompt-hash result cache: reuse an existing image for the same normalized prompt,
+# size and model instead of calling OpenAI again (requests can override with reuse=true/false)
+IMAGE_REUSE_DEFAULT = os.getenv("IMAGE_REUSE_DEFAULT", "false").lower() == "true"
+# Only images younger than this window are reused (in hours)
+IMAGE_REUSE_MAX_AGE_HOURS = int(os.getenv("IMAGE_REUSE_MAX_AGE_HOURS", "168"))
+# Perceptual-hash similarity index: how often to check the DB for changes and max index age (seconds)
+IMAGE_SIMILARITY_CHECK_INTERVAL = int(os.getenv("IMAGE_SIMILARITY_CHECK_INTERVAL", "30"))
+IMAGE_SIMILARITY_MAX_INDEX_AGE = int(os.getenv("IMAGE_SIMILARITY_MAX_INDEX_AGE", "600"))
+
+# --------------------------------------------------
+# File Download Config
+# --------------------------------------------------
+# Read/write buffer for streaming downloads (bytes)
+DOWNLOAD_BUFFER_SIZE = int(os.getenv("DOWNLOAD_BUFFER_SIZE", str(1024 * 1024)))
+# Resume attempts (HTTP Range) for interrupted large downloads
+DOWNLOAD_MAX_RETRIES = int(os.getenv("DOWNLOAD_MAX_RETRIES", "3"))
+# Maximum accepted file sizes (bytes)
+DOWNLOAD_MAX_IMAGE_BYTES = int(os.getenv("DOWNLOAD_MAX_IMAGE_BYTES", str(20 * 1024 * 1024)))
 
 # --------------------------------------------------
 # Redis Config (falls verwendet)
 # --------------------------------------------------
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Shared connection pools per process: socket timeouts (seconds), max connections per pool, how long a
+# request waits for a free pooled connection (seconds) and idle time after which a connection is pinged before reuse
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "2"))
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "2"))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
 
 # --------------------------------------------------
 # Ollama Config
 # --------------------------------------------------
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://10.0.1.120:11434")
 OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "60"))
+# Multiple Ollama hosts (comma separated), chat requests go to the least loaded healthy host
+OLLAMA_URLS = [url.strip() for url in os.getenv("OLLAMA_URLS", OLLAMA_URL).split(",") if url.strip()]
+OLLAMA_HEALTH_CHECK_INTERVAL = int(os.getenv("OLLAMA_HEALTH_CHECK_INTERVAL", "15"))
+# A host is skipped for OLLAMA_BACKEND_COOLDOWN seconds after this many consecutive failures
+OLLAMA_FAILURE_THRESHOLD = int(os.getenv("OLLAMA_FAILURE_THRESHOLD", "3"))
+OLLAMA_BACKEND_COOLDOWN = int(os.getenv("OLLAMA_BACKEND_COOLDOWN", "30"))
+# Warmup: preload models of active prompt templates and keep them in memory (keep_alive as Ollama duration,
+# overrides as "model=duration,model=duration"). Interval must be shorter than keep_alive.
+OLLAMA_WARMUP_ENABLED = os.getenv("OLLAMA_WARMUP_ENABLED", "true").lower() == "true"
+OLLAMA_WARMUP_INTERVAL = int(os.getenv("OLLAMA_WARMUP_INTERVAL", "600"))
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_KEEP_ALIVE_OVERRIDES = {
+    name.strip(): duration.strip()
+    for name, duration in (
+        entry.rsplit("=", 1) for entry in os.getenv("OLLAMA_KEEP_ALIVE_OVERRIDES", "").split(",") if "=" in entry
+    )
+}
+# Admission control: concurrent requests per model (overrides as "model=limit,model=limit"),
+# bounded wait queue with fair ordering across users, 429 + Retry-After when full
+OLLAMA_ADMISSION_ENABLED = os.getenv("OLLAMA_ADMISSION_ENABLED", "true").lower() == "true"
+OLLAMA_MODEL_CONCURRENCY = int(os.getenv("OLLAMA_MODEL_CONCURRENCY", "1"))
+OLLAMA_MODEL_CONCURRENCY_OVERRIDES = {
+    name.strip(): int(limit)
+    for name, limit in (
+        entry.rsplit("=", 1) for entry in os.getenv("OLLAMA_MODEL_CONCURRENCY_OVERRIDES", "").split(",") if "=" in entry
+    )
+}
+OLLAMA_QUEUE_MAX_SIZE = int(os.getenv("OLLAMA_QUEUE_MAX_SIZE", "10"))
+# Maximum time a request waits in the queue before it is rejected (seconds)
+OLLAMA_QUEUE_MAX_WAIT = int(os.getenv("OLLAMA_QUEUE_MAX_WAIT", "120"))
+# Response cache for deterministic chat requests (temperature 0 or explicit cache=true)
+CHAT_CACHE_ENABLED = os.getenv("CHAT_CACHE_ENABLED", "true").lower() == "true"
+CHAT_CACHE_TTL = int(os.getenv("CHAT_CACHE_TTL", str(7 * 24 * 3600)))
+# Size bound: least recently used entries are evicted beyond this count, larger responses are not cached
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "5000"))
+CHAT_CACHE_MAX_ENTRY_BYTES = int(os.getenv("CHAT_CACHE_MAX_ENTRY_BYTES", str(64 * 1024)))
+# Batch chat: parallel generations per batch request and max inputs per batch
+CHAT_BATCH_MAX_CONCURRENCY = int(os.getenv("CHAT_BATCH_MAX_CONCURRENCY", "2"))
+CHAT_BATCH_MAX_ITEMS = int(os.getenv("CHAT_BATCH_MAX_ITEMS", "50"))
+# Persist Ollama timing stats per request (chat_inference_metrics table)
+CHAT_METRICS_ENABLED = os.getenv("CHAT_METRICS_ENABLED", "true").lower() == "true"
+# Requests with a model load time above this count as cold load (ms)
+CHAT_METRICS_COLD_LOAD_MS = int(os.getenv("CHAT_METRICS_COLD_LOAD_MS", "1000"))
+# Conversation sessions: Ollama context kept in Redis per session (idle TTL in seconds, max context size in tokens)
+CHAT_SESSION_TTL = int(os.getenv("CHAT_SESSION_TTL", "3600"))
+CHAT_SESSION_MAX_CONTEXT_TOKENS = int(os.getenv("CHAT_SESSION_MAX_CONTEXT_TOKENS", "16384"))
+# Single-flight: identical concurrent chat requests share one Ollama call (across workers via Redis)
+CHAT_SINGLE_FLIGHT_ENABLED = os.getenv("CHAT_SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+# How long the leader's result stays readable for late followers (seconds)
+CHAT_SINGLE_FLIGHT_RESULT_TTL = int(os.getenv("CHAT_SINGLE_FLIGHT_RESULT_TTL", "5"))
+
+# --------------------------------------------------
+# Rate Limiting Config
+# --------------------------------------------------
+# Token bucket per user and route group plus daily generation quota (UTC day, 0 = unlimited),
+# as "group=burst/per_minute/daily_quota,..." - groups not listed keep their defaults.
+# Batches are charged per item and must fit into one burst, so the chat and image bursts default to the batch maximums
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMITS = {
+    group.strip(): dict(zip(("burst", "per_minute", "daily_quota"), (int(value) for value in limits.split("/"))))
+    for group, limits in (
+        entry.split("=", 1) for entry in
+        f"chat=50/30/0,image=10/10/200,song=3/4/50,{os.getenv('RATE_LIMITS', '')}".split(",") if "=" in entry
+    )
+}
+# A batch above the burst could never pass the limiter, so smaller bursts also cap the accepted batch size
+if RATE_LIMIT_ENABLED:
+    CHAT_BATCH_MAX_ITEMS = min(CHAT_BATCH_MAX_ITEMS, RATE_LIMITS["chat"]["burst"])
+    OPENAI_BATCH_MAX_ITEMS = min(OPENAI_BATCH_MAX_ITEMS, RATE_LIMITS["image"]["burst"])
 
 # --------------------------------------------------
 # JWT Authentication Config
@@ -88,6 +199,19 @@ OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "60"))
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
+# Verified tokens cached per worker until exp (LRU bound), revocations (logout) reach all workers within the refresh interval
+JWT_CACHE_MAX_ENTRIES = int(os.getenv("JWT_CACHE_MAX_ENTRIES", "10000"))
+JWT_REVOCATION_REFRESH_SECONDS = int(os.getenv("JWT_REVOCATION_REFRESH_SECONDS", "5"))
+# bcrypt cost factor, existing hashes with another cost are rehashed on the next successful login
+PASSWORD_BCRYPT_ROUNDS = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+# Hashing threads per worker process and jobs allowed to wait for them (more are rejected with 429)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "8"))
+# Concurrent password operations across all workers in total (below the sync worker count, so logins
+# cannot occupy every API worker), per account and per client IP
+PASSWORD_HASH_MAX_CONCURRENT = int(os.getenv("PASSWORD_HASH_MAX_CONCURRENT", "2"))
+PASSWORD_HASH_MAX_PER_ACCOUNT = int(os.getenv("PASSWORD_HASH_MAX_PER_ACCOUNT", "1"))
+PASSWORD_HASH_MAX_PER_IP = int(os.getenv("PASSWORD_HASH_MAX_PER_IP", "2"))
 
 # --------------------------------------------------
 # Database Config
@@ -0,0 +1,80 @@
+"""Chat metrics database service layer"""
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+from sqlalchemy import func, case
+from db.database import SessionLocal
+from db.models import ChatInferenceMetric
+from utils.logger import logger
+
+
+class ChatMetricsService:
+    """Service class for chat inference metrics"""
+
+    @staticmethod
+    def record_inference(model: str, metrics: Dict[str, Any], category: Optional[str] = None,
+                         action: Optional[str] = None, input_chars: Optional[int] = None,
+                         prompt_chars: Optional[int] = None, streamed: bool = False) -> bool:
+        """
+        Store metrics of one Ollama call
+
+        Args:
+            metrics: Derived timing values (total_duration_ms, load_duration_ms, prompt_eval_count,
+                     prompt_eval_duration_ms, eval_count, eval_duration_ms, tokens_per_second, cold_load)
+
+        Returns:
+            True if stored, False on error (metrics must never fail the request)
+        """
+        db = SessionLocal()
+        try:
+            db.add(ChatInferenceMetric(
+                model=model,
+                category=category,
+                action=action,
+                input_chars=input_chars,
+                prompt_chars=prompt_chars,
+                streamed=streamed,
+                **metrics
+            ))
+            db.commit()
+            return True
+        except Exception as e:
+            db.rollback()
+            logger.warning("chat_metrics_record_failed", model=model, error=str(e), error_type=type(e).__name__)
+            return False
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_aggregates(since: datetime, by_template: bool = False) -> List[Dict[str, Any]]:
+        """
+        Aggregate metrics since the given time, grouped by model (and template if requested)
+
+        Returns:
+            List of dicts with request count, latency percentiles, tokens/sec and cold loads
+        """
+        db = SessionLocal()
+        try:
+            group_columns = [ChatInferenceMetric.model]
+            if by_template:
+                group_columns += [ChatInferenceMetric.category, ChatInferenceMetric.action]
+
+            latency = ChatInferenceMetric.total_duration_ms
+            rows = db.query(
+                *group_columns,
+                func.count(ChatInferenceMetric.id).label('requests'),
+                func.percentile_cont(0.5).within_group(latency).label('latency_p50_ms'),
+                func.percentile_cont(0.95).within_group(latency).label('latency_p95_ms'),
+                func.percentile_cont(0.5).within_group(ChatInferenceMetric.tokens_per_second).label('tokens_per_second_p50'),
+                func.avg(ChatInferenceMetric.tokens_per_second).label('tokens_per_second_avg'),
+                func.sum(case((ChatInferenceMetric.cold_load.is_(True), 1), else_=0)).label('cold_loads'),
+                func.avg(ChatInferenceMetric.load_duration_ms).label('load_duration_avg_ms'),
+                func.avg(ChatInferenceMetric.prompt_eval_count).label('prompt_tokens_avg'),
+                func.avg(ChatInferenceMetric.eval_count).label('completion_tokens_avg'),
+                func.avg(ChatInferenceMetric.input_chars).label('input_chars_avg')
+            ).filter(
+                ChatInferenceMetric.created_at >= since
+            ).group_by(*group_columns).order_by(func.count(ChatInferenceMetric.id).desc()).all()
+
+            return [row._asdict() for row in rows]
+        finally:
+            db.close()
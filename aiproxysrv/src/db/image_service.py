@@ -1,5 +1,7 @@
 """Image database service layer"""
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from db.database import SessionLocal
 from db.models import GeneratedImage
@@ -18,10 +20,14 @@ class ImageService:
         local_url: str,
         model_used: str,
         prompt_hash: str,
-        title: Optional[str] = None
+        title: Optional[str] = None,
+        file_metadata: Optional[Dict[str, Any]] = None
     ) -> Optional[GeneratedImage]:
         """
         Save generated image metadata to database
+
+        Args:
+            file_metadata: Optional extracted file metadata (width, height, file_size, dominant_color, phash)
         
         Returns:
             GeneratedImage instance if successful, None if failed
@@ -36,7 +42,8 @@ class ImageService:
                 local_url=local_url,
                 model_used=model_used,
                 prompt_hash=prompt_hash,
-                title=title
+                title=title,
+                **(file_metadata or {})
             )
             db.add(generated_image)
             db.commit()
@@ -69,6 +76,23 @@ class ImageService:
         finally:
             db.close()
     
+    @staticmethod
+    def find_reusable_images(prompt_hash: str, size: str, model_used: Optional[str],
+                             created_after: datetime, limit: int = 5) -> List[GeneratedImage]:
+        """Get newest images matching prompt hash, size and model created after the given time"""
+        db = SessionLocal()
+        try:
+            return (db.query(GeneratedImage)
+                    .filter(GeneratedImage.prompt_hash == prompt_hash,
+                            GeneratedImage.size == size,
+                            GeneratedImage.model_used == model_used,
+                            GeneratedImage.created_at >= created_after)
+                    .order_by(GeneratedImage.created_at.desc())
+                    .limit(limit)
+                    .all())
+        finally:
+            db.close()
+
     @staticmethod
     def get_recent_images(limit: int = 10) -> List[GeneratedImage]:
         """Get most recently generated images"""
@@ -200,4 +224,116 @@ class ImageService:
             logger.error("image_metadata_update_failed", image_id=str(image_id), error=str(e), error_type=type(e).__name__, stacktrace=traceback.format_exc())
             return False
         finally:
-            db.close()
\ No newline at end of file
+            db.close()
+
+    @staticmethod
+    def update_file_metadata(image_id: str, file_metadata: Dict[str, Any]) -> bool:
+        """Update extracted file metadata (width, height, file_size, dominant_color, phash) by ID"""
+        db = SessionLocal()
+        try:
+            updated = db.query(GeneratedImage).filter(GeneratedImage.id == image_id).update(
+                file_metadata, synchronize_session=False
+            )
+            db.commit()
+            return updated > 0
+        except Exception as e:
+            db.rollback()
+            logger.error("image_file_metadata_update_failed", image_id=str(image_id), error=str(e), error_type=type(e).__name__)
+            return False
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_images_without_phash(limit: int = 100, exclude_ids: Optional[List[str]] = None) -> List[GeneratedImage]:
+        """Get images whose file metadata has not been extracted yet (oldest first)"""
+        db = SessionLocal()
+        try:
+            query = db.query(GeneratedImage).filter(GeneratedImage.phash.is_(None))
+            if exclude_ids:
+                query = query.filter(GeneratedImage.id.notin_(exclude_ids))
+            return query.order_by(GeneratedImage.created_at.asc()).limit(limit).all()
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_phash_entries() -> List[Tuple[str, str]]:
+        """Get (id, phash) pairs of all images with a perceptual hash"""
+        db = SessionLocal()
+        try:
+            rows = db.query(GeneratedImage.id, GeneratedImage.phash).filter(GeneratedImage.phash.isnot(None)).all()
+            return [(str(image_id), phash) for image_id, phash in rows]
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_phash_signature() -> Tuple[int, Optional[datetime]]:
+        """Get (count, latest created_at) of hashed images to detect index staleness"""
+        db = SessionLocal()
+        try:
+            count, latest = db.query(
+                func.count(GeneratedImage.phash),
+                func.max(GeneratedImage.created_at)
+            ).filter(GeneratedImage.phash.isnot(None)).one()
+            return count, latest
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_images_by_ids(image_ids: List[str]) -> List[GeneratedImage]:
+        """Get multiple images by ID in one query"""
+        if not image_ids:
+            return []
+        db = SessionLocal()
+        try:
+            return db.query(GeneratedImage).filter(GeneratedImage.id.in_(image_ids)).all()
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_existing_filenames(filenames: List[str]) -> set:
+        """Return the subset of filenames that have a database row (one IN query)"""
+        if not filenames:
+            return set()
+        db = SessionLocal()
+        try:
+            rows = db.query(GeneratedImage.filename).filter(GeneratedImage.filename.in_(filenames)).all()
+            return {filename for (filename,) in rows}
+        finally:
+            db.close()
+
+    @staticmethod
+    def iter_image_file_refs(batch_size: int = 1000):
+        """Yield batches of (id, filename, file_path) ordered by id using keyset pagination"""
+        last_id = None
+        while True:
+            db = SessionLocal()
+            try:
+                query = db.query(GeneratedImage.id, GeneratedImage.filename, GeneratedImage.file_path)
+                if last_id is not None:
+                    query = query.filter(GeneratedImage.id > last_id)
+                rows = query.order_by(GeneratedImage.id).limit(batch_size).all()
+            finally:
+                db.close()
+
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [(str(image_id), filename, file_path) for image_id, filename, file_path in rows]
+
+    @staticmethod
+    def delete_images_by_ids(image_ids: List[str]) -> int:
+        """Delete image metadata rows by ID in one statement, returns number of deleted rows"""
+        if not image_ids:
+            return 0
+        db = SessionLocal()
+        try:
+            deleted = db.query(GeneratedImage).filter(GeneratedImage.id.in_(image_ids)).delete(synchronize_session=False)
+            db.commit()
+            logger.info("image_metadata_bulk_deleted", deleted=deleted)
+            return deleted
+        except Exception as e:
+            db.rollback()
+            logger.error("image_metadata_bulk_delete_failed", error=str(e), error_type=type(e).__name__)
+            return 0
+        finally:
+            db.close()
@@ -1,5 +1,5 @@
 """Database models"""
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Text, Float, ForeignKey, Boolean
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from sqlalchemy.orm import relationship
@@ -112,6 +112,14 @@ class GeneratedImage(Base):
     prompt_hash = Column(String(32), nullable=True)
     title = Column(String(255), nullable=True)  # Custom user title
     tags = Column(Text, nullable=True)  # Comma-separated tags
+
+    # File metadata extracted at save time (NULL until extracted/backfilled)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    file_size = Column(Integer, nullable=True)  # Bytes
+    dominant_color = Column(String(7), nullable=True)  # Hex colour, e.g. '#1a2b3c'
+    phash = Column(String(16), nullable=True, index=True)  # 64-bit perceptual hash as hex
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -142,6 +150,35 @@ class PromptTemplate(Base):
         return f"<PromptTemplate(id={self.id}, category='{self.category}', action='{self.action}', active={self.active})>"
 
 
+class ChatInferenceMetric(Base):
+    """Model for per-request Ollama inference metrics (one row per upstream call)"""
+    __tablename__ = "chat_inference_metrics"
+    __table_args__ = {'extend_existing': True}
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    model = Column(String(50), nullable=False)
+    category = Column(String(50), nullable=True)  # Prompt template category, if known
+    action = Column(String(50), nullable=True)  # Prompt template action, if known
+    input_chars = Column(Integer, nullable=True)  # Length of the user input
+    prompt_chars = Column(Integer, nullable=True)  # Length of the built prompt sent to Ollama
+    streamed = Column(Boolean, default=False, nullable=False)
+
+    # Timings reported by Ollama (converted from ns to ms)
+    total_duration_ms = Column(Float, nullable=True)
+    load_duration_ms = Column(Float, nullable=True)
+    prompt_eval_count = Column(Integer, nullable=True)
+    prompt_eval_duration_ms = Column(Float, nullable=True)
+    eval_count = Column(Integer, nullable=True)
+    eval_duration_ms = Column(Float, nullable=True)
+    tokens_per_second = Column(Float, nullable=True)
+    cold_load = Column(Boolean, default=False, nullable=False)  # Model had to be loaded for this request
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<ChatInferenceMetric(id={self.id}, model='{self.model}', total_duration_ms={self.total_duration_ms})>"
+
+
 class User(Base):
     """Model for user authentication and management with OAuth2 preparation"""
     __tablename__ = "users"
@@ -0,0 +1,95 @@
+"""Redis client registry - one pooled client per URL and socket timeout, shared by all services of a process"""
+import os
+import re
+import threading
+from typing import Dict, Any, List, Tuple
+import redis
+from config.settings import (
+    REDIS_URL, REDIS_SOCKET_TIMEOUT, REDIS_SOCKET_CONNECT_TIMEOUT,
+    REDIS_HEALTH_CHECK_INTERVAL, REDIS_MAX_CONNECTIONS, REDIS_POOL_TIMEOUT
+)
+from utils.logger import logger
+
+_lock = threading.Lock()
+_clients: Dict[Tuple[str, float], redis.Redis] = {}
+
+
+def sanitize_url_for_logging(url: str) -> str:
+    """Remove password from URL for safe logging"""
+    return re.sub(r'://([^:@/]*):([^@]+)@', r'://\1:***@', url or "")
+
+
+def get_redis_client(url: str = REDIS_URL, socket_timeout: float = REDIS_SOCKET_TIMEOUT) -> redis.Redis:
+    """
+    Shared Redis client for url, created on first use
+
+    Clients are cached per (url, socket_timeout) because the timeout is a connection setting.
+    Connections are pooled (at most REDIS_MAX_CONNECTIONS per pool) and pinged before reuse when
+    idle longer than REDIS_HEALTH_CHECK_INTERVAL, so stale connections after a Redis restart are
+    replaced instead of failing the request. An exhausted pool blocks up to REDIS_POOL_TIMEOUT
+    for a returned connection (gevent workers share one pool across many greenlets), a burst is
+    queued instead of surfacing as ConnectionError that services treat as Redis outage.
+    """
+    key = (url, float(socket_timeout))
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            pool = redis.BlockingConnectionPool.from_url(
+                url,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT,
+                socket_timeout=socket_timeout,
+                socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+                health_check_interval=REDIS_HEALTH_CHECK_INTERVAL
+            )
+            client = redis.Redis(connection_pool=pool)
+            _clients[key] = client
+            logger.info("redis_pool_created", redis_url=sanitize_url_for_logging(url), socket_timeout=socket_timeout,
+                        max_connections=REDIS_MAX_CONNECTIONS, pid=os.getpid())
+    return client
+
+
+def get_pool_stats() -> List[Dict[str, Any]]:
+    """Connection counts of all pools in this process"""
+    with _lock:
+        clients = list(_clients.items())
+
+    stats = []
+    for (url, socket_timeout), client in clients:
+        pool = client.connection_pool
+        # BlockingConnectionPool: all created connections in _connections, idle ones in the queue (None = free slot)
+        created = len(getattr(pool, "_connections", ()))
+        available = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+        in_use = created - available
+        stats.append({
+            "url": sanitize_url_for_logging(url),
+            "socket_timeout": socket_timeout,
+            "max_connections": pool.max_connections,
+            "pool_timeout": pool.timeout,
+            "created_connections": created,
+            "in_use_connections": in_use,
+            "available_connections": available
+        })
+    return stats
+
+
+def reset_pools_after_fork() -> None:
+    """
+    Drop connections inherited from the parent process (gunicorn/Celery prefork)
+
+    Sockets of the parent must not be shared, the child opens its own connections on demand.
+    Client objects stay valid, so services may keep references to them.
+    """
+    global _lock
+    # The lock may have been held by another thread of the parent at fork time
+    _lock = threading.Lock()
+    for client in list(_clients.values()):
+        client.connection_pool.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_pools_after_fork)
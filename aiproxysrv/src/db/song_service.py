@@ -1,5 +1,6 @@
 """Song Service - Database operations for song management"""
 import json
+import time
 import redis
 import traceback
 from datetime import datetime
@@ -9,8 +10,12 @@ from sqlalchemy.exc import SQLAlchemyError
 from db.models import Song, SongChoice, SongStatus
 from db.database import get_db
 from config.settings import CELERY_BROKER_URL
+from db.redis_client import get_redis_client
 from utils.logger import logger
 
+TASK_META_PREFIX = "celery-task-meta-"
+COMPACTION_REPORT_KEY = "celery-compaction:last-report"
+
 
 class SongService:
     """Service for song database operations"""
@@ -19,8 +24,8 @@ class SongService:
         self.redis_url = CELERY_BROKER_URL
     
     def _get_redis_connection(self) -> redis.Redis:
-        """Get Redis connection"""
-        return redis.from_url(self.redis_url)
+        """Get shared Redis client (process-wide pool)"""
+        return get_redis_client(self.redis_url)
     
     def create_song(self, task_id: str, lyrics: str, prompt: str, model: str = "auto", is_instrumental: bool = False, title: str = None) -> Optional[Song]:
         """Create a new song record in the database"""
@@ -218,7 +223,7 @@ class SongService:
             r = self._get_redis_connection()
             
             # Delete Celery task metadata
-            celery_key = f"celery-task-meta-{task_id}"
+            celery_key = f"{TASK_META_PREFIX}{task_id}"
             deleted = r.delete(celery_key)
 
             if deleted:
@@ -270,6 +275,93 @@ class SongService:
             logger.error("bulk_cleanup_failed", error=str(e), error_type=type(e).__name__, stacktrace=traceback.format_exc())
             return {"error": str(e)}
     
+    def compact_task_results(self, batch_size: int = 500, result_expires: int = 7 * 24 * 3600) -> Dict[str, Any]:
+        """
+        Compact Celery result keys in Redis, one SCAN page at a time
+
+        Results of songs in a final state in Postgres are unlinked (the status endpoint reads them
+        from the database), all other result keys without TTL get result_expires. Each page costs
+        one SCAN, one pipelined TTL/MEMORY USAGE read, one DB query and one pipelined UNLINK/EXPIRE.
+        """
+        started = time.monotonic()
+        report = {
+            "scanned": 0,
+            "unlinked_keys": 0,
+            "reclaimed_bytes": 0,
+            "expiry_applied": 0,
+            "errors": 0
+        }
+        final_states = [SongStatus.SUCCESS.value, SongStatus.FAILURE.value, SongStatus.CANCELLED.value]
+
+        try:
+            r = self._get_redis_connection()
+            cursor = 0
+            while True:
+                cursor, keys = r.scan(cursor=cursor, match=f"{TASK_META_PREFIX}*", count=batch_size)
+                if keys:
+                    self._compact_page(r, keys, final_states, result_expires, report)
+                if cursor == 0:
+                    break
+
+        except Exception as e:
+            report["errors"] += 1
+            logger.error("task_result_compaction_failed", error=str(e), error_type=type(e).__name__, stacktrace=traceback.format_exc())
+
+        report["duration_seconds"] = round(time.monotonic() - started, 2)
+        report["finished_at"] = datetime.utcnow().isoformat()
+        logger.info("task_result_compaction_completed", **report)
+        try:
+            self._get_redis_connection().set(COMPACTION_REPORT_KEY, json.dumps(report))
+        except redis.RedisError as e:
+            logger.warning("task_result_compaction_report_not_stored", error=str(e), error_type=type(e).__name__)
+        return report
+
+    def get_compaction_report(self) -> Optional[Dict[str, Any]]:
+        """Report of the last task result compaction, None if it never ran"""
+        raw = self._get_redis_connection().get(COMPACTION_REPORT_KEY)
+        return json.loads(raw) if raw else None
+
+    def _compact_page(self, r: redis.Redis, keys: List[bytes], final_states: List[str], result_expires: int, report: Dict[str, Any]) -> None:
+        """Unlink stored song results and apply the TTL policy to one SCAN page"""
+        pipe = r.pipeline(transaction=False)
+        for key in keys:
+            pipe.ttl(key)
+            pipe.memory_usage(key)
+        values = pipe.execute(raise_on_error=False)
+        ttls, sizes = values[0::2], values[1::2]
+
+        task_ids = [key.decode()[len(TASK_META_PREFIX):] for key in keys]
+        db = next(get_db())
+        try:
+            stored = {
+                task_id for (task_id,) in db.query(Song.task_id).filter(
+                    Song.task_id.in_(task_ids), Song.status.in_(final_states)
+                )
+            }
+        finally:
+            db.close()
+
+        unlink_keys = []
+        expire_count = 0
+        pipe = r.pipeline(transaction=False)
+        for key, task_id, ttl, size in zip(keys, task_ids, ttls, sizes):
+            if task_id in stored:
+                unlink_keys.append(key)
+                report["reclaimed_bytes"] += size if isinstance(size, int) else 0
+            elif ttl == -1:
+                pipe.expire(key, result_expires)
+                expire_count += 1
+        if unlink_keys:
+            pipe.unlink(*unlink_keys)
+        if unlink_keys or expire_count:
+            report["expiry_applied"] += expire_count
+            results = pipe.execute(raise_on_error=False)
+            report["errors"] += sum(1 for result in results if isinstance(result, Exception))
+            if unlink_keys and isinstance(results[-1], int):
+                report["unlinked_keys"] += results[-1]
+
+        report["scanned"] += len(keys)
+
     def get_song_choices(self, song_id) -> List[SongChoice]:
         """Get all choices for a specific song"""
         try:
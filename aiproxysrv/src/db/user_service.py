@@ -5,7 +5,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import Optional, List
 from db.models import User
-import bcrypt
+from business.password_hasher import PasswordHasher
+from utils.logger import logger
 import uuid
 from datetime import datetime
 import jwt
@@ -22,19 +23,15 @@ class UserService:
         self.jwt_secret = JWT_SECRET_KEY
         self.jwt_algorithm = JWT_ALGORITHM
         self.jwt_expiration_hours = JWT_EXPIRATION_HOURS
+        self.password_hasher = PasswordHasher()
 
     def hash_password(self, password: str) -> str:
-        """Hash a password using bcrypt"""
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        """Hash a password using bcrypt (runs in the bounded hashing pool)"""
+        return self.password_hasher.hash(password)
 
     def verify_password(self, password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash"""
-        try:
-            return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
-        except Exception:
-            return False
+        """Verify a password against its hash (runs in the bounded hashing pool)"""
+        return self.password_hasher.verify(password, hashed_password)
 
     def generate_jwt_token(self, user_id: str, email: str) -> str:
         """Generate JWT token for user authentication"""
@@ -99,6 +96,10 @@ class UserService:
             return None
 
         if self.verify_password(password, user.password_hash):
+            # Upgrade hash to the configured cost while the plain password is known
+            if self.password_hasher.needs_rehash(user.password_hash):
+                user.password_hash = self.hash_password(password)
+                logger.info("Password rehashed with new cost", user_id=str(user.id))
             # Update last login timestamp
             user.last_login = datetime.utcnow()
             db.commit()
@@ -1,9 +1,14 @@
 """Pydantic schemas for Chat API validation"""
+import re
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
+from config.settings import CHAT_BATCH_MAX_ITEMS
 from .common_schemas import BaseResponse
 
+STREAM_FORMATS = ['sse', 'ndjson']
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
 
 class ChatOptions(BaseModel):
     """Schema for chat generation options"""
@@ -30,6 +35,10 @@ class ChatRequest(BaseModel):
     pre_condition: Optional[str] = Field("", description="Text before user input")
     post_condition: Optional[str] = Field("", description="Text after user input")
     options: Optional[ChatOptions] = Field(default_factory=ChatOptions, description="Generation options")
+    stream: bool = Field(False, description="Stream tokens as they are generated")
+    cache: Optional[bool] = Field(None, description="Use response cache (default: only when temperature is 0, ignored for streaming)")
+    session_id: Optional[str] = Field(None, min_length=1, max_length=64, description="Continue a server-side conversation session (reuses Ollama context)")
+    stream_format: str = Field("sse", description="Stream format: 'sse' (text/event-stream) or 'ndjson'")
 
     @validator('model')
     def validate_model(cls, v):
@@ -38,6 +47,18 @@ class ChatRequest(BaseModel):
             raise ValueError(f'model must be one of: {", ".join(valid_models)}')
         return v
 
+    @validator('stream_format')
+    def validate_stream_format(cls, v):
+        if v not in STREAM_FORMATS:
+            raise ValueError(f'stream_format must be one of: {", ".join(STREAM_FORMATS)}')
+        return v
+
+    @validator('session_id')
+    def validate_session_id(cls, v):
+        if v is not None and not SESSION_ID_PATTERN.match(v):
+            raise ValueError('session_id may only contain letters, digits, "-" and "_"')
+        return v
+
     class Config:
         json_schema_extra = {
             "example": {
@@ -85,12 +106,18 @@ class ChatResponse(BaseResponse):
 
 class UnifiedChatRequest(BaseModel):
     """Schema for unified chat generation requests"""
-    pre_condition: str = Field("", description="Text before user input")
-    post_condition: str = Field("", description="Text after user input")
+    pre_condition: Optional[str] = Field(None, description="Text before user input (overrides template)")
+    post_condition: Optional[str] = Field(None, description="Text after user input (overrides template)")
     input_text: str = Field(..., min_length=1, max_length=10000, description="Input text for generation")
     temperature: Optional[float] = Field(None, ge=0.0, le=2.0, description="Temperature for text generation (overrides template)")
     max_tokens: Optional[int] = Field(None, gt=0, le=4000, description="Maximum tokens to generate (overrides template)")
     model: Optional[str] = Field(None, description="AI model to use (overrides template)")
+    category: Optional[str] = Field(None, max_length=50, description="Prompt template category, resolved server-side together with action")
+    action: Optional[str] = Field(None, max_length=50, description="Prompt template action, resolved server-side together with category")
+    stream: bool = Field(False, description="Stream tokens as they are generated")
+    cache: Optional[bool] = Field(None, description="Use response cache (default: only when temperature is 0, ignored for streaming)")
+    session_id: Optional[str] = Field(None, min_length=1, max_length=64, description="Continue a server-side conversation session (reuses Ollama context)")
+    stream_format: str = Field("sse", description="Stream format: 'sse' (text/event-stream) or 'ndjson'")
 
     @validator('model')
     def validate_model(cls, v):
@@ -100,19 +127,78 @@ class UnifiedChatRequest(BaseModel):
                 raise ValueError(f'model must be one of: {", ".join(valid_models)}')
         return v
 
+    @validator('stream_format')
+    def validate_stream_format(cls, v):
+        if v not in STREAM_FORMATS:
+            raise ValueError(f'stream_format must be one of: {", ".join(STREAM_FORMATS)}')
+        return v
+
+    @validator('session_id')
+    def validate_session_id(cls, v):
+        if v is not None and not SESSION_ID_PATTERN.match(v):
+            raise ValueError('session_id may only contain letters, digits, "-" and "_"')
+        return v
+
     class Config:
         json_schema_extra = {
             "example": {
-                "pre_condition": "You are a helpful AI assistant.",
-                "post_condition": "Keep your answer concise.",
-                "input_text": "Explain quantum computing",
-                "temperature": 0.7,
-                "max_tokens": 150,
-                "model": "llama3.2:3b"
+                "category": "image",
+                "action": "enhance",
+                "input_text": "A lighthouse at night",
+                "temperature": 0.7
+            }
+        }
+
+
+class ChatBatchRequest(BaseModel):
+    """Schema for batch chat requests (one template applied to many inputs)"""
+    pre_condition: str = Field("", description="Text before each input")
+    post_condition: str = Field("", description="Text after each input")
+    inputs: List[str] = Field(..., min_items=1, max_items=CHAT_BATCH_MAX_ITEMS, description="Input texts, one generation per item")
+    model: str = Field(..., description="AI model to use for all items")
+    temperature: float = Field(0.3, ge=0.0, le=2.0, description="Temperature for text generation")
+    max_tokens: int = Field(30, gt=0, le=4000, description="Maximum tokens to generate per item")
+    cache: Optional[bool] = Field(None, description="Use response cache (default: only when temperature is 0)")
+    stream_format: str = Field("ndjson", description="Result stream format: 'ndjson' or 'sse'")
+
+    @validator('model')
+    def validate_model(cls, v):
+        valid_models = ['llama3.2:3b', 'gpt-oss:20b', 'deepseek-r1:8b', 'gemma3:4b']
+        if v not in valid_models:
+            raise ValueError(f'model must be one of: {", ".join(valid_models)}')
+        return v
+
+    @validator('inputs')
+    def validate_inputs(cls, v):
+        for item in v:
+            if not item or len(item) > 10000:
+                raise ValueError('each input must contain 1 to 10000 characters')
+        return v
+
+    @validator('stream_format')
+    def validate_stream_format(cls, v):
+        if v not in STREAM_FORMATS:
+            raise ValueError(f'stream_format must be one of: {", ".join(STREAM_FORMATS)}')
+        return v
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "pre_condition": "Translate the following text to German.",
+                "post_condition": "Only output the translation.",
+                "inputs": ["Good morning", "See you tomorrow"],
+                "model": "llama3.2:3b",
+                "temperature": 0.0,
+                "max_tokens": 100
             }
         }
 
 
+class ChatMetricsRequest(BaseModel):
+    """Schema for chat metrics report query parameters"""
+    hours: Optional[int] = Field(24, ge=1, le=2160, description="Rolling window in hours")
+
+
 class ChatErrorResponse(BaseResponse):
     """Schema for chat error responses"""
     success: bool = Field(False, description="Request success status")
@@ -2,6 +2,7 @@
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from datetime import datetime
+from config.settings import OPENAI_BATCH_MAX_ITEMS
 from .common_schemas import BaseResponse, PaginationResponse, StatusEnum
 
 
@@ -10,6 +11,7 @@ class ImageGenerateRequest(BaseModel):
     prompt: str = Field(..., min_length=1, max_length=500, description="Image generation prompt")
     size: Optional[str] = Field("1024x1024", description="Image size")
     title: Optional[str] = Field(None, max_length=255, description="Image title")
+    reuse: Optional[bool] = Field(None, description="Reuse an existing image with the same prompt, size and model (default: server setting, false bypasses the cache). A reused image keeps its original title")
 
     @validator('size')
     def validate_size(cls, v):
@@ -22,7 +24,24 @@ class ImageGenerateRequest(BaseModel):
             "example": {
                 "prompt": "A beautiful sunset over the ocean with sailing boats",
                 "size": "1024x1024",
-                "title": "Ocean Sunset"
+                "title": "Ocean Sunset",
+                "reuse": True
+            }
+        }
+
+
+class ImageBatchGenerateRequest(BaseModel):
+    """Schema for batch image generation requests"""
+    items: List[ImageGenerateRequest] = Field(..., min_items=1, max_items=OPENAI_BATCH_MAX_ITEMS,
+                                              description="Images to generate")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {"prompt": "A lighthouse at dawn, oil painting", "size": "1024x1024", "title": "Cover A"},
+                    {"prompt": "A lighthouse at dusk, watercolor", "size": "1024x1024", "title": "Cover B"}
+                ]
             }
         }
 
@@ -61,6 +80,22 @@ class ImageGenerateResponse(BaseResponse):
     data: ImageResponse = Field(..., description="Generated image data")
 
 
+class ImageBatchItemResult(BaseModel):
+    """Schema for a single batch generation result"""
+    index: int = Field(..., description="Position of the item in the request")
+    status: str = Field(..., description="success or error")
+    id: Optional[str] = Field(None, description="Image ID if generated")
+    url: Optional[str] = Field(None, description="Image URL if generated")
+    reused: Optional[bool] = Field(None, description="Whether an existing image was reused")
+    error: Optional[str] = Field(None, description="Error message if generation failed")
+
+
+class ImageBatchGenerateResponse(BaseModel):
+    """Schema for batch image generation response"""
+    summary: dict = Field(..., description="Counts of requested, succeeded and failed items")
+    results: List[ImageBatchItemResult] = Field(..., description="Per-item results in request order")
+
+
 class ImageListRequest(BaseModel):
     """Schema for image list request parameters"""
     limit: Optional[int] = Field(20, ge=1, le=100, description="Number of items to return")
@@ -82,6 +117,24 @@ class ImageListRequest(BaseModel):
         return v
 
 
+class ImageSimilarRequest(BaseModel):
+    """Schema for similar image query parameters"""
+    max_distance: Optional[int] = Field(8, ge=0, le=32, description="Maximum perceptual hash distance (lower is more similar)")
+    limit: Optional[int] = Field(20, ge=1, le=100, description="Number of items to return")
+
+
+class ImageDuplicateReportRequest(BaseModel):
+    """Schema for duplicate report query parameters"""
+    max_distance: Optional[int] = Field(4, ge=0, le=16, description="Maximum perceptual hash distance to treat images as duplicates")
+
+
+class ImageReconcileRequest(BaseModel):
+    """Schema for image storage reconciliation requests"""
+    fix_orphans: bool = Field(False, description="Move files without database row to quarantine and remove stale temp files")
+    fix_dangling: bool = Field(False, description="Delete database rows whose image file is missing")
+    batch_size: Optional[int] = Field(1000, ge=100, le=10000, description="Filenames/rows checked per database query")
+
+
 class ImageListResponse(PaginationResponse):
     """Schema for image list response"""
     data: List[ImageResponse] = Field(..., description="List of images")
@@ -0,0 +1,101 @@
+"""Image metadata extraction and perceptual hashing utilities"""
+import math
+import os
+from typing import Dict, Any
+from PIL import Image
+
+# pHash works on a 32x32 grayscale thumbnail and keeps the 8x8 low-frequency DCT block
+PHASH_IMAGE_SIZE = 32
+PHASH_HASH_SIZE = 8
+
+# Precomputed DCT-II cosine table: _DCT_COS[u][x] = cos((2x + 1) * u * pi / 2N)
+_DCT_COS = [
+    [math.cos((2 * x + 1) * u * math.pi / (2 * PHASH_IMAGE_SIZE)) for x in range(PHASH_IMAGE_SIZE)]
+    for u in range(PHASH_HASH_SIZE)
+]
+
+
+def compute_phash(image: Image.Image) -> int:
+    """
+    Compute 64-bit perceptual hash (DCT based pHash).
+
+    Args:
+        image: PIL image
+
+    Returns:
+        64-bit integer hash
+    """
+    gray = image.convert("L").resize((PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE), Image.LANCZOS)
+    pixels = list(gray.getdata())
+    rows = [pixels[y * PHASH_IMAGE_SIZE:(y + 1) * PHASH_IMAGE_SIZE] for y in range(PHASH_IMAGE_SIZE)]
+
+    # Separable 2D DCT, only the low-frequency 8x8 block is needed
+    row_dct = [[sum(c * p for c, p in zip(_DCT_COS[u], row)) for u in range(PHASH_HASH_SIZE)] for row in rows]
+    coefficients = []
+    for v in range(PHASH_HASH_SIZE):
+        for u in range(PHASH_HASH_SIZE):
+            coefficients.append(sum(_DCT_COS[v][y] * row_dct[y][u] for y in range(PHASH_IMAGE_SIZE)))
+
+    # Median without the DC term, which only carries the average brightness
+    ac_terms = sorted(coefficients[1:])
+    median = ac_terms[len(ac_terms) // 2]
+
+    phash = 0
+    for coefficient in coefficients:
+        phash = (phash << 1) | (1 if coefficient > median else 0)
+    return phash
+
+
+def compute_dominant_color(image: Image.Image) -> str:
+    """
+    Compute dominant colour as hex string (#rrggbb).
+
+    Args:
+        image: PIL image
+
+    Returns:
+        Hex colour string
+    """
+    thumbnail = image.convert("RGB").resize((64, 64))
+    quantized = thumbnail.quantize(colors=8)
+    palette = quantized.getpalette()
+    count, color_index = max(quantized.getcolors())
+    r, g, b = palette[color_index * 3:color_index * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def phash_to_hex(phash: int) -> str:
+    """Format 64-bit hash as fixed-width hex string"""
+    return f"{phash:016x}"
+
+
+def hex_to_phash(value: str) -> int:
+    """Parse hex string hash into integer"""
+    return int(value, 16)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes"""
+    return (a ^ b).bit_count()
+
+
+def extract_image_metadata(file_path: str) -> Dict[str, Any]:
+    """
+    Extract dimensions, byte size, dominant colour and perceptual hash from an image file.
+
+    Args:
+        file_path: Path to the image file
+
+    Returns:
+        Dict with width, height, file_size, dominant_color and phash (hex)
+    """
+    with Image.open(file_path) as image:
+        image.load()
+        width, height = image.size
+        return {
+            "width": width,
+            "height": height,
+            "file_size": os.path.getsize(file_path),
+            "dominant_color": compute_dominant_color(image),
+            "phash": phash_to_hex(compute_phash(image)),
+        }
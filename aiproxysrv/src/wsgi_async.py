@@ -0,0 +1,15 @@
+"""
+WSGI Entry Point für Gunicorn mit gevent Workern (PRODUCTION, Upstream-Proxy Endpunkte)
+
+Chat, Image-Generierung und MUREKA Abfragen warten meist auf Ollama, OpenAI oder MUREKA.
+Mit `gunicorn -k gevent` patcht gunicorn die Sockets vor dem Laden der App, dadurch werden
+requests und redis non-blocking und ein Worker bedient viele wartende Requests gleichzeitig.
+psycopg2 muss zusätzlich gepatcht werden, sonst blockieren DB-Abfragen den ganzen Worker.
+"""
+from psycogreen.gevent import patch_psycopg
+
+patch_psycopg()
+
+from wsgi import app  # noqa: E402
+
+__all__ = ['app']
@@ -0,0 +1,156 @@
+"""
+Mock Ollama API - Simulates /api/generate, /api/tags and /api/ps with configurable token rates
+
+Used as stand-in Ollama host (OLLAMA_URL=http://localhost:3080) for benchmarks and load tests.
+Like Ollama, the output length is only limited by options.num_predict.
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from datetime import datetime, timezone
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+
+api_ollama_mock = Blueprint("api_ollama_mock", __name__, url_prefix="/api")
+
+# Generation speed per model (tokens/s), roughly an M-series Mac
+MODEL_PROFILES = {
+    "llama3.2:3b": {"tokens_per_second": 60, "prompt_tokens_per_second": 900, "load_ms": 1500},
+    "gemma3:4b": {"tokens_per_second": 50, "prompt_tokens_per_second": 700, "load_ms": 2000},
+    "deepseek-r1:8b": {"tokens_per_second": 35, "prompt_tokens_per_second": 500, "load_ms": 3500},
+    "gpt-oss:20b": {"tokens_per_second": 25, "prompt_tokens_per_second": 300, "load_ms": 8000},
+}
+DEFAULT_PROFILE = {"tokens_per_second": 40, "prompt_tokens_per_second": 500, "load_ms": 3000}
+
+# MOCK_OLLAMA_SPEED scales all timings (2 = twice as fast, 0 = no delays)
+SPEED = float(os.getenv("MOCK_OLLAMA_SPEED", "1.0"))
+# Average output length in tokens (actual length varies +-50% per prompt)
+MEAN_OUTPUT_TOKENS = int(os.getenv("MOCK_OLLAMA_MEAN_OUTPUT_TOKENS", "120"))
+DEFAULT_KEEP_ALIVE_SECONDS = 300
+
+WORDS = ("the night sky river light song heart dream road city rain fire stone wind echo shadow "
+         "silver golden quiet wild ocean morning falling rising distant gentle").split()
+
+# model -> unload timestamp
+_loaded_models = {}
+
+
+def _sleep(ms: float):
+    if SPEED > 0:
+        time.sleep(ms / 1000 / SPEED)
+
+
+def _parse_keep_alive(value) -> float:
+    """Ollama keep_alive ("30m", "1h", "90s", seconds as number, negative = forever) in seconds"""
+    if value is None:
+        return DEFAULT_KEEP_ALIVE_SECONDS
+    if isinstance(value, (int, float)):
+        return float("inf") if value < 0 else float(value)
+    match = re.fullmatch(r"(-?\d+(?:\.\d+)?)([smh]?)", str(value).strip())
+    if not match:
+        return DEFAULT_KEEP_ALIVE_SECONDS
+    amount = float(match.group(1))
+    if amount < 0:
+        return float("inf")
+    return amount * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def _load_model(model: str, keep_alive) -> int:
+    """Simulate model load, returns load duration in ns"""
+    now = time.time()
+    profile = MODEL_PROFILES.get(model, DEFAULT_PROFILE)
+    load_ms = 0 if _loaded_models.get(model, 0) > now else profile["load_ms"]
+    _sleep(load_ms)
+    _loaded_models[model] = time.time() + _parse_keep_alive(keep_alive)
+    return int(load_ms * 1_000_000 + 5_000_000)
+
+
+def _output_tokens(model: str, prompt: str, num_predict) -> list:
+    """Deterministic pseudo text per prompt, so repeated benchmark runs are comparable"""
+    rng = random.Random(hashlib.sha256(f"{model}:{prompt}".encode("utf-8")).hexdigest())
+    count = max(1, int(MEAN_OUTPUT_TOKENS * rng.uniform(0.5, 1.5)))
+    if num_predict is not None and num_predict > 0:
+        count = min(count, num_predict)
+    return [rng.choice(WORDS) for _ in range(count)]
+
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+@api_ollama_mock.route('/generate', methods=['POST'])
+def generate():
+    """Simulation of Ollama /api/generate (streaming and non-streaming)"""
+    raw_json = request.get_json(silent=True)
+    if not raw_json or not raw_json.get('model'):
+        return jsonify({"error": "model is required"}), 400
+
+    model = raw_json['model']
+    prompt = raw_json.get('prompt') or ''
+    options = raw_json.get('options') or {}
+    stream = raw_json.get('stream', True)
+    profile = MODEL_PROFILES.get(model, DEFAULT_PROFILE)
+
+    started = time.monotonic()
+    load_duration = _load_model(model, raw_json.get('keep_alive'))
+
+    # Empty prompt only loads the model (used for warmup)
+    if not prompt:
+        return jsonify({"model": model, "created_at": _timestamp(), "response": "", "done": True,
+                        "done_reason": "load", "load_duration": load_duration,
+                        "total_duration": int((time.monotonic() - started) * 1e9)}), 200
+
+    prompt_eval_count = max(1, len(prompt) // 4)
+    prompt_eval_ms = prompt_eval_count / profile["prompt_tokens_per_second"] * 1000
+    tokens = _output_tokens(model, prompt, options.get('num_predict'))
+    token_ms = 1000 / profile["tokens_per_second"]
+
+    def final_frame(response_text: str) -> dict:
+        eval_duration = int(len(tokens) * token_ms * 1_000_000)
+        return {
+            "model": model,
+            "created_at": _timestamp(),
+            "response": response_text,
+            "done": True,
+            "done_reason": "length" if options.get('num_predict') == len(tokens) else "stop",
+            "context": list(range(prompt_eval_count + len(tokens))),
+            "total_duration": int((time.monotonic() - started) * 1e9),
+            "load_duration": load_duration,
+            "prompt_eval_count": prompt_eval_count,
+            "prompt_eval_duration": int(prompt_eval_ms * 1_000_000),
+            "eval_count": len(tokens),
+            "eval_duration": eval_duration
+        }
+
+    if not stream:
+        _sleep(prompt_eval_ms + len(tokens) * token_ms)
+        return jsonify(final_frame(" ".join(tokens))), 200
+
+    def chunks():
+        _sleep(prompt_eval_ms)
+        for index, token in enumerate(tokens):
+            _sleep(token_ms)
+            yield json.dumps({"model": model, "created_at": _timestamp(),
+                              "response": token if index == 0 else f" {token}", "done": False}) + "\n"
+        yield json.dumps(final_frame("")) + "\n"
+
+    return Response(stream_with_context(chunks()), mimetype="application/x-ndjson")
+
+
+@api_ollama_mock.route('/tags', methods=['GET'])
+def tags():
+    """Simulation of Ollama /api/tags (installed models)"""
+    return jsonify({"models": [{"name": name, "model": name} for name in MODEL_PROFILES]}), 200
+
+
+@api_ollama_mock.route('/ps', methods=['GET'])
+def ps():
+    """Simulation of Ollama /api/ps (models in memory)"""
+    now = time.time()
+    return jsonify({"models": [
+        {"name": name, "model": name,
+         "expires_at": "forever" if until == float("inf") else datetime.fromtimestamp(until, timezone.utc).isoformat()}
+        for name, until in _loaded_models.items() if until > now
+    ]}), 200
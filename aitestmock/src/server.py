@@ -7,6 +7,7 @@ from pathlib import Path
 from api.openai import openai_routes
 from api.mureka import mureka_routes
 from api.chat import api_chat_mock
+from api.ollama import api_ollama_mock
 import logging
 import tomli
 
@@ -36,6 +37,7 @@ def create_app():
     app.register_blueprint(openai_routes, url_prefix='/v1')
     app.register_blueprint(mureka_routes, url_prefix='/v1')
     app.register_blueprint(api_chat_mock)
+    app.register_blueprint(api_ollama_mock)
 
     @app.route('/health')
     def health():
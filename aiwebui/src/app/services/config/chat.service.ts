@@ -7,12 +7,14 @@ import { MusicStyleChooserService } from '../music-style-chooser.service';
 import { firstValueFrom } from 'rxjs';
 
 interface UnifiedChatRequest {
-  pre_condition: string;
-  post_condition: string;
+  pre_condition?: string;
+  post_condition?: string;
   input_text: string;
   temperature?: number;
   max_tokens?: number;
   model?: string;
+  category?: string;
+  action?: string;
 }
 
 
@@ -41,29 +43,11 @@ export class ChatService {
   private musicStyleChooserService = inject(MusicStyleChooserService);
 
   private async validateAndCallUnified(category: string, action: string, inputText: string): Promise<string> {
-    const template = await firstValueFrom(this.promptConfig.getPromptTemplateAsync(category, action));
-    if (!template) {
-      throw new Error(`Template ${category}/${action} not found in database`);
-    }
-
-    // Validate template has all required parameters
-    if (!template.model) {
-      throw new Error(`Template ${category}/${action} is missing model parameter`);
-    }
-    if (template.temperature === undefined || template.temperature === null) {
-      throw new Error(`Template ${category}/${action} is missing temperature parameter`);
-    }
-    if (!template.max_tokens) {
-      throw new Error(`Template ${category}/${action} is missing max_tokens parameter`);
-    }
-
+    // Template is resolved server-side (one round trip)
     const request: UnifiedChatRequest = {
-      pre_condition: template.pre_condition || '',
-      post_condition: template.post_condition || '',
       input_text: inputText,
-      temperature: template.temperature,
-      max_tokens: template.max_tokens,
-      model: template.model
+      category: category,
+      action: action
     };
 
     const data: ChatResponse = await firstValueFrom(